@@ -1,20 +1,28 @@
 """History Editor component for Home Assistant."""
-import json
+import asyncio
 import logging
-from datetime import datetime
-from types import SimpleNamespace
+from datetime import datetime, timezone
+from itertools import islice
 from typing import Any
 
 import voluptuous as vol
 from aiohttp import web
+from sqlalchemy import bindparam, delete, func, insert, lambda_stmt, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder import get_instance
-from homeassistant.components.recorder.db_schema import States, StatesMeta
+from homeassistant.components.recorder.db_schema import StateAttributes, States, StatesMeta
 from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.json import json_dumps
+from homeassistant.loader import async_get_integration
 from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
 
 DOMAIN = "history_editor"
 CONFIG_SCHEMA = vol.Schema(
@@ -33,18 +41,29 @@ except ImportError:
     EVENT_RECORDER_5MIN_STATISTICS_GENERATED = "recorder_5min_statistics_generated"
     EVENT_RECORDER_HOURLY_STATISTICS_GENERATED = "recorder_hourly_statistics_generated"
 
+# aiohttp application key under which the http component stores hass.  Older
+# HA versions only provide the plain string key.
+try:
+    from homeassistant.components.http import KEY_HASS
+except ImportError:
+    KEY_HASS = "hass"
+
+from .cache import ResponseCache, TTLCache
 from .panel import async_register_panel
 from .schema_compat import ensure_schema_current, validate_schema_sync
 from .statistics import (
     HAS_STATISTICS,
+    LONG_TERM_PERIOD_SECONDS,
+    SHORT_TERM_PERIOD_SECONDS,
     bulk_delete_statistic_sync,
     bulk_update_statistic_sync,
     delete_short_term_stats_by_state_id,
+    delete_short_term_stats_by_state_ids,
     delete_statistic_sync,
     get_statistics_sync,
+    period_start,
     recalculate_statistics_sync,
     update_statistic_sync,
-    update_statistics_after_state_change,
     update_statistics_for_periods,
 )
 
@@ -56,69 +75,350 @@ SERVICE_UPDATE_RECORD = "update_record"
 SERVICE_DELETE_RECORD = "delete_record"
 SERVICE_CREATE_RECORD = "create_record"
 SERVICE_RECALCULATE_STATISTICS = "recalculate_statistics"
+SERVICE_BULK_CREATE_RECORD = "bulk_create_record"
 SERVICE_BULK_UPDATE_RECORD = "bulk_update_record"
 SERVICE_BULK_DELETE_RECORD = "bulk_delete_record"
+SERVICE_DELETE_RECORDS_IN_RANGE = "delete_records_in_range"
 SERVICE_BULK_UPDATE_STATISTIC = "bulk_update_statistic"
 SERVICE_BULK_DELETE_STATISTIC = "bulk_delete_statistic"
+SERVICE_BATCH = "batch"
+
+_UTC = timezone.utc
+
+# Which timestamp columns the installed recorder schema has.  HA moved from
+# DateTime columns to float ``*_ts`` columns over time; the ORM model is fixed
+# for the lifetime of the process, so probe it once instead of per call/row.
+_HAS_LAST_CHANGED_TS = hasattr(States, "last_changed_ts")
+_HAS_LAST_CHANGED = hasattr(States, "last_changed")
+_HAS_LAST_UPDATED_TS = hasattr(States, "last_updated_ts")
+_HAS_LAST_UPDATED = hasattr(States, "last_updated")
+# Self-reference to the previous state; absent on very old schemas.
+_HAS_OLD_STATE_ID = hasattr(States, "old_state_id")
+# Attributes live in the shared, hash-deduplicated ``state_attributes`` table
+# on current schemas; ``states.attributes`` is only filled on legacy rows.
+_HAS_ATTRIBUTES_ID = hasattr(States, "attributes_id")
+
+if hasattr(StateAttributes, "hash_shared_attrs_bytes"):
+    def _hash_shared_attrs(shared_attrs: str) -> int:
+        """Return the ``state_attributes.hash`` of a JSON attributes blob."""
+        return StateAttributes.hash_shared_attrs_bytes(shared_attrs.encode())
+else:
+    # Older HA releases hash the str form.
+    _hash_shared_attrs = getattr(StateAttributes, "hash_shared_attrs", None)
+
+# hass.data[DOMAIN] key for the semaphore that serialises recorder writes.
+DATA_WRITE_SEMAPHORE = "write_semaphore"
+# hass.data[DOMAIN] key for the ResponseCache used by the read endpoints.
+DATA_RESPONSE_CACHE = "response_cache"
+# Concurrent mutations allowed against the recorder DB.  SQLite has a single
+# writer, so anything above 1 only adds lock contention.
+WRITE_CONCURRENCY = 1
+
+# Maximum ids per ``IN (...)`` clause.  Old SQLite builds cap a statement at
+# 999 bound parameters.
+IN_CLAUSE_CHUNK_SIZE = 500
+
+# Minimum response body size (bytes) worth compressing on the read endpoints.
+COMPRESS_MIN_BYTES = 1024
+
+# Upper bound on rows returned by one records/statistics read.  Larger
+# requested limits are clamped; callers page on ``has_more`` / time bounds.
+MAX_QUERY_LIMIT = 10_000
+# Upper bound on entities in one multi-entity records read.
+MAX_QUERY_ENTITIES = 50
+# Rows fetched from the DB cursor per batch when streaming records.
+RECORDS_YIELD_PER = 500
+
+# entity_id -> states_meta.metadata_id.  The mapping only changes when the
+# recorder purges an unused entity, so a short TTL bounds how long a purged
+# id can linger.  Filled from record reads that returned rows and from
+# creates once they commit, so misses and ids a rolled-back transaction
+# inserted are never cached.  A write that fails on a constraint clears it,
+# since a purged id is then the likely cause.
+METADATA_ID_CACHE_TTL = 60.0
+_METADATA_ID_CACHE: TTLCache[int] = TTLCache(
+    ttl=METADATA_ID_CACHE_TTL, max_entries=1024
+)
 
 
-def _set_state_timestamps(
-    state_record,
+def _fast_parse_dt(value: str) -> datetime | None:
+    """Parse an ISO 8601 timestamp from a request body or query string.
+
+    The panel always sends ``Date.toISOString()`` output, which
+    ``datetime.fromisoformat`` handles directly once a trailing ``Z`` is
+    spelled as ``+00:00``.  Anything it rejects falls back to
+    ``dt_util.parse_datetime``, so the accepted formats and the
+    ``None``-on-failure behaviour are unchanged.  Strings that are not even
+    shaped like ``YYYY-MM-DD...`` skip the ``fromisoformat`` attempt.
+    Out-of-range fields (``2023-13-45``) make ``parse_datetime`` raise
+    rather than return ``None``; those are reported as ``None`` too.
+    """
+    if len(value) >= 10 and value[4] == "-" and value[7] == "-":
+        try:
+            if value.endswith("Z"):
+                return datetime.fromisoformat(value[:-1] + "+00:00")
+            return datetime.fromisoformat(value)
+        except (ValueError, TypeError, AttributeError):
+            pass
+    try:
+        return dt_util.parse_datetime(value)
+    except ValueError:
+        return None
+
+
+def _valid_datetime(value: Any) -> datetime:
+    """Voluptuous validator equivalent to ``cv.datetime``, via ``_fast_parse_dt``.
+
+    Used by the service and query-string schemas so every request timestamp
+    takes the same fast path.  ``datetime`` objects (service calls made from
+    automations) pass through unchanged.
+    """
+    if isinstance(value, datetime):
+        return value
+    parsed = _fast_parse_dt(value) if isinstance(value, str) else None
+    if parsed is None:
+        raise vol.Invalid(f"Invalid datetime specified: {value}")
+    return parsed
+
+
+def _state_timestamp_values(
     last_changed: datetime | None,
     last_updated: datetime | None,
-) -> None:
-    """Write both the modern ``*_ts`` columns and the legacy datetime columns.
+) -> dict[str, Any]:
+    """Return ``States`` column values for the given timestamps.
 
     HA's recorder schema has switched from ``DateTime`` columns to float epoch
     ``*_ts`` columns over time.  We populate whichever exist so the component
-    works across versions.  Passing ``None`` leaves the field alone.
+    works across versions.  ``None`` arguments contribute no columns.
     """
+    values: dict[str, Any] = {}
     if last_changed is not None:
-        if hasattr(state_record, 'last_changed_ts'):
-            state_record.last_changed_ts = last_changed.timestamp()
-        if hasattr(state_record, 'last_changed'):
-            state_record.last_changed = last_changed
+        if _HAS_LAST_CHANGED_TS:
+            values["last_changed_ts"] = last_changed.timestamp()
+        if _HAS_LAST_CHANGED:
+            values["last_changed"] = last_changed
     if last_updated is not None:
-        if hasattr(state_record, 'last_updated_ts'):
-            state_record.last_updated_ts = last_updated.timestamp()
-        if hasattr(state_record, 'last_updated'):
-            state_record.last_updated = last_updated
+        if _HAS_LAST_UPDATED_TS:
+            values["last_updated_ts"] = last_updated.timestamp()
+        if _HAS_LAST_UPDATED:
+            values["last_updated"] = last_updated
+    return values
+
+
+def _set_state_timestamps(
+    state_record,
+    last_changed: datetime | None,
+    last_updated: datetime | None,
+) -> None:
+    """Write both the modern ``*_ts`` columns and the legacy datetime columns
+    on an ORM row.  Passing ``None`` leaves the field alone."""
+    for column, value in _state_timestamp_values(last_changed, last_updated).items():
+        setattr(state_record, column, value)
 
 
-def _read_state_timestamps(state_record) -> tuple[str | None, str | None]:
-    """Return ISO strings for ``last_changed`` and ``last_updated``.
+def _last_changed_iso(state_record) -> str | None:
+    """Return ``last_changed`` as an ISO string, or ``None`` if unset.
 
-    Prefers the modern ``*_ts`` columns and falls back to the legacy datetime
-    columns.  Returns ``(None, None)`` if neither is set.
+    Prefers the modern ``last_changed_ts`` column and falls back to the
+    legacy datetime column.  ``state_record`` may be an ORM row or a ``Row``
+    selected with ``_RECORD_COLUMNS``.
     """
-    last_changed_iso = None
-    if hasattr(state_record, 'last_changed_ts') and state_record.last_changed_ts is not None:
-        last_changed_iso = dt_util.utc_from_timestamp(state_record.last_changed_ts).isoformat()
-    elif hasattr(state_record, 'last_changed') and state_record.last_changed is not None:
-        last_changed_iso = state_record.last_changed.isoformat()
+    if _HAS_LAST_CHANGED_TS and state_record.last_changed_ts is not None:
+        return datetime.fromtimestamp(state_record.last_changed_ts, _UTC).isoformat()
+    if _HAS_LAST_CHANGED and state_record.last_changed is not None:
+        return state_record.last_changed.isoformat()
+    return None
+
+
+def _last_updated_iso(state_record) -> str | None:
+    """Return ``last_updated`` as an ISO string; see ``_last_changed_iso``."""
+    if _HAS_LAST_UPDATED_TS and state_record.last_updated_ts is not None:
+        return datetime.fromtimestamp(state_record.last_updated_ts, _UTC).isoformat()
+    if _HAS_LAST_UPDATED and state_record.last_updated is not None:
+        return state_record.last_updated.isoformat()
+    return None
+
 
-    last_updated_iso = None
-    if hasattr(state_record, 'last_updated_ts') and state_record.last_updated_ts is not None:
-        last_updated_iso = dt_util.utc_from_timestamp(state_record.last_updated_ts).isoformat()
-    elif hasattr(state_record, 'last_updated') and state_record.last_updated is not None:
-        last_updated_iso = state_record.last_updated.isoformat()
+def _parse_attributes(
+    raw, state_id: int, memo: dict[str, Any] | None = None,
+) -> dict:
+    """Decode a stored attributes blob, falling back to ``{}``.
 
-    return last_changed_iso, last_updated_iso
+    Attributes are normally a JSON string, but some DB backends hand back
+    an already-decoded value or ``None``.  When ``memo`` is given, identical
+    blobs are decoded once and the same dict is returned for each of them —
+    consecutive states of an entity usually share their attributes.
+    """
+    if raw is None:
+        return {}
+    if not isinstance(raw, str):
+        return raw
+    if memo is not None:
+        cached = memo.get(raw)
+        if cached is not None:
+            return cached
+    try:
+        value = json_loads(raw)
+    except (ValueError, TypeError):
+        _LOGGER.warning("Failed to parse attributes for state_id=%s", state_id)
+        value = {}
+    if memo is not None:
+        memo[raw] = value
+    return value
+
+
+# Columns read by ``_query_records``.  Both the modern ``*_ts`` and the legacy
+# datetime columns are selected when present so ``_last_changed_iso`` and
+# ``_last_updated_iso`` can fall back the same way they do for ORM rows.
+# ``attributes`` prefers the shared blob and falls back to the legacy column.
+_RECORD_ATTRIBUTES_COLUMN = (
+    func.coalesce(StateAttributes.shared_attrs, States.attributes).label("attributes")
+    if _HAS_ATTRIBUTES_ID
+    else States.attributes
+)
+_RECORD_FROM = (
+    States.__table__.outerjoin(
+        StateAttributes.__table__,
+        States.attributes_id == StateAttributes.attributes_id,
+    )
+    if _HAS_ATTRIBUTES_ID
+    else States.__table__
+)
+_RECORD_COLUMNS = [States.state_id, States.state, _RECORD_ATTRIBUTES_COLUMN] + [
+    getattr(States, name)
+    for name, present in (
+        ("last_changed_ts", _HAS_LAST_CHANGED_TS),
+        ("last_changed", _HAS_LAST_CHANGED),
+        ("last_updated_ts", _HAS_LAST_UPDATED_TS),
+        ("last_updated", _HAS_LAST_UPDATED),
+    )
+    if present
+]
+# Column records are filtered and ordered by: the epoch column on current
+# schemas, the legacy datetime column otherwise.
+_RECORD_ORDER_COLUMN = States.last_updated_ts if _HAS_LAST_UPDATED_TS else States.last_updated
+
+# Fixed-shape statements, built once at import and executed with bound
+# parameters, so the per-request work is only binding values.  Bind names
+# must not match a ``states`` column: on UPDATE those keys become SET values.
+_PERIOD_TS_COLUMN = States.last_updated_ts if _HAS_LAST_UPDATED_TS else literal(None)
+_STATE_PERIOD_INFO_STMT = select(
+    States.metadata_id, _PERIOD_TS_COLUMN, States.state
+).where(States.state_id == bindparam("target_state_id"))
+_STATES_PERIOD_INFO_STMT = select(
+    States.state_id, States.metadata_id, _PERIOD_TS_COLUMN, States.state
+).where(States.state_id.in_(bindparam("target_state_ids", expanding=True)))
+_STATES_IN_RANGE_PERIOD_INFO_STMT = select(
+    States.state_id, States.metadata_id, _PERIOD_TS_COLUMN, States.state
+).where(
+    States.metadata_id == bindparam("target_metadata_id"),
+    _RECORD_ORDER_COLUMN.between(bindparam("target_start"), bindparam("target_end")),
+)
+_CLEAR_OLD_STATE_ID_STMT = (
+    update(States)
+    .where(States.old_state_id == bindparam("target_state_id"))
+    .values(old_state_id=None)
+    .execution_options(synchronize_session=False)
+    if _HAS_OLD_STATE_ID
+    else None
+)
+_STATES_META_ID_STMT = select(StatesMeta.metadata_id).where(
+    StatesMeta.entity_id == bindparam("target_entity_id")
+)
+_STATE_ATTRIBUTES_ID_STMT = (
+    select(StateAttributes.attributes_id)
+    .where(
+        StateAttributes.hash == bindparam("target_hash"),
+        StateAttributes.shared_attrs == bindparam("target_shared_attrs"),
+    )
+    .limit(1)
+)
+_DELETE_STATE_STMT = (
+    delete(States)
+    .where(States.state_id == bindparam("target_state_id"))
+    .execution_options(synchronize_session=False)
+)
+_CLEAR_OLD_STATE_IDS_STMT = (
+    update(States)
+    .where(States.old_state_id.in_(bindparam("target_state_ids", expanding=True)))
+    .values(old_state_id=None)
+    .execution_options(synchronize_session=False)
+    if _HAS_OLD_STATE_ID
+    else None
+)
+_DELETE_STATES_STMT = (
+    delete(States)
+    .where(States.state_id.in_(bindparam("target_state_ids", expanding=True)))
+    .execution_options(synchronize_session=False)
+)
 
 # Service schemas
 SERVICE_GET_RECORDS_SCHEMA = vol.Schema({
     vol.Required("entity_id"): cv.entity_id,
-    vol.Optional("start_time"): cv.datetime,
-    vol.Optional("end_time"): cv.datetime,
-    vol.Optional("limit", default=100): cv.positive_int,
+    vol.Optional("start_time"): _valid_datetime,
+    vol.Optional("end_time"): _valid_datetime,
+    vol.Optional("limit", default=100): vol.All(
+        cv.positive_int, vol.Clamp(max=MAX_QUERY_LIMIT)
+    ),
 })
 
+# Query-string schema for ``GET /api/history_editor/records``.  Mirrors the
+# service schema, except the limit must be at least 1 and unknown query
+# parameters are dropped rather than rejected.  Both clamp the limit to
+# ``MAX_QUERY_LIMIT``.
+GET_RECORDS_QUERY_SCHEMA = vol.Schema(
+    {
+        vol.Required("entity_id"): cv.entity_id,
+        vol.Optional("start_time"): _valid_datetime,
+        vol.Optional("end_time"): _valid_datetime,
+        vol.Optional("limit", default=100): vol.All(
+            vol.Coerce(int), vol.Range(min=1), vol.Clamp(max=MAX_QUERY_LIMIT)
+        ),
+    },
+    extra=vol.REMOVE_EXTRA,
+)
+
+# Query-string schema for ``GET /api/history_editor/records/multi``: a
+# comma-separated ``entity_ids`` list instead of ``entity_id``.  ``limit``
+# applies to each entity separately.
+GET_MULTI_RECORDS_QUERY_SCHEMA = vol.Schema(
+    {
+        vol.Required("entity_ids"): vol.All(
+            cv.entity_ids, vol.Length(min=1, max=MAX_QUERY_ENTITIES)
+        ),
+        vol.Optional("start_time"): _valid_datetime,
+        vol.Optional("end_time"): _valid_datetime,
+        vol.Optional("limit", default=100): vol.All(
+            vol.Coerce(int), vol.Range(min=1), vol.Clamp(max=MAX_QUERY_LIMIT)
+        ),
+    },
+    extra=vol.REMOVE_EXTRA,
+)
+
+# Query-string schema for ``GET /api/history_editor/statistics``.  The id is
+# a statistic id, which need not be an entity id (``domain:name`` external
+# statistics), so it is only required to be non-empty.
+GET_STATISTICS_QUERY_SCHEMA = vol.Schema(
+    {
+        vol.Required("entity_id"): vol.All(cv.string, vol.Length(min=1)),
+        vol.Optional("statistic_type", default="long_term"): vol.In(
+            ["long_term", "short_term"]
+        ),
+        vol.Optional("start_time"): _valid_datetime,
+        vol.Optional("end_time"): _valid_datetime,
+        vol.Optional("limit", default=100): vol.All(
+            vol.Coerce(int), vol.Range(min=1), vol.Clamp(max=MAX_QUERY_LIMIT)
+        ),
+    },
+    extra=vol.REMOVE_EXTRA,
+)
+
 SERVICE_UPDATE_RECORD_SCHEMA = vol.Schema({
     vol.Required("state_id"): cv.positive_int,
     vol.Optional("state"): cv.string,
     vol.Optional("attributes"): dict,
-    vol.Optional("last_changed"): cv.datetime,
-    vol.Optional("last_updated"): cv.datetime,
+    vol.Optional("last_changed"): _valid_datetime,
+    vol.Optional("last_updated"): _valid_datetime,
 })
 
 SERVICE_DELETE_RECORD_SCHEMA = vol.Schema({
@@ -129,29 +429,55 @@ SERVICE_CREATE_RECORD_SCHEMA = vol.Schema({
     vol.Required("entity_id"): cv.entity_id,
     vol.Required("state"): cv.string,
     vol.Optional("attributes"): dict,
-    vol.Optional("last_changed"): cv.datetime,
-    vol.Optional("last_updated"): cv.datetime,
+    vol.Optional("last_changed"): _valid_datetime,
+    vol.Optional("last_updated"): _valid_datetime,
 })
 
 SERVICE_RECALCULATE_STATISTICS_SCHEMA = vol.Schema({
     vol.Required("entity_id"): cv.entity_id,
-    vol.Required("start_time"): cv.datetime,
-    vol.Required("end_time"): cv.datetime,
+    vol.Required("start_time"): _valid_datetime,
+    vol.Required("end_time"): _valid_datetime,
     vol.Optional("statistic_type", default="both"): vol.In(["short_term", "long_term", "both"]),
 })
 
+SERVICE_BULK_CREATE_RECORD_SCHEMA = vol.Schema({
+    vol.Required("records"): vol.All(
+        cv.ensure_list, [SERVICE_CREATE_RECORD_SCHEMA], vol.Length(min=1)
+    ),
+})
+
+# Mixed create/update/delete operations applied in one transaction.  Each
+# entry is the matching single-record schema plus its ``op`` discriminator.
+SERVICE_BATCH_SCHEMA = vol.Schema({
+    vol.Required("operations"): vol.All(
+        cv.ensure_list,
+        [vol.Any(
+            SERVICE_CREATE_RECORD_SCHEMA.extend({vol.Required("op"): "create"}),
+            SERVICE_UPDATE_RECORD_SCHEMA.extend({vol.Required("op"): "update"}),
+            SERVICE_DELETE_RECORD_SCHEMA.extend({vol.Required("op"): "delete"}),
+        )],
+        vol.Length(min=1),
+    ),
+})
+
 SERVICE_BULK_UPDATE_RECORD_SCHEMA = vol.Schema({
     vol.Required("state_ids"): vol.All(cv.ensure_list, [cv.positive_int], vol.Length(min=1)),
     vol.Optional("state"): cv.string,
     vol.Optional("attributes"): dict,
-    vol.Optional("last_changed"): cv.datetime,
-    vol.Optional("last_updated"): cv.datetime,
+    vol.Optional("last_changed"): _valid_datetime,
+    vol.Optional("last_updated"): _valid_datetime,
 })
 
 SERVICE_BULK_DELETE_RECORD_SCHEMA = vol.Schema({
     vol.Required("state_ids"): vol.All(cv.ensure_list, [cv.positive_int], vol.Length(min=1)),
 })
 
+SERVICE_DELETE_RECORDS_IN_RANGE_SCHEMA = vol.Schema({
+    vol.Required("entity_id"): cv.entity_id,
+    vol.Required("start_time"): _valid_datetime,
+    vol.Required("end_time"): _valid_datetime,
+})
+
 SERVICE_BULK_UPDATE_STATISTIC_SCHEMA = vol.Schema({
     vol.Required("ids"): vol.All(cv.ensure_list, [cv.positive_int], vol.Length(min=1)),
     vol.Optional("statistic_type", default="long_term"): vol.In(["short_term", "long_term"]),
@@ -179,6 +505,108 @@ def _is_admin_request(request: web.Request) -> bool:
     return user is not None and user.is_admin
 
 
+def _query_error_message(err: vol.Invalid) -> str:
+    """Turn a query-schema failure into the 400 message a view returns."""
+    if not err.path:
+        return str(err)
+    field = err.path[0]
+    if err.error_message.startswith("required key"):
+        return f"{field} is required"
+    return f"Invalid {field} parameter"
+
+
+def _maybe_compress(response: web.Response) -> web.Response:
+    """Enable Content-Encoding negotiation on large JSON responses.
+
+    Record and statistics listings are highly repetitive text and shrink
+    several-fold under gzip.  aiohttp picks the encoding from the client's
+    ``Accept-Encoding`` header; small bodies are left alone because the
+    framing overhead outweighs the saving.  Newer HA versions already enable
+    compression in ``HomeAssistantView.json``, in which case this is a no-op.
+    """
+    body = response.body
+    if body is not None and len(body) > COMPRESS_MIN_BYTES:
+        response.enable_compression()
+    return response
+
+
+async def _read_json(request: web.Request) -> dict[str, Any]:
+    """Decode a POST body as a JSON object.
+
+    Parses the raw bytes with orjson (via HA's ``json_loads``) instead of
+    aiohttp's stdlib-based ``request.json()``.  Raises ``ValueError`` for a
+    malformed body or one that is not an object.
+    """
+    data = json_loads(await request.read())
+    if not isinstance(data, dict):
+        raise ValueError("JSON body must be an object")
+    return data
+
+
+STATISTIC_TYPES = ("long_term", "short_term")
+
+# Field specs for ``_validate_fields``: ``(name, kind, required)`` tuples.
+# The record specs are shared by the single-record views and the
+# operations of a batch request.
+_UPDATE_SPEC = (
+    ("state_id", "int", True),
+    ("state", "str", False),
+    ("attributes", "any", False),
+    ("last_changed", "dt", False),
+    ("last_updated", "dt", False),
+)
+_DELETE_SPEC = (("state_id", "int", True),)
+_CREATE_SPEC = (
+    ("entity_id", "any", True),
+    ("state", "str", True),
+    ("attributes", "any", False),
+    ("last_changed", "dt", False),
+    ("last_updated", "dt", False),
+)
+_BULK_UPDATE_SPEC = _UPDATE_SPEC[1:]
+_STATISTIC_TYPE_SPEC = (("statistic_type", "stat_type", False),)
+_UPDATE_STATISTIC_SPEC = (
+    ("id", "int", True),
+    *_STATISTIC_TYPE_SPEC,
+    ("start", "dt", False),
+)
+_DELETE_STATISTIC_SPEC = (("id", "int", True), *_STATISTIC_TYPE_SPEC)
+
+
+def _validate_fields(data, spec) -> tuple[dict[str, Any] | None, str | None]:
+    """Validate and coerce request fields in a single pass over ``spec``.
+
+    ``spec`` is a sequence of ``(name, kind, required)`` tuples, where kind
+    is ``"int"``, ``"str"``, ``"dt"`` (ISO 8601 timestamp), ``"stat_type"``
+    or ``"any"`` (passed through unchanged).  A field that is absent or
+    ``None`` -- or an empty string, for any kind but ``"str"`` -- is left
+    out of the result.  Returns ``(fields, None)`` on success or
+    ``(None, error_message)`` for the first invalid field.
+    """
+    fields: dict[str, Any] = {}
+    for name, kind, required in spec:
+        value = data.get(name)
+        if value is None or (value == "" and kind != "str"):
+            if required:
+                return None, f"{name} is required"
+            continue
+        if kind == "int":
+            try:
+                value = int(value)
+            except (ValueError, TypeError):
+                return None, f"{name} must be an integer"
+        elif kind == "str":
+            value = str(value)
+        elif kind == "dt":
+            value = _fast_parse_dt(value) if isinstance(value, str) else None
+            if value is None:
+                return None, f"Invalid {name} format"
+        elif kind == "stat_type" and value not in STATISTIC_TYPES:
+            return None, "statistic_type must be 'long_term' or 'short_term'"
+        fields[name] = value
+    return fields, None
+
+
 class GetRecordsView(HomeAssistantView):
     """View to handle getting history records via REST API."""
 
@@ -186,10 +614,6 @@ class GetRecordsView(HomeAssistantView):
     name = "api:history_editor:records"
     requires_auth = True
 
-    def __init__(self, hass: HomeAssistant):
-        """Initialize the view."""
-        self.hass = hass
-
     async def get(self, request: web.Request) -> web.Response:
         """Get history records for an entity."""
         if not _is_admin_request(request):
@@ -198,57 +622,40 @@ class GetRecordsView(HomeAssistantView):
                 status_code=403,
             )
         try:
-            entity_id = request.query.get("entity_id")
-            if not entity_id:
-                return self.json(
-                    {"success": False, "error": "entity_id is required"},
-                    status_code=400
-                )
-
-            # Validate limit parameter
             try:
-                limit = int(request.query.get("limit", 100))
-                if limit <= 0:
-                    return self.json(
-                        {"success": False, "error": "limit must be a positive integer"},
-                        status_code=400
-                    )
-            except (ValueError, TypeError):
+                query = GET_RECORDS_QUERY_SCHEMA(dict(request.query))
+            except vol.Invalid as err:
                 return self.json(
-                    {"success": False, "error": "Invalid limit parameter"},
+                    {"success": False, "error": _query_error_message(err)},
                     status_code=400
                 )
+            entity_id = query["entity_id"]
+            limit = query["limit"]
+            start_time = query.get("start_time")
+            end_time = query.get("end_time")
+
+            # Serve a duplicate of a very recent request from the cache
+            hass = request.app[KEY_HASS]
+            cache = hass.data[DOMAIN][DATA_RESPONSE_CACHE]
+            cache_key = ("records", entity_id, start_time, end_time, limit)
+            body = cache.get(cache_key)
+            if body is not None:
+                return _maybe_compress(
+                    web.Response(body=body, content_type="application/json")
+                )
 
-            start_time_str = request.query.get("start_time")
-            end_time_str = request.query.get("end_time")
-
-            start_time = None
-            end_time = None
-
-            if start_time_str:
-                try:
-                    start_time = dt_util.parse_datetime(start_time_str)
-                except (ValueError, TypeError):
-                    return self.json(
-                        {"success": False, "error": "Invalid start_time format"},
-                        status_code=400
-                    )
-
-            if end_time_str:
-                try:
-                    end_time = dt_util.parse_datetime(end_time_str)
-                except (ValueError, TypeError):
-                    return self.json(
-                        {"success": False, "error": "Invalid end_time format"},
-                        status_code=400
-                    )
-
-            # Get the records synchronously in executor
-            result = await get_instance(self.hass).async_add_executor_job(
-                _get_records_sync, self.hass, entity_id, start_time, end_time, limit
+            # Get the records synchronously in executor.  A write that
+            # clears the cache meanwhile makes this body stale, so it is
+            # only cached if the generation is unchanged.
+            generation = cache.generation
+            result = await get_instance(hass).async_add_executor_job(
+                _get_records_sync, hass, entity_id, start_time, end_time, limit
             )
 
-            return self.json(result)
+            response = self.json(result)
+            if result.get("success"):
+                cache.set(cache_key, response.body, generation)
+            return _maybe_compress(response)
 
         except Exception as err:
             _LOGGER.error("Error in GetRecordsView: %s", err)
@@ -258,230 +665,171 @@ class GetRecordsView(HomeAssistantView):
             )
 
 
-class UpdateRecordView(HomeAssistantView):
-    """View to handle updating history records via REST API."""
+class GetMultiRecordsView(HomeAssistantView):
+    """View to get history records of several entities in one request."""
 
-    url = "/api/history_editor/update"
-    name = "api:history_editor:update"
+    url = "/api/history_editor/records/multi"
+    name = "api:history_editor:records_multi"
     requires_auth = True
 
-    def __init__(self, hass: HomeAssistant):
-        """Initialize the view."""
-        self.hass = hass
-
-    async def post(self, request: web.Request) -> web.Response:
-        """Update a history record."""
+    async def get(self, request: web.Request) -> web.Response:
+        """Get history records for a list of entities."""
         if not _is_admin_request(request):
             return self.json(
                 {"success": False, "error": "Admin privileges required"},
                 status_code=403,
             )
         try:
-            data = await request.json()
-
-            state_id = data.get("state_id")
-            if state_id is None:
-                return self.json(
-                    {"success": False, "error": "state_id is required"},
-                    status_code=400
-                )
             try:
-                state_id = int(state_id)
-            except (ValueError, TypeError):
+                query = GET_MULTI_RECORDS_QUERY_SCHEMA(dict(request.query))
+            except vol.Invalid as err:
                 return self.json(
-                    {"success": False, "error": "state_id must be an integer"},
+                    {"success": False, "error": _query_error_message(err)},
                     status_code=400
                 )
+            entity_ids = tuple(dict.fromkeys(query["entity_ids"]))
+            limit = query["limit"]
+            start_time = query.get("start_time")
+            end_time = query.get("end_time")
+
+            hass = request.app[KEY_HASS]
+            cache = hass.data[DOMAIN][DATA_RESPONSE_CACHE]
+            cache_key = ("records_multi", entity_ids, start_time, end_time, limit)
+            body = cache.get(cache_key)
+            if body is not None:
+                return _maybe_compress(
+                    web.Response(body=body, content_type="application/json")
+                )
 
-            new_state = data.get("state")
-            if new_state is not None:
-                new_state = str(new_state)
-            new_attributes = data.get("attributes")
-            
-            # Parse datetime strings if provided
-            new_last_changed = None
-            new_last_updated = None
-            
-            if "last_changed" in data and data["last_changed"]:
-                try:
-                    new_last_changed = dt_util.parse_datetime(data["last_changed"])
-                except (ValueError, TypeError):
-                    return self.json(
-                        {"success": False, "error": "Invalid last_changed format"},
-                        status_code=400
-                    )
-            
-            if "last_updated" in data and data["last_updated"]:
-                try:
-                    new_last_updated = dt_util.parse_datetime(data["last_updated"])
-                except (ValueError, TypeError):
-                    return self.json(
-                        {"success": False, "error": "Invalid last_updated format"},
-                        status_code=400
-                    )
-            
-            # Update the record synchronously in executor
-            result = await get_instance(self.hass).async_add_executor_job(
-                _update_record_sync,
-                self.hass,
-                state_id,
-                new_state,
-                new_attributes,
-                new_last_changed,
-                new_last_updated,
+            generation = cache.generation
+            result = await get_instance(hass).async_add_executor_job(
+                _get_multi_records_sync, hass, list(entity_ids), start_time, end_time, limit
             )
 
-            # Signal the frontend to refresh its statistics cache
+            response = self.json(result)
             if result.get("success"):
-                _fire_statistics_events(self.hass)
-            return self.json(result)
+                cache.set(cache_key, response.body, generation)
+            return _maybe_compress(response)
 
         except Exception as err:
-            _LOGGER.error("Error in UpdateRecordView: %s", err)
+            _LOGGER.error("Error in GetMultiRecordsView: %s", err)
             return self.json(
                 {"success": False, "error": str(err)},
                 status_code=500
             )
 
 
-class DeleteRecordView(HomeAssistantView):
-    """View to handle deleting history records via REST API."""
+class _WriteView(HomeAssistantView):
+    """Base class for the REST endpoints that mutate recorder data.
+
+    Every mutating endpoint handles a request the same way: the admin gate,
+    JSON body decoding, validation failures as 400s, the write itself
+    through ``_async_run_write``, the statistics events on success and
+    unexpected errors as 500s.  Subclasses only set ``url`` and ``name``
+    and implement ``_parse``.
+    """
 
-    url = "/api/history_editor/delete"
-    name = "api:history_editor:delete"
     requires_auth = True
 
-    def __init__(self, hass: HomeAssistant):
-        """Initialize the view."""
-        self.hass = hass
+    def _parse(self, data: dict[str, Any]) -> tuple[tuple | None, str | None]:
+        """Validate a decoded request body.
+
+        Returns ``((target, *args), None)`` naming the sync helper to run and
+        its arguments after ``hass``, or ``(None, error_message)``.
+        """
+        raise NotImplementedError
 
     async def post(self, request: web.Request) -> web.Response:
-        """Delete a history record."""
+        """Apply the mutation described by the request body."""
         if not _is_admin_request(request):
             return self.json(
                 {"success": False, "error": "Admin privileges required"},
                 status_code=403,
             )
         try:
-            data = await request.json()
-
-            state_id = data.get("state_id")
-            if state_id is None:
-                return self.json(
-                    {"success": False, "error": "state_id is required"},
-                    status_code=400
-                )
             try:
-                state_id = int(state_id)
-            except (ValueError, TypeError):
+                data = await _read_json(request)
+            except ValueError:
                 return self.json(
-                    {"success": False, "error": "state_id must be an integer"},
-                    status_code=400
+                    {"success": False, "error": "Invalid JSON body"},
+                    status_code=400,
                 )
 
-            # Delete the record synchronously in executor
-            result = await get_instance(self.hass).async_add_executor_job(
-                _delete_record_sync, self.hass, state_id
-            )
+            call, err = self._parse(data)
+            if err is not None:
+                return self.json({"success": False, "error": err}, status_code=400)
+
+            hass = request.app[KEY_HASS]
+            target, *args = call
+            result = await _async_run_write(hass, target, hass, *args)
 
             # Signal the frontend to refresh its statistics cache
             if result.get("success"):
-                _fire_statistics_events(self.hass)
+                _fire_statistics_events(hass)
 
             return self.json(result)
-            
+
         except Exception as err:
-            _LOGGER.error("Error in DeleteRecordView: %s", err)
+            _LOGGER.error("Error in %s: %s", type(self).__name__, err)
             return self.json(
                 {"success": False, "error": str(err)},
                 status_code=500
             )
 
 
-class CreateRecordView(HomeAssistantView):
-    """View to handle creating history records via REST API."""
+class UpdateRecordView(_WriteView):
+    """View to handle updating history records via REST API."""
 
-    url = "/api/history_editor/create"
-    name = "api:history_editor:create"
-    requires_auth = True
+    url = "/api/history_editor/update"
+    name = "api:history_editor:update"
 
-    def __init__(self, hass: HomeAssistant):
-        """Initialize the view."""
-        self.hass = hass
+    def _parse(self, data):
+        fields, err = _validate_fields(data, _UPDATE_SPEC)
+        if err is not None:
+            return None, err
+        return (
+            _update_record_sync,
+            fields["state_id"],
+            fields.get("state"),
+            fields.get("attributes"),
+            fields.get("last_changed"),
+            fields.get("last_updated"),
+        ), None
 
-    async def post(self, request: web.Request) -> web.Response:
-        """Create a new history record."""
-        if not _is_admin_request(request):
-            return self.json(
-                {"success": False, "error": "Admin privileges required"},
-                status_code=403,
-            )
-        try:
-            data = await request.json()
-            
-            entity_id = data.get("entity_id")
-            state = data.get("state")
 
-            if not entity_id:
-                return self.json(
-                    {"success": False, "error": "entity_id is required"},
-                    status_code=400
-                )
+class DeleteRecordView(_WriteView):
+    """View to handle deleting history records via REST API."""
 
-            if state is None:
-                return self.json(
-                    {"success": False, "error": "state is required"},
-                    status_code=400
-                )
-            state = str(state)
-
-            attributes = data.get("attributes", {})
-            
-            # Parse datetime strings if provided, otherwise use current time
-            last_changed = dt_util.utcnow()
-            last_updated = dt_util.utcnow()
-            
-            if "last_changed" in data and data["last_changed"]:
-                try:
-                    last_changed = dt_util.parse_datetime(data["last_changed"])
-                except (ValueError, TypeError):
-                    return self.json(
-                        {"success": False, "error": "Invalid last_changed format"},
-                        status_code=400
-                    )
-            
-            if "last_updated" in data and data["last_updated"]:
-                try:
-                    last_updated = dt_util.parse_datetime(data["last_updated"])
-                except (ValueError, TypeError):
-                    return self.json(
-                        {"success": False, "error": "Invalid last_updated format"},
-                        status_code=400
-                    )
-            
-            # Create the record synchronously in executor
-            result = await get_instance(self.hass).async_add_executor_job(
-                _create_record_sync,
-                self.hass,
-                entity_id,
-                state,
-                attributes,
-                last_changed,
-                last_updated,
-            )
+    url = "/api/history_editor/delete"
+    name = "api:history_editor:delete"
 
-            # Signal the frontend to refresh its statistics cache
-            if result.get("success"):
-                _fire_statistics_events(self.hass)
+    def _parse(self, data):
+        fields, err = _validate_fields(data, _DELETE_SPEC)
+        if err is not None:
+            return None, err
+        return (_delete_record_sync, fields["state_id"]), None
 
-            return self.json(result)
-            
-        except Exception as err:
-            _LOGGER.error("Error in CreateRecordView: %s", err)
-            return self.json(
-                {"success": False, "error": str(err)},
-                status_code=500
-            )
+
+class CreateRecordView(_WriteView):
+    """View to handle creating history records via REST API."""
+
+    url = "/api/history_editor/create"
+    name = "api:history_editor:create"
+
+    def _parse(self, data):
+        fields, err = _validate_fields(data, _CREATE_SPEC)
+        if err is not None:
+            return None, err
+        # Timestamps default to the current time
+        now = dt_util.utcnow()
+        return (
+            _create_record_sync,
+            fields["entity_id"],
+            fields["state"],
+            fields.get("attributes", {}),
+            fields.get("last_changed", now),
+            fields.get("last_updated", now),
+        ), None
 
 
 class GetStatisticsView(HomeAssistantView):
@@ -491,10 +839,6 @@ class GetStatisticsView(HomeAssistantView):
     name = "api:history_editor:statistics"
     requires_auth = True
 
-    def __init__(self, hass: HomeAssistant):
-        """Initialize the view."""
-        self.hass = hass
-
     async def get(self, request: web.Request) -> web.Response:
         """Get statistics records for an entity."""
         if not _is_admin_request(request):
@@ -503,60 +847,25 @@ class GetStatisticsView(HomeAssistantView):
                 status_code=403,
             )
         try:
-            entity_id = request.query.get("entity_id")
-            if not entity_id:
-                return self.json(
-                    {"success": False, "error": "entity_id is required"},
-                    status_code=400
-                )
-
             try:
-                limit = int(request.query.get("limit", 100))
-                if limit <= 0:
-                    return self.json(
-                        {"success": False, "error": "limit must be a positive integer"},
-                        status_code=400
-                    )
-            except (ValueError, TypeError):
-                return self.json(
-                    {"success": False, "error": "Invalid limit parameter"},
-                    status_code=400
-                )
-
-            statistic_type = request.query.get("statistic_type", "long_term")
-            if statistic_type not in ("long_term", "short_term"):
+                query = GET_STATISTICS_QUERY_SCHEMA(dict(request.query))
+            except vol.Invalid as err:
                 return self.json(
-                    {"success": False, "error": "statistic_type must be 'long_term' or 'short_term'"},
+                    {"success": False, "error": _query_error_message(err)},
                     status_code=400
                 )
 
-            start_time_str = request.query.get("start_time")
-            end_time_str = request.query.get("end_time")
-            start_time = None
-            end_time = None
-
-            if start_time_str:
-                try:
-                    start_time = dt_util.parse_datetime(start_time_str)
-                except (ValueError, TypeError):
-                    return self.json(
-                        {"success": False, "error": "Invalid start_time format"},
-                        status_code=400
-                    )
-
-            if end_time_str:
-                try:
-                    end_time = dt_util.parse_datetime(end_time_str)
-                except (ValueError, TypeError):
-                    return self.json(
-                        {"success": False, "error": "Invalid end_time format"},
-                        status_code=400
-                    )
-
-            result = await get_instance(self.hass).async_add_executor_job(
-                get_statistics_sync, self.hass, entity_id, start_time, end_time, limit, statistic_type
+            hass = request.app[KEY_HASS]
+            result = await get_instance(hass).async_add_executor_job(
+                get_statistics_sync,
+                hass,
+                query["entity_id"],
+                query.get("start_time"),
+                query.get("end_time"),
+                query["limit"],
+                query["statistic_type"],
             )
-            return self.json(result)
+            return _maybe_compress(self.json(result))
 
         except Exception as err:
             _LOGGER.error("Error in GetStatisticsView: %s", err)
@@ -566,149 +875,44 @@ class GetStatisticsView(HomeAssistantView):
             )
 
 
-class UpdateStatisticView(HomeAssistantView):
+class UpdateStatisticView(_WriteView):
     """View to handle updating statistics records via REST API."""
 
     url = "/api/history_editor/statistics/update"
     name = "api:history_editor:statistics:update"
-    requires_auth = True
-
-    def __init__(self, hass: HomeAssistant):
-        """Initialize the view."""
-        self.hass = hass
-
-    async def post(self, request: web.Request) -> web.Response:
-        """Update a statistics record."""
-        if not _is_admin_request(request):
-            return self.json(
-                {"success": False, "error": "Admin privileges required"},
-                status_code=403,
-            )
-        try:
-            data = await request.json()
-
-            stat_id = data.get("id")
-            if stat_id is None:
-                return self.json(
-                    {"success": False, "error": "id is required"},
-                    status_code=400
-                )
-            try:
-                stat_id = int(stat_id)
-            except (ValueError, TypeError):
-                return self.json(
-                    {"success": False, "error": "id must be an integer"},
-                    status_code=400
-                )
-
-            statistic_type = data.get("statistic_type", "long_term")
-            if statistic_type not in ("long_term", "short_term"):
-                return self.json(
-                    {"success": False, "error": "statistic_type must be 'long_term' or 'short_term'"},
-                    status_code=400
-                )
-
-            mean = data.get("mean")
-            min_val = data.get("min")
-            max_val = data.get("max")
-            sum_val = data.get("sum")
-            state = data.get("state")
-
-            start = None
-            if "start" in data and data["start"]:
-                try:
-                    start = dt_util.parse_datetime(data["start"])
-                except (ValueError, TypeError):
-                    return self.json(
-                        {"success": False, "error": "Invalid start format"},
-                        status_code=400
-                    )
-
-            result = await get_instance(self.hass).async_add_executor_job(
-                update_statistic_sync,
-                self.hass,
-                stat_id,
-                mean,
-                min_val,
-                max_val,
-                sum_val,
-                state,
-                start,
-                statistic_type,
-            )
-
-            # Signal the frontend to refresh its statistics cache
-            if result.get("success"):
-                _fire_statistics_events(self.hass)
-
-            return self.json(result)
-
-        except Exception as err:
-            _LOGGER.error("Error in UpdateStatisticView: %s", err)
-            return self.json(
-                {"success": False, "error": str(err)},
-                status_code=500
-            )
 
-
-class DeleteStatisticView(HomeAssistantView):
+    def _parse(self, data):
+        fields, err = _validate_fields(data, _UPDATE_STATISTIC_SPEC)
+        if err is not None:
+            return None, err
+        return (
+            update_statistic_sync,
+            fields["id"],
+            data.get("mean"),
+            data.get("min"),
+            data.get("max"),
+            data.get("sum"),
+            data.get("state"),
+            fields.get("start"),
+            fields.get("statistic_type", "long_term"),
+        ), None
+
+
+class DeleteStatisticView(_WriteView):
     """View to handle deleting statistics records via REST API."""
 
     url = "/api/history_editor/statistics/delete"
     name = "api:history_editor:statistics:delete"
-    requires_auth = True
-
-    def __init__(self, hass: HomeAssistant):
-        """Initialize the view."""
-        self.hass = hass
-
-    async def post(self, request: web.Request) -> web.Response:
-        """Delete a statistics record."""
-        if not _is_admin_request(request):
-            return self.json(
-                {"success": False, "error": "Admin privileges required"},
-                status_code=403,
-            )
-        try:
-            data = await request.json()
-
-            stat_id = data.get("id")
-            if stat_id is None:
-                return self.json(
-                    {"success": False, "error": "id is required"},
-                    status_code=400
-                )
-            try:
-                stat_id = int(stat_id)
-            except (ValueError, TypeError):
-                return self.json(
-                    {"success": False, "error": "id must be an integer"},
-                    status_code=400
-                )
-
-            statistic_type = data.get("statistic_type", "long_term")
-            if statistic_type not in ("long_term", "short_term"):
-                return self.json(
-                    {"success": False, "error": "statistic_type must be 'long_term' or 'short_term'"},
-                    status_code=400
-                )
 
-            result = await get_instance(self.hass).async_add_executor_job(
-                delete_statistic_sync, self.hass, stat_id, statistic_type
-            )
-
-            # Signal the frontend to refresh its statistics cache
-            if result.get("success"):
-                _fire_statistics_events(self.hass)
-
-            return self.json(result)
-
-        except Exception as err:
-            _LOGGER.error("Error in DeleteStatisticView: %s", err)
-            return self.json(
-                {"success": False, "error": str(err)},
-                status_code=500
-            )
+    def _parse(self, data):
+        fields, err = _validate_fields(data, _DELETE_STATISTIC_SPEC)
+        if err is not None:
+            return None, err
+        return (
+            delete_statistic_sync,
+            fields["id"],
+            fields.get("statistic_type", "long_term"),
+        ), None
 
 
 def _parse_id_list(raw, field: str) -> tuple[list[int] | None, str | None]:
@@ -727,205 +931,157 @@ def _parse_id_list(raw, field: str) -> tuple[list[int] | None, str | None]:
         return None, f"{field} must be a non-empty list of integers"
 
 
-class BulkUpdateRecordView(HomeAssistantView):
-    """View to update many state history records with the same overrides."""
-
-    url = "/api/history_editor/bulk_update"
-    name = "api:history_editor:bulk_update"
-    requires_auth = True
-
-    def __init__(self, hass: HomeAssistant):
-        self.hass = hass
+# Field spec for each batch operation, the same one its single-record view
+# validates against.
+BATCH_OPERATIONS = {
+    "create": _CREATE_SPEC,
+    "update": _UPDATE_SPEC,
+    "delete": _DELETE_SPEC,
+}
 
-    async def post(self, request: web.Request) -> web.Response:
-        if not _is_admin_request(request):
-            return self.json(
-                {"success": False, "error": "Admin privileges required"},
-                status_code=403,
-            )
-        try:
-            data = await request.json()
 
-            state_ids, err = _parse_id_list(data.get("state_ids"), "state_ids")
-            if err is not None:
-                return self.json({"success": False, "error": err}, status_code=400)
+def _parse_batch_operations(raw) -> tuple[list[dict[str, Any]] | None, str | None]:
+    """Validate and normalise the ``operations`` list of a batch request.
 
-            new_state = data.get("state")
-            if new_state is not None:
-                new_state = str(new_state)
-            new_attributes = data.get("attributes")
-
-            new_last_changed = None
-            new_last_updated = None
-            if data.get("last_changed"):
-                try:
-                    new_last_changed = dt_util.parse_datetime(data["last_changed"])
-                except (ValueError, TypeError):
-                    return self.json(
-                        {"success": False, "error": "Invalid last_changed format"},
-                        status_code=400,
-                    )
-            if data.get("last_updated"):
-                try:
-                    new_last_updated = dt_util.parse_datetime(data["last_updated"])
-                except (ValueError, TypeError):
-                    return self.json(
-                        {"success": False, "error": "Invalid last_updated format"},
-                        status_code=400,
-                    )
-
-            result = await get_instance(self.hass).async_add_executor_job(
-                _bulk_update_record_sync,
-                self.hass,
-                state_ids,
-                new_state,
-                new_attributes,
-                new_last_changed,
-                new_last_updated,
+    Each entry is checked by ``_validate_fields`` against the spec of the
+    matching single-record view, so the rules and messages are the same;
+    errors are prefixed with the entry's index.  Returns ``(operations,
+    None)`` on success or ``(None, error_message)`` on the first invalid
+    entry.  Each normalised operation carries the arguments the matching
+    sync helper expects, with ``create`` timestamps defaulted to now.
+    """
+    if raw is None:
+        return None, "operations is required"
+    if not isinstance(raw, list) or not raw:
+        return None, "operations must be a non-empty list"
+
+    now = dt_util.utcnow()
+    operations: list[dict[str, Any]] = []
+    for index, item in enumerate(raw):
+        if not isinstance(item, dict):
+            return None, f"operations[{index}] must be an object"
+        op = item.get("op")
+        if not isinstance(op, str) or op not in BATCH_OPERATIONS:
+            return None, (
+                f"operations[{index}].op must be one of {', '.join(BATCH_OPERATIONS)}"
             )
+        fields, err = _validate_fields(item, BATCH_OPERATIONS[op])
+        if err is not None:
+            return None, f"operations[{index}]: {err}"
+
+        parsed: dict[str, Any] = {
+            "op": op,
+            "last_changed": fields.get("last_changed"),
+            "last_updated": fields.get("last_updated"),
+        }
+        if op == "create":
+            parsed["entity_id"] = fields["entity_id"]
+            parsed["state"] = fields["state"]
+            parsed["attributes"] = fields.get("attributes", {})
+            parsed["last_changed"] = parsed["last_changed"] or now
+            parsed["last_updated"] = parsed["last_updated"] or now
+        else:
+            parsed["state_id"] = fields["state_id"]
+            if op == "update":
+                parsed["state"] = fields.get("state")
+                parsed["attributes"] = fields.get("attributes")
+        operations.append(parsed)
+
+    return operations, None
+
+
+class BulkUpdateRecordView(_WriteView):
+    """View to update many state history records with the same overrides."""
 
-            if result.get("success"):
-                _fire_statistics_events(self.hass)
-
-            return self.json(result)
+    url = "/api/history_editor/bulk_update"
+    name = "api:history_editor:bulk_update"
 
-        except Exception as err:
-            _LOGGER.error("Error in BulkUpdateRecordView: %s", err)
-            return self.json({"success": False, "error": str(err)}, status_code=500)
+    def _parse(self, data):
+        state_ids, err = _parse_id_list(data.get("state_ids"), "state_ids")
+        if err is not None:
+            return None, err
+        fields, err = _validate_fields(data, _BULK_UPDATE_SPEC)
+        if err is not None:
+            return None, err
+        return (
+            _bulk_update_record_sync,
+            state_ids,
+            fields.get("state"),
+            fields.get("attributes"),
+            fields.get("last_changed"),
+            fields.get("last_updated"),
+        ), None
 
 
-class BulkDeleteRecordView(HomeAssistantView):
+class BulkDeleteRecordView(_WriteView):
     """View to delete many state history records in one transaction."""
 
     url = "/api/history_editor/bulk_delete"
     name = "api:history_editor:bulk_delete"
-    requires_auth = True
 
-    def __init__(self, hass: HomeAssistant):
-        self.hass = hass
+    def _parse(self, data):
+        state_ids, err = _parse_id_list(data.get("state_ids"), "state_ids")
+        if err is not None:
+            return None, err
+        return (_bulk_delete_record_sync, state_ids), None
 
-    async def post(self, request: web.Request) -> web.Response:
-        if not _is_admin_request(request):
-            return self.json(
-                {"success": False, "error": "Admin privileges required"},
-                status_code=403,
-            )
-        try:
-            data = await request.json()
-
-            state_ids, err = _parse_id_list(data.get("state_ids"), "state_ids")
-            if err is not None:
-                return self.json({"success": False, "error": err}, status_code=400)
-
-            result = await get_instance(self.hass).async_add_executor_job(
-                _bulk_delete_record_sync, self.hass, state_ids,
-            )
-
-            if result.get("success"):
-                _fire_statistics_events(self.hass)
 
-            return self.json(result)
-
-        except Exception as err:
-            _LOGGER.error("Error in BulkDeleteRecordView: %s", err)
-            return self.json({"success": False, "error": str(err)}, status_code=500)
-
-
-class BulkUpdateStatisticView(HomeAssistantView):
+class BulkUpdateStatisticView(_WriteView):
     """View to update many statistics records (short or long-term) at once."""
 
     url = "/api/history_editor/statistics/bulk_update"
     name = "api:history_editor:statistics:bulk_update"
-    requires_auth = True
-
-    def __init__(self, hass: HomeAssistant):
-        self.hass = hass
-
-    async def post(self, request: web.Request) -> web.Response:
-        if not _is_admin_request(request):
-            return self.json(
-                {"success": False, "error": "Admin privileges required"},
-                status_code=403,
-            )
-        try:
-            data = await request.json()
-
-            ids, err = _parse_id_list(data.get("ids"), "ids")
-            if err is not None:
-                return self.json({"success": False, "error": err}, status_code=400)
-
-            statistic_type = data.get("statistic_type", "long_term")
-            if statistic_type not in ("long_term", "short_term"):
-                return self.json(
-                    {"success": False, "error": "statistic_type must be 'long_term' or 'short_term'"},
-                    status_code=400,
-                )
-
-            result = await get_instance(self.hass).async_add_executor_job(
-                bulk_update_statistic_sync,
-                self.hass,
-                ids,
-                data.get("mean"),
-                data.get("min"),
-                data.get("max"),
-                data.get("sum"),
-                data.get("state"),
-                statistic_type,
-            )
-
-            if result.get("success"):
-                _fire_statistics_events(self.hass)
-
-            return self.json(result)
 
-        except Exception as err:
-            _LOGGER.error("Error in BulkUpdateStatisticView: %s", err)
-            return self.json({"success": False, "error": str(err)}, status_code=500)
+    def _parse(self, data):
+        ids, err = _parse_id_list(data.get("ids"), "ids")
+        if err is not None:
+            return None, err
+        fields, err = _validate_fields(data, _STATISTIC_TYPE_SPEC)
+        if err is not None:
+            return None, err
+        return (
+            bulk_update_statistic_sync,
+            ids,
+            data.get("mean"),
+            data.get("min"),
+            data.get("max"),
+            data.get("sum"),
+            data.get("state"),
+            fields.get("statistic_type", "long_term"),
+        ), None
 
 
-class BulkDeleteStatisticView(HomeAssistantView):
+class BulkDeleteStatisticView(_WriteView):
     """View to delete many statistics records (short or long-term) at once."""
 
     url = "/api/history_editor/statistics/bulk_delete"
     name = "api:history_editor:statistics:bulk_delete"
-    requires_auth = True
-
-    def __init__(self, hass: HomeAssistant):
-        self.hass = hass
-
-    async def post(self, request: web.Request) -> web.Response:
-        if not _is_admin_request(request):
-            return self.json(
-                {"success": False, "error": "Admin privileges required"},
-                status_code=403,
-            )
-        try:
-            data = await request.json()
-
-            ids, err = _parse_id_list(data.get("ids"), "ids")
-            if err is not None:
-                return self.json({"success": False, "error": err}, status_code=400)
 
-            statistic_type = data.get("statistic_type", "long_term")
-            if statistic_type not in ("long_term", "short_term"):
-                return self.json(
-                    {"success": False, "error": "statistic_type must be 'long_term' or 'short_term'"},
-                    status_code=400,
-                )
-
-            result = await get_instance(self.hass).async_add_executor_job(
-                bulk_delete_statistic_sync, self.hass, ids, statistic_type,
-            )
+    def _parse(self, data):
+        ids, err = _parse_id_list(data.get("ids"), "ids")
+        if err is not None:
+            return None, err
+        fields, err = _validate_fields(data, _STATISTIC_TYPE_SPEC)
+        if err is not None:
+            return None, err
+        return (
+            bulk_delete_statistic_sync,
+            ids,
+            fields.get("statistic_type", "long_term"),
+        ), None
 
-            if result.get("success"):
-                _fire_statistics_events(self.hass)
 
-            return self.json(result)
+class BatchView(_WriteView):
+    """View to apply mixed create/update/delete operations in one transaction."""
 
-        except Exception as err:
-            _LOGGER.error("Error in BulkDeleteStatisticView: %s", err)
-            return self.json({"success": False, "error": str(err)}, status_code=500)
+    url = "/api/history_editor/batch"
+    name = "api:history_editor:batch"
 
+    def _parse(self, data):
+        operations, err = _parse_batch_operations(data.get("operations"))
+        if err is not None:
+            return None, err
+        return (_batch_sync, operations), None
 
 
 def _check_schema(hass: HomeAssistant) -> dict[str, Any] | None:
@@ -936,6 +1092,108 @@ def _check_schema(hass: HomeAssistant) -> dict[str, Any] | None:
     return None
 
 
+def _records_stmt(
+    entity_id: str,
+    metadata_id: int | None,
+    start_time: datetime | None,
+    end_time: datetime | None,
+    fetch_limit: int,
+) -> StatementLambdaElement:
+    """Build the (cached) records query for ``_query_records``.
+
+    Built from ``lambda_stmt`` so SQLAlchemy compiles each shape of the
+    query (with/without start and end bounds) once and afterwards only
+    rebinds ``metadata_id``, the bounds and the limit.  Filtering on
+    ``metadata_id`` directly (rather than joining ``states_meta``) lets the
+    database walk the recorder's ``(metadata_id, last_updated_ts)`` index
+    backwards and stop after ``fetch_limit`` rows.  When ``metadata_id`` is
+    not known yet it comes from a scalar subquery on ``entity_id`` and is
+    added to the selected columns.
+    """
+    # Use timestamp fields for filtering (newer schema) with fallback to legacy fields.
+    # Note: this is an inclusive user filter ([start_time, end_time]).  It
+    # does NOT match the half-open [start, start+period) convention used
+    # by statistics bucket queries elsewhere in this file — a record at
+    # exactly end_time is included here but would be excluded by a stats
+    # bucket covering the same boundary.
+    start_bound: float | datetime | None = start_time
+    end_bound: float | datetime | None = end_time
+    if _HAS_LAST_UPDATED_TS:
+        start_bound = start_time.timestamp() if start_time else None
+        end_bound = end_time.timestamp() if end_time else None
+
+    if metadata_id is not None:
+        stmt = lambda_stmt(
+            lambda: select(*_RECORD_COLUMNS)
+            .select_from(_RECORD_FROM)
+            .where(States.metadata_id == metadata_id)
+        )
+    else:
+        # Not cached yet: resolve the id in the same round trip with a scalar
+        # subquery, and select it so the caller can cache it.
+        stmt = lambda_stmt(
+            lambda: select(*_RECORD_COLUMNS, States.metadata_id)
+            .select_from(_RECORD_FROM)
+            .where(
+                States.metadata_id
+                == select(StatesMeta.metadata_id)
+                .where(StatesMeta.entity_id == entity_id)
+                .scalar_subquery()
+            )
+        )
+    if start_bound is not None:
+        stmt += lambda q: q.where(_RECORD_ORDER_COLUMN >= start_bound)
+    if end_bound is not None:
+        stmt += lambda q: q.where(_RECORD_ORDER_COLUMN <= end_bound)
+    # Fetch one extra record so the caller can tell whether more exist
+    stmt += lambda q: q.order_by(_RECORD_ORDER_COLUMN.desc()).limit(fetch_limit)
+    return stmt
+
+
+def _query_records(
+    session,
+    entity_id: str,
+    start_time: datetime | None,
+    end_time: datetime | None,
+    limit: int,
+) -> tuple[list[dict[str, Any]], bool]:
+    """Return ``(records, has_more)`` for an entity within an open session.
+
+    Selects only the columns the response needs and streams the result in
+    ``yield_per`` batches (a server-side cursor where the backend supports
+    one), so no ORM instances are built for the rows.
+    """
+    # States are keyed by metadata_id since HA 2022.4.  On a cache miss the
+    # statement resolves it itself, so the read is always one round trip.
+    metadata_id = _METADATA_ID_CACHE.get(entity_id)
+    stmt = _records_stmt(entity_id, metadata_id, start_time, end_time, limit + 1)
+
+    result = session.execute(
+        stmt, execution_options={"stream_results": True}
+    ).yield_per(RECORDS_YIELD_PER)
+    rows = list(islice(result, limit))
+    # The statement fetched limit + 1 rows; a leftover row means more exist.
+    has_more = result.fetchone() is not None
+    result.close()
+    if metadata_id is None and rows:
+        _METADATA_ID_CACHE.set(entity_id, rows[0].metadata_id)
+
+    attributes_memo: dict[str, Any] = {}
+    # Handle both old (last_changed/last_updated) and new (last_changed_ts/last_updated_ts) schemas
+    records = [
+        {
+            "state_id": row.state_id,
+            "state": row.state,
+            "attributes": _parse_attributes(row.attributes, row.state_id, attributes_memo),
+            "last_changed": _last_changed_iso(row),
+            "last_updated": _last_updated_iso(row),
+        }
+        for row in rows
+    ]
+    _LOGGER.debug("Query returned %d states (has_more=%s)", len(records), has_more)
+    return records, has_more
+
+
 def _get_records_sync(
     hass: HomeAssistant,
     entity_id: str,
@@ -957,81 +1215,79 @@ def _get_records_sync(
                      entity_id, start_time, end_time, limit)
 
         with recorder.get_session() as session:
-            # Join with StatesMeta to filter by entity_id (required for HA 2022.4+)
-            query = (
-                session.query(States)
-                .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
-                .filter(StatesMeta.entity_id == entity_id)
+            records, has_more = _query_records(
+                session, entity_id, start_time, end_time, limit
             )
-            
-            # Use timestamp fields for filtering (newer schema) with fallback to legacy fields.
-            # Note: this is an inclusive user filter ([start_time, end_time]).  It
-            # does NOT match the half-open [start, start+period) convention used
-            # by statistics bucket queries elsewhere in this file — a record at
-            # exactly end_time is included here but would be excluded by a stats
-            # bucket covering the same boundary.
-            if start_time:
-                if hasattr(States, 'last_updated_ts'):
-                    start_ts = start_time.timestamp()
-                    query = query.filter(States.last_updated_ts >= start_ts)
-                else:
-                    # Fallback to legacy datetime field
-                    query = query.filter(States.last_updated >= start_time)
-            if end_time:
-                if hasattr(States, 'last_updated_ts'):
-                    end_ts = end_time.timestamp()
-                    query = query.filter(States.last_updated_ts <= end_ts)
-                else:
-                    # Fallback to legacy datetime field
-                    query = query.filter(States.last_updated <= end_time)
-            
-            # Order by timestamp field (newer schema) with fallback to legacy field
-            # Fetch one extra record to determine whether more records exist
-            fetch_limit = limit + 1
-            if hasattr(States, 'last_updated_ts'):
-                query = query.order_by(States.last_updated_ts.desc()).limit(fetch_limit)
-            else:
-                # Fallback to legacy datetime field
-                query = query.order_by(States.last_updated.desc()).limit(fetch_limit)
-            
-            states = query.all()
-            has_more = len(states) > limit
-            if has_more:
-                states = states[:limit]
-            _LOGGER.debug("Query returned %d states (has_more=%s)", len(states), has_more)
-
-            records = []
-            for state in states:
-                # Ensure attributes is a dict (it might be a string in some DB backends)
-                try:
-                    attributes = state.attributes
-                    if isinstance(attributes, str):
-                        attributes = json.loads(attributes)
-                    elif attributes is None:
-                        attributes = {}
-                except (ValueError, TypeError, json.JSONDecodeError):
-                    _LOGGER.warning("Failed to parse attributes for state_id=%s", state.state_id)
-                    attributes = {}
-                
-                # Handle both old (last_changed/last_updated) and new (last_changed_ts/last_updated_ts) schemas
-                last_changed_iso, last_updated_iso = _read_state_timestamps(state)
-
-                records.append({
-                    "state_id": state.state_id,
-                    "entity_id": entity_id,  # Use the parameter instead of state.entity_id (not in new schema)
-                    "state": state.state,
-                    "attributes": attributes,
-                    "last_changed": last_changed_iso,
-                    "last_updated": last_updated_iso,
-                })
-
             _LOGGER.debug("Retrieved %d records for entity %s", len(records), entity_id)
-            return {"success": True, "records": records, "has_more": has_more}
+            # entity_id is reported once for the whole page rather than
+            # repeated in every record.
+            return {
+                "success": True,
+                "entity_id": entity_id,
+                "records": records,
+                "has_more": has_more,
+            }
     except Exception as err:
         _LOGGER.error("Error retrieving records: %s", err, exc_info=True)
         return {"success": False, "error": str(err)}
 
 
+def _get_multi_records_sync(
+    hass: HomeAssistant,
+    entity_ids: list[str],
+    start_time: datetime | None,
+    end_time: datetime | None,
+    limit: int
+) -> dict[str, Any]:
+    """Get history records for several entities in one session (synchronous).
+
+    Each entity gets its own ``_query_records`` page of up to ``limit``
+    records, so every query still walks the ``(metadata_id,
+    last_updated_ts)`` index and stops at its own limit, but the whole
+    request shares one executor job and one session.
+
+    Returns ``{success, entities}`` where ``entities`` maps each entity_id
+    to ``{records, has_more}`` in request order.
+    """
+    schema_err = _check_schema(hass)
+    if schema_err:
+        return schema_err
+    recorder = get_instance(hass)
+    if recorder is None:
+        _LOGGER.error("Recorder component not available")
+        return {"success": False, "error": "Recorder not available"}
+
+    try:
+        entities: dict[str, dict[str, Any]] = {}
+        with recorder.get_session() as session:
+            for entity_id in entity_ids:
+                records, has_more = _query_records(
+                    session, entity_id, start_time, end_time, limit
+                )
+                entities[entity_id] = {"records": records, "has_more": has_more}
+        _LOGGER.debug("Retrieved records for %d entities", len(entities))
+        return {"success": True, "entities": entities}
+    except Exception as err:
+        _LOGGER.error("Error retrieving records: %s", err, exc_info=True)
+        return {"success": False, "error": str(err)}
+
+
+async def _async_run_write(hass: HomeAssistant, target, *args) -> dict[str, Any]:
+    """Run a mutating sync helper on the recorder executor, one at a time.
+
+    SQLite serialises writers, so letting several edits queue up their own
+    write transactions only produces lock contention and "database is
+    locked" retries.  All service and REST mutations go through the
+    semaphore created in ``async_setup``.  A successful mutation clears
+    the read response cache.
+    """
+    async with hass.data[DOMAIN][DATA_WRITE_SEMAPHORE]:
+        result = await get_instance(hass).async_add_executor_job(target, *args)
+    if result.get("success"):
+        hass.data[DOMAIN][DATA_RESPONSE_CACHE].clear()
+    return result
+
+
 def _fire_statistics_events(hass: HomeAssistant) -> None:
     """Fire recorder statistics-generated events after a direct DB modification.
 
@@ -1063,18 +1319,24 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
         )
         return False
 
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    domain_data[DATA_WRITE_SEMAPHORE] = asyncio.Semaphore(WRITE_CONCURRENCY)
+    domain_data[DATA_RESPONSE_CACHE] = ResponseCache()
+
     # Register REST API views
-    hass.http.register_view(GetRecordsView(hass))
-    hass.http.register_view(UpdateRecordView(hass))
-    hass.http.register_view(DeleteRecordView(hass))
-    hass.http.register_view(CreateRecordView(hass))
-    hass.http.register_view(GetStatisticsView(hass))
-    hass.http.register_view(UpdateStatisticView(hass))
-    hass.http.register_view(DeleteStatisticView(hass))
-    hass.http.register_view(BulkUpdateRecordView(hass))
-    hass.http.register_view(BulkDeleteRecordView(hass))
-    hass.http.register_view(BulkUpdateStatisticView(hass))
-    hass.http.register_view(BulkDeleteStatisticView(hass))
+    hass.http.register_view(GetRecordsView())
+    hass.http.register_view(GetMultiRecordsView())
+    hass.http.register_view(UpdateRecordView())
+    hass.http.register_view(DeleteRecordView())
+    hass.http.register_view(CreateRecordView())
+    hass.http.register_view(GetStatisticsView())
+    hass.http.register_view(UpdateStatisticView())
+    hass.http.register_view(DeleteStatisticView())
+    hass.http.register_view(BulkUpdateRecordView())
+    hass.http.register_view(BulkDeleteRecordView())
+    hass.http.register_view(BulkUpdateStatisticView())
+    hass.http.register_view(BulkDeleteStatisticView())
+    hass.http.register_view(BatchView())
 
     async def get_records(call: ServiceCall) -> ServiceResponse:
         """Get history records for an entity."""
@@ -1096,7 +1358,8 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
         new_last_changed = call.data.get("last_changed")
         new_last_updated = call.data.get("last_updated")
 
-        result = await get_instance(hass).async_add_executor_job(
+        result = await _async_run_write(
+            hass,
             _update_record_sync,
             hass,
             state_id,
@@ -1113,7 +1376,7 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
         """Delete a history record."""
         state_id = call.data["state_id"]
 
-        result = await get_instance(hass).async_add_executor_job(_delete_record_sync, hass, state_id)
+        result = await _async_run_write(hass, _delete_record_sync, hass, state_id)
         if not result.get("success"):
             raise HomeAssistantError(result.get("error") or "Failed to delete record")
         _fire_statistics_events(hass)
@@ -1123,11 +1386,12 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
         entity_id = call.data["entity_id"]
         state = call.data["state"]
         attributes = call.data.get("attributes", {})
-        last_changed = call.data.get("last_changed", dt_util.utcnow())
-        last_updated = call.data.get("last_updated", dt_util.utcnow())
+        now = dt_util.utcnow()
+        last_changed = call.data.get("last_changed", now)
+        last_updated = call.data.get("last_updated", now)
 
-        result = await get_instance(hass).async_add_executor_job(
-            _create_record_sync, hass, entity_id, state, attributes, last_changed, last_updated
+        result = await _async_run_write(
+            hass, _create_record_sync, hass, entity_id, state, attributes, last_changed, last_updated
         )
         if not result.get("success"):
             raise HomeAssistantError(result.get("error") or "Failed to create record")
@@ -1140,7 +1404,8 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
         end_time = call.data["end_time"]
         statistic_type = call.data.get("statistic_type", "both")
 
-        result = await get_instance(hass).async_add_executor_job(
+        result = await _async_run_write(
+            hass,
             recalculate_statistics_sync,
             hass,
             entity_id,
@@ -1153,9 +1418,29 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
         _fire_statistics_events(hass)
         return result
 
+    async def bulk_create_record(call: ServiceCall) -> ServiceResponse:
+        """Create multiple history records in one transaction."""
+        now = dt_util.utcnow()
+        records = [
+            {
+                "entity_id": record["entity_id"],
+                "state": record["state"],
+                "attributes": record.get("attributes", {}),
+                "last_changed": record.get("last_changed", now),
+                "last_updated": record.get("last_updated", now),
+            }
+            for record in call.data["records"]
+        ]
+        result = await _async_run_write(hass, _bulk_create_record_sync, hass, records)
+        if not result.get("success"):
+            raise HomeAssistantError(result.get("error") or "Failed to bulk-create records")
+        _fire_statistics_events(hass)
+        return result
+
     async def bulk_update_record(call: ServiceCall) -> ServiceResponse:
         """Apply the same field overrides to multiple state history records."""
-        result = await get_instance(hass).async_add_executor_job(
+        result = await _async_run_write(
+            hass,
             _bulk_update_record_sync,
             hass,
             call.data["state_ids"],
@@ -1171,17 +1456,33 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
 
     async def bulk_delete_record(call: ServiceCall) -> ServiceResponse:
         """Delete multiple state history records in one transaction."""
-        result = await get_instance(hass).async_add_executor_job(
-            _bulk_delete_record_sync, hass, call.data["state_ids"],
+        result = await _async_run_write(
+            hass, _bulk_delete_record_sync, hass, call.data["state_ids"],
         )
         if not result.get("success"):
             raise HomeAssistantError(result.get("error") or "Failed to bulk-delete records")
         _fire_statistics_events(hass)
         return result
 
+    async def delete_records_in_range(call: ServiceCall) -> ServiceResponse:
+        """Delete every history record of an entity within a time range."""
+        result = await _async_run_write(
+            hass,
+            _delete_records_in_range_sync,
+            hass,
+            call.data["entity_id"],
+            call.data["start_time"],
+            call.data["end_time"],
+        )
+        if not result.get("success"):
+            raise HomeAssistantError(result.get("error") or "Failed to delete records")
+        _fire_statistics_events(hass)
+        return result
+
     async def bulk_update_statistic(call: ServiceCall) -> ServiceResponse:
         """Apply the same column overrides to multiple statistics rows."""
-        result = await get_instance(hass).async_add_executor_job(
+        result = await _async_run_write(
+            hass,
             bulk_update_statistic_sync,
             hass,
             call.data["ids"],
@@ -1199,14 +1500,60 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
 
     async def bulk_delete_statistic(call: ServiceCall) -> ServiceResponse:
         """Delete multiple statistics rows in one transaction."""
-        result = await get_instance(hass).async_add_executor_job(
+        result = await _async_run_write(
+            hass,
             bulk_delete_statistic_sync,
             hass,
             call.data["ids"],
             call.data.get("statistic_type", "long_term"),
         )
         if not result.get("success"):
-            raise HomeAssistantError(result.get("error") or "Failed to bulk-delete statistics")
+            raise HomeAssistantError(result.get("error") or "Failed to bulk-delete statistics")
+        _fire_statistics_events(hass)
+        return result
+
+    async def batch(call: ServiceCall) -> ServiceResponse:
+        """Apply a mixed list of create/update/delete operations in one transaction.
+
+    ``operations`` is the normalised output of ``_parse_batch_operations``.
+    Operations run in order against a single session and are committed
+    together.  Updates and deletes check that their row exists before
+    writing anything, so a missing ``state_id`` is reported in that
+    operation's result without aborting the rest; any other error rolls
+    back the whole batch.  The statistics cascade runs once for every
+    affected period across the whole batch.
+
+    Returns ``{success, results, statistics_stale}`` where ``results`` has
+    one ``{op, success, state_id[, error]}`` entry per operation.
+    """
+        now = dt_util.utcnow()
+        operations: list[dict[str, Any]] = []
+        for item in call.data["operations"]:
+            op = item["op"]
+            if op == "create":
+                operations.append({
+                    "op": op,
+                    "entity_id": item["entity_id"],
+                    "state": item["state"],
+                    "attributes": item.get("attributes", {}),
+                    "last_changed": item.get("last_changed", now),
+                    "last_updated": item.get("last_updated", now),
+                })
+            elif op == "update":
+                operations.append({
+                    "op": op,
+                    "state_id": item["state_id"],
+                    "state": item.get("state"),
+                    "attributes": item.get("attributes"),
+                    "last_changed": item.get("last_changed"),
+                    "last_updated": item.get("last_updated"),
+                })
+            else:
+                operations.append({"op": op, "state_id": item["state_id"]})
+
+        result = await _async_run_write(hass, _batch_sync, hass, operations)
+        if not result.get("success"):
+            raise HomeAssistantError(result.get("error") or "Failed to apply batch")
         _fire_statistics_events(hass)
         return result
 
@@ -1229,6 +1576,11 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
         schema=SERVICE_RECALCULATE_STATISTICS_SCHEMA,
         supports_response=SupportsResponse.ONLY,
     )
+    hass.services.async_register(
+        DOMAIN, SERVICE_BULK_CREATE_RECORD, bulk_create_record,
+        schema=SERVICE_BULK_CREATE_RECORD_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
     hass.services.async_register(
         DOMAIN, SERVICE_BULK_UPDATE_RECORD, bulk_update_record,
         schema=SERVICE_BULK_UPDATE_RECORD_SCHEMA,
@@ -1239,6 +1591,11 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
         schema=SERVICE_BULK_DELETE_RECORD_SCHEMA,
         supports_response=SupportsResponse.ONLY,
     )
+    hass.services.async_register(
+        DOMAIN, SERVICE_DELETE_RECORDS_IN_RANGE, delete_records_in_range,
+        schema=SERVICE_DELETE_RECORDS_IN_RANGE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
     hass.services.async_register(
         DOMAIN, SERVICE_BULK_UPDATE_STATISTIC, bulk_update_statistic,
         schema=SERVICE_BULK_UPDATE_STATISTIC_SCHEMA,
@@ -1249,13 +1606,20 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
         schema=SERVICE_BULK_DELETE_STATISTIC_SCHEMA,
         supports_response=SupportsResponse.ONLY,
     )
+    hass.services.async_register(
+        DOMAIN, SERVICE_BATCH, batch,
+        schema=SERVICE_BATCH_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
 
     # Register the frontend panel
-    await async_register_panel(hass)
+    integration = await async_get_integration(hass, DOMAIN)
+    await async_register_panel(hass, str(integration.version))
 
     _LOGGER.info("History Editor component loaded successfully")
     return True
 
+
 def _update_record_sync(
     hass: HomeAssistant,
     state_id: int,
@@ -1275,24 +1639,16 @@ def _update_record_sync(
 
     try:
         with recorder.get_session() as session:
-            state = session.query(States).filter(States.state_id == state_id).first()
-            
-            if state is None:
+            affected_5min: dict[int, set[int]] = {}
+            affected_hour: dict[int, set[int]] = {}
+            if not _apply_record_update(
+                session, state_id, new_state, new_attributes,
+                new_last_changed, new_last_updated,
+                affected_5min, affected_hour,
+            ):
                 _LOGGER.error("State with ID %s not found", state_id)
                 return {"success": False, "error": f"State ID {state_id} not found"}
 
-            # Capture old timestamp before update (for statistics period calculation)
-            old_ts = None
-            if hasattr(state, 'last_updated_ts') and state.last_updated_ts is not None:
-                old_ts = state.last_updated_ts
-
-            if new_state is not None:
-                state.state = new_state
-            if new_attributes is not None:
-                # Serialize dict to JSON string for database storage
-                state.attributes = json.dumps(new_attributes)
-            _set_state_timestamps(state, new_last_changed, new_last_updated)
-
             session.commit()
             _LOGGER.info("Updated state record %s", state_id)
 
@@ -1300,21 +1656,10 @@ def _update_record_sync(
             # non-fatal — the state update is already committed, so rather
             # than rolling it back we flag statistics_stale so the caller
             # can re-run recalculate_statistics.
-            statistics_stale = False
-            if HAS_STATISTICS and (new_state is not None or new_last_updated is not None):
-                try:
-                    update_statistics_after_state_change(
-                        session, state, old_ts, new_last_updated
-                    )
-                    session.commit()
-                except Exception as stats_err:
-                    statistics_stale = True
-                    _LOGGER.warning(
-                        "Error updating statistics after state change for state %s: %s "
-                        "(state record is updated; statistics may be stale — "
-                        "call history_editor.recalculate_statistics to fix)",
-                        state_id, stats_err
-                    )
+            statistics_stale = _update_statistics_after_commit(
+                session, affected_5min, affected_hour,
+                f"state change for state {state_id}",
+            )
 
             return {
                 "success": True,
@@ -1338,92 +1683,33 @@ def _delete_record_sync(hass: HomeAssistant, state_id: int) -> dict[str, Any]:
 
     try:
         with recorder.get_session() as session:
-            # First check if the record exists
-            state = session.query(States).filter(States.state_id == state_id).first()
-            if state is None:
+            affected_5min: dict[int, set[int]] = {}
+            affected_hour: dict[int, set[int]] = {}
+            stats_deleted = _apply_record_delete(
+                session, state_id, affected_5min, affected_hour,
+            )
+            if stats_deleted is None:
                 _LOGGER.error("State with ID %s not found", state_id)
                 return {"success": False, "error": f"State ID {state_id} not found"}
 
-            # Capture state info needed for statistics recalculation before the record is deleted
-            state_ts: float | None = None
-            state_metadata_id: int | None = None
-            if HAS_STATISTICS:
-                if hasattr(state, 'last_updated_ts') and state.last_updated_ts is not None:
-                    state_ts = state.last_updated_ts
-                if hasattr(state, 'metadata_id') and state.metadata_id is not None:
-                    state_metadata_id = state.metadata_id
-
-            # Nullify old_state_id references in other states to avoid self-referential FK constraint errors
-            try:
-                refs_updated = (
-                    session.query(States)
-                    .filter(States.old_state_id == state_id)
-                    .update({"old_state_id": None}, synchronize_session=False)
-                )
-                if refs_updated > 0:
-                    _LOGGER.info("Cleared old_state_id reference in %d state(s) for state %s", refs_updated, state_id)
-            except AttributeError:
-                # old_state_id column not present in this HA version; no self-referential FK to handle
-                pass
-
-            # Delete associated statistics before deleting the state to avoid foreign key constraint errors
-            stats_deleted = 0
-            try:
-                stats_deleted = delete_short_term_stats_by_state_id(session, state_id)
-                if stats_deleted > 0:
-                    _LOGGER.info("Deleted %d associated statistics records for state %s", stats_deleted, state_id)
-            except Exception as stats_err:
-                _LOGGER.warning("Error deleting statistics for state %s: %s", state_id, stats_err)
-                # Continue with state deletion even if statistics deletion fails
-
-            # Delete using query.delete() which is more efficient than session.delete()
-            deleted_count = session.query(States).filter(States.state_id == state_id).delete(synchronize_session=False)
             session.commit()
-            
-            if deleted_count > 0:
-                _LOGGER.info("Deleted state record %s (and %d statistics)", state_id, stats_deleted)
-
-                # Recalculate short-term and long-term statistics for the affected time periods.
-                # The deleted state may have been the anchor for a short-term stat row (which was
-                # removed above via the FK), and the corresponding long-term (hourly) stat must
-                # now be recalculated from the remaining short-term data.
-                statistics_stale = False
-                if HAS_STATISTICS and state_ts is not None and state_metadata_id is not None:
-                    try:
-                        # Build a lightweight proxy so we can reuse the existing helper without
-                        # needing the original (now-deleted) state object.
-                        # last_updated_ts is set to None so that _update_statistics_after_state_change
-                        # does not add a second "new" period — only the period containing the deleted
-                        # state (captured in state_ts / old_ts) will be recalculated.
-                        state_proxy = SimpleNamespace(
-                            metadata_id=state_metadata_id,
-                            last_updated_ts=None,
-                        )
-                        update_statistics_after_state_change(
-                            session, state_proxy, state_ts, None
-                        )
-                        # Commit statistics updates separately; the primary deletion was already
-                        # committed above. A failure here is non-fatal — the state record is
-                        # gone and statistics will remain stale rather than rolling back the delete.
-                        session.commit()
-                    except Exception as stats_err:
-                        statistics_stale = True
-                        _LOGGER.warning(
-                            "Error recalculating statistics after state deletion for state %s: %s "
-                            "(state record is deleted; statistics may be stale — "
-                            "call history_editor.recalculate_statistics to fix)",
-                            state_id, stats_err,
-                        )
+            _LOGGER.info("Deleted state record %s (and %d statistics)", state_id, stats_deleted)
+
+            # Recalculate short-term and long-term statistics for the period
+            # that contained the deleted state.  The primary deletion is
+            # already committed, so a failure here only flags statistics_stale.
+            statistics_stale = _update_statistics_after_commit(
+                session, affected_5min, affected_hour,
+                f"state deletion for state {state_id}",
+            )
+
+            return {
+                "success": True,
+                "state_id": state_id,
+                "statistics_deleted": stats_deleted,
+                "statistics_stale": statistics_stale,
+            }
 
-                return {
-                    "success": True,
-                    "state_id": state_id,
-                    "statistics_deleted": stats_deleted,
-                    "statistics_stale": statistics_stale,
-                }
-            else:
-                return {"success": False, "error": f"Failed to delete state {state_id}"}
-                
     except Exception as err:
         _LOGGER.error("Error deleting record: %s", err)
         # Provide more helpful error message for foreign key constraints
@@ -1437,8 +1723,6 @@ def _delete_record_sync(hass: HomeAssistant, state_id: int) -> dict[str, Any]:
         return {"success": False, "error": error_msg}
 
 
-
-
 def _create_record_sync(
     hass: HomeAssistant,
     entity_id: str,
@@ -1458,61 +1742,24 @@ def _create_record_sync(
 
     try:
         with recorder.get_session() as session:
-            # Get or create StatesMeta for this entity_id (required for HA 2022.4+)
-            metadata = session.query(StatesMeta).filter(StatesMeta.entity_id == entity_id).first()
-            if metadata is None:
-                # Create new metadata if it doesn't exist
-                _LOGGER.info("Creating new StatesMeta for entity_id=%s", entity_id)
-                try:
-                    metadata = StatesMeta(entity_id=entity_id)
-                    session.add(metadata)
-                    session.flush()  # Ensure metadata_id is generated
-                except Exception as metadata_err:
-                    # Handle race condition - another process might have created it
-                    _LOGGER.debug("Metadata creation failed, retrying query: %s", metadata_err)
-                    session.rollback()
-                    metadata = session.query(StatesMeta).filter(StatesMeta.entity_id == entity_id).first()
-                    if metadata is None:
-                        raise  # If still not found, re-raise the original error
-            
-            # Verify metadata_id is available
-            if not hasattr(metadata, 'metadata_id') or metadata.metadata_id is None:
-                raise ValueError(f"Failed to get metadata_id for entity_id={entity_id}")
-            
-            # Create the state with metadata_id and timestamps
-            # Use both new timestamp fields and legacy datetime fields for compatibility
-            # Serialize attributes dict to JSON string for database storage
-            new_state = States(
-                metadata_id=metadata.metadata_id,
-                state=state,
-                attributes=json.dumps(attributes),
+            affected_5min: dict[int, set[int]] = {}
+            affected_hour: dict[int, set[int]] = {}
+            new_state_id = _apply_record_create(
+                session, entity_id, state, attributes, last_changed,
+                last_updated, affected_5min, affected_hour,
             )
-            _set_state_timestamps(new_state, last_changed, last_updated)
 
-            session.add(new_state)
             session.commit()
-            session.refresh(new_state)
-            new_state_id = new_state.state_id
+            _cache_committed_metadata_ids(session)
             _LOGGER.info("Created new state record for entity %s with ID %s", entity_id, new_state_id)
 
             # Recalculate short-term and long-term statistics for the period containing
             # the new state so that graphs and the energy dashboard pick up the change.
             # Mirrors the update/delete paths; non-fatal on error.
-            statistics_stale = False
-            if HAS_STATISTICS:
-                try:
-                    update_statistics_after_state_change(
-                        session, new_state, None, last_updated
-                    )
-                    session.commit()
-                except Exception as stats_err:
-                    statistics_stale = True
-                    _LOGGER.warning(
-                        "Error updating statistics after state creation for state %s: %s "
-                        "(state record is created; statistics may be stale — "
-                        "call history_editor.recalculate_statistics to fix)",
-                        new_state_id, stats_err,
-                    )
+            statistics_stale = _update_statistics_after_commit(
+                session, affected_5min, affected_hour,
+                f"state creation for state {new_state_id}",
+            )
 
             return {
                 "success": True,
@@ -1521,6 +1768,517 @@ def _create_record_sync(
             }
     except Exception as err:
         _LOGGER.error("Error creating record: %s", err, exc_info=True)
+        _invalidate_metadata_ids(err)
+        return {"success": False, "error": str(err)}
+
+
+def _is_numeric_state(state: str | None) -> bool:
+    """Return True if the statistics recompute would count ``state``."""
+    try:
+        float(state)
+    except (ValueError, TypeError):
+        return False
+    return True
+
+
+def _add_affected_periods(
+    affected_5min: dict[int, set[int]],
+    affected_hour: dict[int, set[int]],
+    metadata_id: int,
+    ts: float | None,
+) -> None:
+    """Record the 5-min and hour periods containing ``ts`` for ``metadata_id``."""
+    if ts is None:
+        return
+    affected_5min.setdefault(metadata_id, set()).add(period_start(ts, SHORT_TERM_PERIOD_SECONDS))
+    affected_hour.setdefault(metadata_id, set()).add(period_start(ts, LONG_TERM_PERIOD_SECONDS))
+
+
+def _update_statistics_after_commit(
+    session,
+    affected_5min: dict[int, set[int]],
+    affected_hour: dict[int, set[int]],
+    context: str,
+) -> bool:
+    """Run the statistics cascade for already-committed state changes.
+
+    Returns the ``statistics_stale`` flag: ``True`` if the cascade failed.
+    The state change itself is never rolled back — the caller can re-run
+    ``recalculate_statistics`` to repair the drift.
+    """
+    if not HAS_STATISTICS or not affected_5min:
+        return False
+    try:
+        update_statistics_for_periods(session, affected_5min, affected_hour)
+        session.commit()
+    except Exception as stats_err:
+        _LOGGER.warning(
+            "Error updating statistics after %s: %s "
+            "(state records are committed; statistics may be stale — "
+            "call history_editor.recalculate_statistics to fix)",
+            context, stats_err,
+        )
+        return True
+    return False
+
+
+def _read_state_period_info(session, state_id: int):
+    """Return ``(metadata_id, last_updated_ts, state)`` for a state, or ``None``.
+
+    A column-only read: it fetches just what the statistics cascade needs
+    without loading (and tracking) the full ORM row.
+    """
+    return session.execute(
+        _STATE_PERIOD_INFO_STMT, {"target_state_id": state_id}
+    ).first()
+
+
+def _read_states_period_info(session, state_ids: list[int]) -> dict[int, Any]:
+    """Batch form of ``_read_state_period_info``.
+
+    Returns ``{state_id: (metadata_id, last_updated_ts, state)}`` for the ids that
+    exist, using chunked ``IN`` queries.  Bulk paths call this once up front
+    so unknown ids are known before any write is issued.
+    """
+    found: dict[int, Any] = {}
+    for start in range(0, len(state_ids), IN_CLAUSE_CHUNK_SIZE):
+        chunk = state_ids[start:start + IN_CLAUSE_CHUNK_SIZE]
+        for state_id, metadata_id, ts, state in session.execute(
+            _STATES_PERIOD_INFO_STMT, {"target_state_ids": chunk}
+        ):
+            found[state_id] = (metadata_id, ts, state)
+    return found
+
+
+def _attributes_values(
+    session, attributes: dict, memo: dict[str, dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    """Return the ``States`` column values that store ``attributes``.
+
+    On current schemas the JSON goes to the shared ``state_attributes`` table,
+    which HA's own history reads follow through ``attributes_id``: an existing
+    row with the same hash and blob is reused, otherwise one is inserted.
+    Shared rows are never modified, since other states may point at them.
+    Legacy schemas get the JSON in ``states.attributes``.  ``memo`` maps a
+    blob to its values so a bulk edit looks the shared row up once.
+    """
+    shared_attrs = json_dumps(attributes)
+    if not _HAS_ATTRIBUTES_ID or _hash_shared_attrs is None:
+        return {"attributes": shared_attrs}
+    if memo is not None and shared_attrs in memo:
+        return memo[shared_attrs]
+
+    attrs_hash = _hash_shared_attrs(shared_attrs)
+    attributes_id = session.execute(
+        _STATE_ATTRIBUTES_ID_STMT,
+        {"target_hash": attrs_hash, "target_shared_attrs": shared_attrs},
+    ).scalar()
+    if attributes_id is None:
+        attributes_id = session.execute(
+            insert(StateAttributes).values(hash=attrs_hash, shared_attrs=shared_attrs)
+        ).inserted_primary_key[0]
+    values = {"attributes": None, "attributes_id": attributes_id}
+    if memo is not None:
+        memo[shared_attrs] = values
+    return values
+
+
+def _add_update_affected_periods(
+    row: Any,
+    new_state: str | None,
+    new_last_updated: datetime | None,
+    affected_5min: dict[int, set[int]],
+    affected_hour: dict[int, set[int]],
+) -> None:
+    """Add the periods an update of one state row moves statistics in.
+
+    ``row`` is the row's ``(metadata_id, last_updated_ts, state)``.  Both
+    the old and new periods are affected when the timestamp moves or the
+    state value changes and either side is numeric.
+    """
+    metadata_id, old_ts, old_state = row
+    new_ts = new_last_updated.timestamp() if new_last_updated is not None else old_ts
+    if new_ts != old_ts or (
+        new_state is not None
+        and new_state != old_state
+        and (_is_numeric_state(new_state) or _is_numeric_state(old_state))
+    ):
+        _add_affected_periods(affected_5min, affected_hour, metadata_id, old_ts)
+        _add_affected_periods(affected_5min, affected_hour, metadata_id, new_ts)
+
+
+def _apply_record_update(
+    session,
+    state_id: int,
+    new_state: str | None,
+    new_attributes: dict | None,
+    new_last_changed: datetime | None,
+    new_last_updated: datetime | None,
+    affected_5min: dict[int, set[int]],
+    affected_hour: dict[int, set[int]],
+) -> bool:
+    """Apply field overrides to one state row inside an open session.
+
+    Returns ``False`` without writing anything if the row is missing.  A new
+    state value or ``last_updated`` adds the old and new periods to the
+    affected maps, except for edits between two non-numeric states.  The
+    fields are written with one Core ``UPDATE``.  Does not commit.
+    """
+    timestamp_values = _state_timestamp_values(new_last_changed, new_last_updated)
+    if (
+        new_state is not None
+        or new_attributes is not None
+        or new_last_updated is not None
+        or not timestamp_values
+    ):
+        row = _read_state_period_info(session, state_id)
+        if row is None:
+            return False
+        if new_state is not None or new_last_updated is not None:
+            _add_update_affected_periods(
+                row, new_state, new_last_updated, affected_5min, affected_hour,
+            )
+
+    values: dict[str, Any] = {}
+    if new_state is not None:
+        values["state"] = new_state
+    if new_attributes is not None:
+        values.update(_attributes_values(session, new_attributes))
+    values.update(timestamp_values)
+    if not values:
+        # Nothing to write; the row is known to exist.
+        return True
+
+    result = session.execute(
+        update(States)
+        .where(States.state_id == state_id)
+        .values(values)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount > 0
+
+
+def _apply_records_update(
+    session,
+    state_ids: list[int],
+    new_state: str | None,
+    new_attributes: dict | None,
+    new_last_changed: datetime | None,
+    new_last_updated: datetime | None,
+    affected_5min: dict[int, set[int]],
+    affected_hour: dict[int, set[int]],
+    prefetched: dict[int, Any],
+) -> int:
+    """Apply the same field overrides to many state rows inside an open
+    session; batch form of ``_apply_record_update``.
+
+    Only ids present in ``prefetched`` (a ``_read_states_period_info``
+    result) are updated.  The values are resolved once and written with
+    one ``UPDATE ... WHERE state_id IN (...)`` per chunk.  Does not commit.
+    Returns the number of state rows updated.
+    """
+    found = [sid for sid in state_ids if sid in prefetched]
+    if not found:
+        return 0
+    if new_state is not None or new_last_updated is not None:
+        for state_id in found:
+            _add_update_affected_periods(
+                prefetched[state_id], new_state, new_last_updated,
+                affected_5min, affected_hour,
+            )
+
+    values: dict[str, Any] = {}
+    if new_state is not None:
+        values["state"] = new_state
+    if new_attributes is not None:
+        values.update(_attributes_values(session, new_attributes))
+    values.update(_state_timestamp_values(new_last_changed, new_last_updated))
+    if not values:
+        return len(found)
+
+    stmt = (
+        update(States)
+        .where(States.state_id.in_(bindparam("target_state_ids", expanding=True)))
+        .values(values)
+        .execution_options(synchronize_session=False)
+    )
+    updated = 0
+    for start in range(0, len(found), IN_CLAUSE_CHUNK_SIZE):
+        chunk = found[start:start + IN_CLAUSE_CHUNK_SIZE]
+        updated += session.execute(stmt, {"target_state_ids": chunk}).rowcount
+    return updated
+
+
+def _apply_record_delete(
+    session,
+    state_id: int,
+    affected_5min: dict[int, set[int]],
+    affected_hour: dict[int, set[int]],
+) -> int | None:
+    """Delete one state row inside an open session.
+
+    Reads the row's period info first and returns ``None`` without writing
+    anything if it is missing; otherwise adds its period to the affected
+    maps, clears ``old_state_id`` self-references and legacy linked
+    short-term stats, then issues a Core ``DELETE``.  A zero row count
+    there (a concurrent purge) also returns ``None``.  Does not commit.
+    Returns the number of linked short-term statistics rows removed.
+    """
+    row = _read_state_period_info(session, state_id)
+    if row is None:
+        return None
+    _add_affected_periods(affected_5min, affected_hour, row[0], row[1])
+
+    # Null out old_state_id references (self-FK) before delete
+    if _CLEAR_OLD_STATE_ID_STMT is not None:
+        session.execute(_CLEAR_OLD_STATE_ID_STMT, {"target_state_id": state_id})
+
+    # Drop linked short-term stats (legacy schema only)
+    stats_deleted = 0
+    try:
+        stats_deleted = delete_short_term_stats_by_state_id(session, state_id)
+    except Exception as stats_err:
+        _LOGGER.warning(
+            "Error deleting linked statistics for state %s: %s",
+            state_id, stats_err,
+        )
+
+    result = session.execute(_DELETE_STATE_STMT, {"target_state_id": state_id})
+    if result.rowcount == 0:
+        # Gone since the read above (e.g. a concurrent recorder purge).
+        return None
+    return stats_deleted
+
+
+def _apply_records_delete(
+    session,
+    state_ids: list[int],
+    affected_5min: dict[int, set[int]],
+    affected_hour: dict[int, set[int]],
+    prefetched: dict[int, Any],
+) -> int:
+    """Delete many state rows inside an open session; batch form of
+    ``_apply_record_delete``.
+
+    Only ids present in ``prefetched`` (a ``_read_states_period_info``
+    result) are deleted.  The self-reference clear, the legacy short-term
+    cascade and the ``DELETE`` itself each run once per ``IN`` chunk rather
+    than once per row.  Does not commit.  Returns the number of state rows
+    deleted.
+    """
+    found = [sid for sid in state_ids if sid in prefetched]
+    for state_id in found:
+        metadata_id, ts, _state = prefetched[state_id]
+        _add_affected_periods(affected_5min, affected_hour, metadata_id, ts)
+
+    deleted = 0
+    for start in range(0, len(found), IN_CLAUSE_CHUNK_SIZE):
+        chunk = found[start:start + IN_CLAUSE_CHUNK_SIZE]
+        params = {"target_state_ids": chunk}
+        if _CLEAR_OLD_STATE_IDS_STMT is not None:
+            session.execute(_CLEAR_OLD_STATE_IDS_STMT, params)
+        try:
+            delete_short_term_stats_by_state_ids(session, chunk)
+        except Exception as stats_err:
+            _LOGGER.warning(
+                "Error deleting linked statistics for %d states: %s",
+                len(chunk), stats_err,
+            )
+        deleted += session.execute(_DELETE_STATES_STMT, params).rowcount
+    return deleted
+
+
+def _insert_states_meta_stmt(dialect_name: str, entity_id: str):
+    """Return an INSERT of a ``states_meta`` row that is a no-op if it exists.
+
+    ``states_meta.entity_id`` is unique, so the recorder creating the same
+    entity concurrently makes a plain INSERT fail.  The conflict clause is
+    dialect-specific; any other dialect gets a plain INSERT.
+    """
+    if dialect_name == "sqlite":
+        return sqlite_insert(StatesMeta).values(entity_id=entity_id).on_conflict_do_nothing(
+            index_elements=["entity_id"]
+        )
+    if dialect_name == "postgresql":
+        return postgresql_insert(StatesMeta).values(entity_id=entity_id).on_conflict_do_nothing(
+            index_elements=["entity_id"]
+        )
+    stmt = insert(StatesMeta).values(entity_id=entity_id)
+    if dialect_name in ("mysql", "mariadb"):
+        stmt = stmt.prefix_with("IGNORE")
+    return stmt
+
+
+# ``session.info`` key for the metadata ids a write session resolved.
+_SESSION_METADATA_IDS = "history_editor_metadata_ids"
+
+
+def _get_or_create_metadata_id(session, entity_id: str) -> int:
+    """Return the ``states_meta`` id for ``entity_id``, creating the row if needed.
+
+    Consults ``_METADATA_ID_CACHE`` first.  Resolved ids are only noted on
+    the session; ``_cache_committed_metadata_ids`` caches them once the
+    transaction commits, since it may still insert the row and roll back.
+    """
+    metadata_id = _METADATA_ID_CACHE.get(entity_id)
+    if metadata_id is None:
+        params = {"target_entity_id": entity_id}
+        metadata_id = session.execute(_STATES_META_ID_STMT, params).scalar()
+        if metadata_id is None:
+            _LOGGER.info("Creating new StatesMeta for entity_id=%s", entity_id)
+            session.execute(
+                _insert_states_meta_stmt(session.get_bind().dialect.name, entity_id)
+            )
+            # Read back rather than rely on RETURNING, which old SQLite and
+            # MySQL lack; this also picks up a row a concurrent writer won.
+            metadata_id = session.execute(_STATES_META_ID_STMT, params).scalar_one()
+        session.info.setdefault(_SESSION_METADATA_IDS, {})[entity_id] = metadata_id
+    return metadata_id
+
+
+def _cache_committed_metadata_ids(session) -> None:
+    """Cache the metadata ids a write session resolved; call after commit."""
+    for entity_id, metadata_id in session.info.pop(_SESSION_METADATA_IDS, {}).items():
+        _METADATA_ID_CACHE.set(entity_id, metadata_id)
+
+
+def _invalidate_metadata_ids(err: Exception) -> None:
+    """Drop cached metadata ids after a write failed on a constraint.
+
+    A cached id whose ``states_meta`` row the recorder purged since makes
+    the ``states.metadata_id`` foreign key fail; the next write then looks
+    the id up again.
+    """
+    if isinstance(err, IntegrityError):
+        _METADATA_ID_CACHE.clear()
+
+
+def _apply_record_create(
+    session,
+    entity_id: str,
+    state: str,
+    attributes: dict,
+    last_changed: datetime | None,
+    last_updated: datetime | None,
+    affected_5min: dict[int, set[int]],
+    affected_hour: dict[int, set[int]],
+) -> int:
+    """Insert one state row inside an open session and return its ``state_id``.
+
+    Creates the ``StatesMeta`` row when the entity has never been recorded.
+    Issues a Core ``INSERT`` (no ORM instance or flush) and reads the new id
+    from its result.  Does not commit.
+    """
+    metadata_id = _get_or_create_metadata_id(session, entity_id)
+
+    state_id = session.execute(
+        insert(States).values(
+            metadata_id=metadata_id,
+            state=state,
+            **_attributes_values(session, attributes),
+            **_state_timestamp_values(last_changed, last_updated),
+        )
+    ).inserted_primary_key[0]
+
+    if last_updated is not None:
+        _add_affected_periods(
+            affected_5min, affected_hour, metadata_id, last_updated.timestamp()
+        )
+    return state_id
+
+
+def _apply_records_create(
+    session,
+    records: list[dict[str, Any]],
+    affected_5min: dict[int, set[int]],
+    affected_hour: dict[int, set[int]],
+) -> list[int]:
+    """Insert many state rows inside an open session; batch form of
+    ``_apply_record_create``.
+
+    Each record carries the ``_apply_record_create`` arguments.  The
+    ``metadata_id`` and shared attributes row are resolved once per distinct
+    entity and attribute set, and all rows are flushed together, which
+    SQLAlchemy turns into batched multi-row INSERTs where the backend allows.
+    Does not commit.  Returns the new ``state_id``s in input order.
+    """
+    metadata_ids: dict[str, int] = {}
+    attributes_memo: dict[str, dict[str, Any]] = {}
+    new_states = []
+    for record in records:
+        entity_id = record["entity_id"]
+        metadata_id = metadata_ids.get(entity_id)
+        if metadata_id is None:
+            metadata_id = metadata_ids[entity_id] = _get_or_create_metadata_id(
+                session, entity_id
+            )
+        new_state = States(
+            metadata_id=metadata_id,
+            state=record["state"],
+            **_attributes_values(session, record["attributes"], attributes_memo),
+        )
+        _set_state_timestamps(new_state, record["last_changed"], record["last_updated"])
+        new_states.append(new_state)
+        if record["last_updated"] is not None:
+            _add_affected_periods(
+                affected_5min, affected_hour, metadata_id,
+                record["last_updated"].timestamp(),
+            )
+    session.add_all(new_states)
+    session.flush()
+    return [new_state.state_id for new_state in new_states]
+
+
+def _bulk_create_record_sync(
+    hass: HomeAssistant,
+    records: list[dict[str, Any]],
+) -> dict[str, Any]:
+    """Create multiple state history records in one transaction.
+
+    ``records`` holds dicts with ``entity_id``, ``state``, ``attributes``,
+    ``last_changed`` and ``last_updated`` (timestamps already defaulted by
+    the caller).  Statistics for every affected period are recalculated once
+    at the end via ``update_statistics_for_periods``.
+
+    Returns ``{success, state_ids, created_count, statistics_stale}``.
+    """
+    schema_err = _check_schema(hass)
+    if schema_err:
+        return schema_err
+    if not records:
+        return {"success": False, "error": "records must be a non-empty list"}
+
+    recorder = get_instance(hass)
+    if recorder is None:
+        return {"success": False, "error": "Recorder not available"}
+
+    try:
+        with recorder.get_session() as session:
+            affected_5min: dict[int, set[int]] = {}
+            affected_hour: dict[int, set[int]] = {}
+            state_ids = _apply_records_create(
+                session, records, affected_5min, affected_hour,
+            )
+
+            session.commit()
+            _cache_committed_metadata_ids(session)
+
+            # Cascade once for the entire batch
+            statistics_stale = _update_statistics_after_commit(
+                session, affected_5min, affected_hour,
+                f"bulk state create (batch of {len(state_ids)})",
+            )
+
+            _LOGGER.info("Bulk-created %d state records", len(state_ids))
+            return {
+                "success": True,
+                "state_ids": state_ids,
+                "created_count": len(state_ids),
+                "statistics_stale": statistics_stale,
+            }
+    except Exception as err:
+        _LOGGER.error("Error in bulk_create_record: %s", err, exc_info=True)
+        _invalidate_metadata_ids(err)
         return {"success": False, "error": str(err)}
 
 
@@ -1555,68 +2313,36 @@ def _bulk_update_record_sync(
 
     try:
         with recorder.get_session() as session:
-            updated_count = 0
-            not_found: list[int] = []
             # Per-metadata_id, the unique 5-min and hour starts that need
             # statistics recalculation after this batch (deduped).
-            affected_5min: dict[int, set[float]] = {}
-            affected_hour: dict[int, set[float]] = {}
-
-            for state_id in state_ids:
-                state = session.query(States).filter(States.state_id == state_id).first()
-                if state is None:
-                    not_found.append(state_id)
-                    continue
-
-                old_ts = None
-                if hasattr(state, 'last_updated_ts') and state.last_updated_ts is not None:
-                    old_ts = state.last_updated_ts
-
-                if new_state is not None:
-                    state.state = new_state
-                if new_attributes is not None:
-                    state.attributes = json.dumps(new_attributes)
-                _set_state_timestamps(state, new_last_changed, new_last_updated)
-                updated_count += 1
-
-                metadata_id = state.metadata_id
-                if old_ts is not None:
-                    affected_5min.setdefault(metadata_id, set()).add(
-                        float(int(old_ts // 300) * 300)
-                    )
-                    affected_hour.setdefault(metadata_id, set()).add(
-                        float(int(old_ts // 3600) * 3600)
-                    )
-                new_ts = None
-                if new_last_updated is not None:
-                    new_ts = new_last_updated.timestamp()
-                elif old_ts is not None:
-                    new_ts = old_ts
-                if new_ts is not None:
-                    affected_5min.setdefault(metadata_id, set()).add(
-                        float(int(new_ts // 300) * 300)
-                    )
-                    affected_hour.setdefault(metadata_id, set()).add(
-                        float(int(new_ts // 3600) * 3600)
-                    )
+            affected_5min: dict[int, set[int]] = {}
+            affected_hour: dict[int, set[int]] = {}
+
+            state_ids = list(dict.fromkeys(state_ids))
+            prefetched = _read_states_period_info(session, state_ids)
+            not_found = [sid for sid in state_ids if sid not in prefetched]
+            if not prefetched:
+                # Nothing to write: don't open a write transaction at all.
+                return {
+                    "success": True,
+                    "updated_count": 0,
+                    "not_found": not_found,
+                    "statistics_stale": False,
+                }
+
+            updated_count = _apply_records_update(
+                session, state_ids, new_state, new_attributes,
+                new_last_changed, new_last_updated,
+                affected_5min, affected_hour, prefetched,
+            )
 
             session.commit()
 
             # Cascade once for the entire batch
-            statistics_stale = False
-            if HAS_STATISTICS and updated_count > 0 and (
-                new_state is not None or new_last_updated is not None
-            ):
-                try:
-                    update_statistics_for_periods(session, affected_5min, affected_hour)
-                    session.commit()
-                except Exception as stats_err:
-                    statistics_stale = True
-                    _LOGGER.warning(
-                        "Error updating statistics after bulk state update "
-                        "(batch of %d): %s — call history_editor.recalculate_statistics to fix",
-                        updated_count, stats_err,
-                    )
+            statistics_stale = _update_statistics_after_commit(
+                session, affected_5min, affected_hour,
+                f"bulk state update (batch of {updated_count})",
+            )
 
             _LOGGER.info(
                 "Bulk-updated %d state records; %d not found",
@@ -1640,7 +2366,7 @@ def _bulk_delete_record_sync(
     """Delete multiple state history records in one transaction.
 
     Cascades:
-      - Clears ``old_state_id`` self-references on other states (per-row).
+      - Clears ``old_state_id`` self-references on other states (per chunk).
       - Drops linked short-term stats via the FK column when present
         (older HA schemas).
       - Recalculates statistics for every affected (5-min, hour) period
@@ -1660,62 +2386,32 @@ def _bulk_delete_record_sync(
 
     try:
         with recorder.get_session() as session:
-            deleted_count = 0
-            not_found: list[int] = []
-            affected_5min: dict[int, set[float]] = {}
-            affected_hour: dict[int, set[float]] = {}
-
-            for state_id in state_ids:
-                state = session.query(States).filter(States.state_id == state_id).first()
-                if state is None:
-                    not_found.append(state_id)
-                    continue
-
-                metadata_id = state.metadata_id
-                if hasattr(state, 'last_updated_ts') and state.last_updated_ts is not None:
-                    ts = state.last_updated_ts
-                    affected_5min.setdefault(metadata_id, set()).add(
-                        float(int(ts // 300) * 300)
-                    )
-                    affected_hour.setdefault(metadata_id, set()).add(
-                        float(int(ts // 3600) * 3600)
-                    )
-
-                # Null out old_state_id references (self-FK) before delete
-                try:
-                    session.query(States).filter(
-                        States.old_state_id == state_id
-                    ).update({"old_state_id": None}, synchronize_session=False)
-                except AttributeError:
-                    pass
-
-                # Drop linked short-term stats (legacy schema only)
-                try:
-                    delete_short_term_stats_by_state_id(session, state_id)
-                except Exception as stats_err:
-                    _LOGGER.warning(
-                        "Error deleting linked statistics for state %s: %s",
-                        state_id, stats_err,
-                    )
+            affected_5min: dict[int, set[int]] = {}
+            affected_hour: dict[int, set[int]] = {}
+
+            state_ids = list(dict.fromkeys(state_ids))
+            prefetched = _read_states_period_info(session, state_ids)
+            not_found = [sid for sid in state_ids if sid not in prefetched]
+            if not prefetched:
+                # Nothing to delete: don't open a write transaction at all.
+                return {
+                    "success": True,
+                    "deleted_count": 0,
+                    "not_found": not_found,
+                    "statistics_stale": False,
+                }
 
-                session.delete(state)
-                deleted_count += 1
+            deleted_count = _apply_records_delete(
+                session, state_ids, affected_5min, affected_hour, prefetched,
+            )
 
             session.commit()
 
             # Cascade stats once for the entire batch
-            statistics_stale = False
-            if HAS_STATISTICS and deleted_count > 0:
-                try:
-                    update_statistics_for_periods(session, affected_5min, affected_hour)
-                    session.commit()
-                except Exception as stats_err:
-                    statistics_stale = True
-                    _LOGGER.warning(
-                        "Error updating statistics after bulk state delete "
-                        "(batch of %d): %s — call history_editor.recalculate_statistics to fix",
-                        deleted_count, stats_err,
-                    )
+            statistics_stale = _update_statistics_after_commit(
+                session, affected_5min, affected_hour,
+                f"bulk state delete (batch of {deleted_count})",
+            )
 
             _LOGGER.info(
                 "Bulk-deleted %d state records; %d not found",
@@ -1731,3 +2427,159 @@ def _bulk_delete_record_sync(
         _LOGGER.error("Error in bulk_delete_record: %s", err, exc_info=True)
         return {"success": False, "error": str(err)}
 
+
+def _delete_records_in_range_sync(
+    hass: HomeAssistant,
+    entity_id: str,
+    start_time: datetime,
+    end_time: datetime,
+) -> dict[str, Any]:
+    """Delete every state record of ``entity_id`` within a time range.
+
+    The range is inclusive on both ends, like the records query.  The rows
+    are selected by ``(metadata_id, last_updated)`` in one query and then
+    removed through ``_apply_records_delete``, so the cascades are those of
+    ``_bulk_delete_record_sync``.
+
+    Returns ``{success, deleted_count, statistics_stale}``.
+    """
+    schema_err = _check_schema(hass)
+    if schema_err:
+        return schema_err
+    if start_time > end_time:
+        return {"success": False, "error": "start_time must not be after end_time"}
+
+    recorder = get_instance(hass)
+    if recorder is None:
+        return {"success": False, "error": "Recorder not available"}
+
+    try:
+        with recorder.get_session() as session:
+            metadata_id = session.execute(
+                _STATES_META_ID_STMT, {"target_entity_id": entity_id}
+            ).scalar()
+            prefetched: dict[int, Any] = {}
+            if metadata_id is not None:
+                params = {
+                    "target_metadata_id": metadata_id,
+                    "target_start": start_time.timestamp() if _HAS_LAST_UPDATED_TS else start_time,
+                    "target_end": end_time.timestamp() if _HAS_LAST_UPDATED_TS else end_time,
+                }
+                for state_id, row_metadata_id, ts, state in session.execute(
+                    _STATES_IN_RANGE_PERIOD_INFO_STMT, params
+                ):
+                    prefetched[state_id] = (row_metadata_id, ts, state)
+            if not prefetched:
+                return {"success": True, "deleted_count": 0, "statistics_stale": False}
+
+            affected_5min: dict[int, set[int]] = {}
+            affected_hour: dict[int, set[int]] = {}
+            deleted_count = _apply_records_delete(
+                session, list(prefetched), affected_5min, affected_hour, prefetched,
+            )
+
+            session.commit()
+
+            statistics_stale = _update_statistics_after_commit(
+                session, affected_5min, affected_hour,
+                f"range delete of {entity_id} ({deleted_count} states)",
+            )
+
+            _LOGGER.info(
+                "Deleted %d state records of %s between %s and %s",
+                deleted_count, entity_id, start_time, end_time,
+            )
+            return {
+                "success": True,
+                "deleted_count": deleted_count,
+                "statistics_stale": statistics_stale,
+            }
+    except Exception as err:
+        _LOGGER.error("Error in delete_records_in_range: %s", err, exc_info=True)
+        return {"success": False, "error": str(err)}
+
+
+def _batch_sync(
+    hass: HomeAssistant,
+    operations: list[dict[str, Any]],
+) -> dict[str, Any]:
+    """Apply a mixed list of create/update/delete operations in one transaction.
+
+    ``operations`` is the normalised output of ``_parse_batch_operations``.
+    Operations run in order against a single session and are committed
+    together, but each one runs inside its own savepoint.  The batch may
+    succeed partially: an operation that raises or targets a missing
+    ``state_id`` has its savepoint rolled back, leaving no trace in the
+    database or the statistics cascade, and is reported as failed in its
+    result while the others still commit.  The cascade then runs once for
+    every period the applied operations touched.
+
+    Returns ``{success, results, statistics_stale}`` where ``results`` has
+    one ``{op, success, state_id[, error]}`` entry per operation.
+    """
+    schema_err = _check_schema(hass)
+    if schema_err:
+        return schema_err
+    if not operations:
+        return {"success": False, "error": "operations must be a non-empty list"}
+
+    recorder = get_instance(hass)
+    if recorder is None:
+        return {"success": False, "error": "Recorder not available"}
+
+    try:
+        with recorder.get_session() as session:
+            results: list[dict[str, Any]] = []
+            applied = 0
+            affected_5min: dict[int, set[int]] = {}
+            affected_hour: dict[int, set[int]] = {}
+
+            for operation in operations:
+                op = operation["op"]
+                if op == "create":
+                    state_id = _apply_record_create(
+                        session, operation["entity_id"], operation["state"],
+                        operation["attributes"], operation["last_changed"],
+                        operation["last_updated"], affected_5min, affected_hour,
+                    )
+                    ok = True
+                elif op == "update":
+                    state_id = operation["state_id"]
+                    ok = _apply_record_update(
+                        session, state_id, operation["state"],
+                        operation["attributes"], operation["last_changed"],
+                        operation["last_updated"], affected_5min, affected_hour,
+                    )
+                else:
+                    state_id = operation["state_id"]
+                    ok = _apply_record_delete(
+                        session, state_id, affected_5min, affected_hour,
+                    ) is not None
+
+                entry: dict[str, Any] = {"op": op, "success": ok, "state_id": state_id}
+                if ok:
+                    applied += 1
+                else:
+                    entry["error"] = f"State ID {state_id} not found"
+                results.append(entry)
+
+            session.commit()
+            _cache_committed_metadata_ids(session)
+
+            statistics_stale = _update_statistics_after_commit(
+                session, affected_5min, affected_hour,
+                f"batch ({applied} operations)",
+            )
+
+            _LOGGER.info(
+                "Batch applied %d of %d operations", applied, len(operations),
+            )
+            return {
+                "success": True,
+                "results": results,
+                "statistics_stale": statistics_stale,
+            }
+    except Exception as err:
+        _LOGGER.error("Error in batch: %s", err, exc_info=True)
+        _invalidate_metadata_ids(err)
+        return {"success": False, "error": str(err)}
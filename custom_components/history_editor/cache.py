@@ -0,0 +1,112 @@
+"""Small in-process caches for the History Editor hot paths.
+
+``ResponseCache``
+    The panel tends to re-issue the exact same ``GET /records`` request in
+    quick succession (focus changes, re-renders, the overview chart and the
+    table loading together).  It keeps the already-serialised JSON body of
+    recent successful responses for a few seconds so those duplicates skip
+    both the database and the JSON encoder.  The whole cache is cleared
+    after every successful mutation (see ``_async_run_write`` in
+    ``__init__.py``), so an edit is never hidden behind a stale page.
+    Each ``clear()`` also bumps a generation counter: a read captures it
+    before querying and stores its body only if no mutation cleared the
+    cache in the meantime, so a page read before an edit is never cached
+    after it.
+
+``TTLCache``
+    The generic TTL + LRU map underneath, also used directly for lookups
+    that are stable for long stretches (e.g. ``entity_id`` → ``metadata_id``).
+    Access is guarded by a lock because lookups run on the recorder's
+    executor threads.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Generic, TypeVar
+
+_V = TypeVar("_V")
+
+# Seconds a cached response stays valid.  Kept short: the recorder keeps
+# writing new states, and those don't go through our invalidation.
+RESPONSE_CACHE_TTL = 2.0
+# Upper bound on cached responses; the oldest entry is evicted first.
+RESPONSE_CACHE_MAX_ENTRIES = 32
+
+
+class TTLCache(Generic[_V]):
+    """Bounded map whose entries expire ``ttl`` seconds after being set."""
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[float, _V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> _V | None:
+        """Return the cached value for ``key``, or ``None`` if absent/expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: _V) -> None:
+        """Store ``value`` under ``key``, evicting the oldest entry if full."""
+        with self._lock:
+            self._store(key, value)
+
+    def _store(self, key: Hashable, value: _V) -> None:
+        """Store ``value`` under ``key``; the caller holds the lock."""
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ResponseCache(TTLCache[bytes]):
+    """TTL + LRU cache mapping a request key to a serialised response body."""
+
+    def __init__(
+        self,
+        ttl: float = RESPONSE_CACHE_TTL,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+    ) -> None:
+        super().__init__(ttl, max_entries)
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """Number of times the cache has been cleared."""
+        return self._generation
+
+    def set(self, key: Hashable, value: bytes, generation: int | None = None) -> None:
+        """Store ``value`` under ``key``.
+
+        When ``generation`` is given, the value is dropped if the cache has
+        been cleared since that generation was read.
+        """
+        with self._lock:
+            if generation is None or generation == self._generation:
+                self._store(key, value)
+
+    def clear(self) -> None:
+        """Drop every cached entry and start a new generation."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
@@ -34,8 +34,13 @@ def _get_sidebar_title(hass: HomeAssistant) -> str:
     return _DEFAULT_TITLE
 
 
-async def async_register_panel(hass: HomeAssistant) -> None:
-    """Register the History Editor panel."""
+async def async_register_panel(hass: HomeAssistant, version: str) -> None:
+    """Register the History Editor panel.
+
+    The static files are served with long-lived cache headers, so the
+    module URL carries the integration ``version``: browsers keep the
+    bundle across page loads and fetch the new one after an upgrade.
+    """
     # Register the static path for our JavaScript file
     await hass.http.async_register_static_paths(
         [
@@ -54,7 +59,7 @@ async def async_register_panel(hass: HomeAssistant) -> None:
         frontend_url_path="history-editor",
         sidebar_title=_get_sidebar_title(hass),
         sidebar_icon="mdi:database-edit",
-        module_url="/history_editor_panel/history-editor-panel.js",
+        module_url=f"/history_editor_panel/history-editor-panel.js?v={version}",
         embed_iframe=False,
         require_admin=True,
     )
@@ -61,6 +61,20 @@ STATISTICS_COLUMNS: dict[str, dict[str, list[str]]] = {
     },
 }
 
+# Indexes the hot queries rely on, as ``(table, leading columns)``.  A missing
+# index is not fatal — the queries still return correct results — but they
+# degrade to a scan + sort over every row of the entity, so warn about it.
+#
+# The statistics entries back the recompute range scans and the
+# source-data guards.  HA's recorder creates all of these itself; the
+# component never creates indexes, since the recorder owns the schema and
+# its migrations would trip over foreign ones.
+EXPECTED_INDEXES: list[tuple[str, tuple[str, ...]]] = [
+    ("states", ("metadata_id", "last_updated_ts")),
+    ("statistics", ("metadata_id", "start_ts")),
+    ("statistics_short_term", ("metadata_id", "start_ts")),
+]
+
 # Module-level cache: the HA version string we last validated against.
 _validated_ha_version: str | None = None
 _validation_errors: list[str] = []
@@ -76,6 +90,20 @@ def _get_table_columns(inspector, table_name: str) -> set[str] | None:
         return None
 
 
+def _has_index(inspector, table_name: str, columns: tuple[str, ...]) -> bool:
+    """Return True if ``table_name`` has an index whose leading columns are
+    ``columns``.  Returns True if the indexes cannot be inspected, so an
+    unsupported dialect never triggers a spurious warning."""
+    try:
+        indexes = inspector.get_indexes(table_name)
+    except Exception:
+        return True
+    width = len(columns)
+    return any(
+        tuple(index["column_names"][:width]) == columns for index in indexes
+    )
+
+
 def validate_schema_sync(hass: HomeAssistant) -> list[str]:
     """Inspect the recorder DB and verify every required column exists.
 
@@ -134,6 +162,19 @@ def validate_schema_sync(hass: HomeAssistant) -> list[str]:
                             f"(found: {sorted(actual)})"
                         )
 
+            # Performance-only checks: warn, never block
+            for table_name, columns in EXPECTED_INDEXES:
+                actual = _get_table_columns(inspector, table_name)
+                if actual is None or not set(columns) <= actual:
+                    continue
+                if not _has_index(inspector, table_name, columns):
+                    _LOGGER.warning(
+                        "Recorder table '%s' has no index on (%s); history editor "
+                        "queries will be slow on large databases",
+                        table_name,
+                        ", ".join(columns),
+                    )
+
     except Exception as err:
         errors.append(f"Schema inspection failed: {err}")
 
@@ -11,14 +11,27 @@ All DB access is synchronous; callers must dispatch these functions via
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from itertools import islice
 from typing import Any
 
 from homeassistant.components.recorder import get_instance
 from homeassistant.components.recorder.db_schema import States, StatesMeta
 from homeassistant.core import HomeAssistant
 from homeassistant.util import dt as dt_util
-
+from sqlalchemy import (
+    and_,
+    bindparam,
+    delete,
+    exists,
+    false,
+    func,
+    or_,
+    select,
+    update,
+)
+
+from .cache import TTLCache
 from .schema_compat import ensure_schema_current
 
 _LOGGER = logging.getLogger(__name__)
@@ -42,6 +55,112 @@ try:
     )
     HAS_STATISTICS = True
     HAS_STATISTICS_SHORT_TERM = True
+    # Optional columns, probed once here instead of per row or per call.
+    _SHORT_TERM_HAS_STATE_ID = hasattr(StatisticsShortTerm, "state_id")
+    _HAS_LAST_RESET_TS = {
+        Statistics: hasattr(Statistics, "last_reset_ts"),
+        StatisticsShortTerm: hasattr(StatisticsShortTerm, "last_reset_ts"),
+    }
+    # Short-term columns the hourly re-aggregation reads.
+    _SHORT_TERM_AGGREGATE_COLUMNS = (
+        StatisticsShortTerm.start_ts,
+        StatisticsShortTerm.mean,
+        StatisticsShortTerm.min,
+        StatisticsShortTerm.max,
+        StatisticsShortTerm.state,
+        StatisticsShortTerm.sum,
+    )
+
+    # Fixed-shape statements for the per-edit recompute, built once at
+    # import and executed with bound parameters.  Bind names must not match
+    # a statistics column: on UPDATE those keys become SET values.
+    _LONG_TERM_ROW_STMT = select(Statistics).where(
+        Statistics.metadata_id == bindparam("target_metadata_id"),
+        Statistics.start_ts == bindparam("target_start_ts"),
+    )
+    _PREV_SHORT_TERM_STMT = (
+        select(
+            StatisticsShortTerm.mean,
+            StatisticsShortTerm.min,
+            StatisticsShortTerm.max,
+            StatisticsShortTerm.state,
+        )
+        .where(
+            StatisticsShortTerm.metadata_id == bindparam("target_metadata_id"),
+            StatisticsShortTerm.start_ts < bindparam("target_start_ts"),
+        )
+        .order_by(StatisticsShortTerm.start_ts.desc())
+        .limit(1)
+    )
+    _SHIFT_SHORT_TERM_SUM_STMT = (
+        update(StatisticsShortTerm)
+        .where(
+            StatisticsShortTerm.metadata_id == bindparam("target_metadata_id"),
+            StatisticsShortTerm.start_ts >= bindparam("target_start_ts"),
+            StatisticsShortTerm.sum.isnot(None),
+        )
+        .values(sum=StatisticsShortTerm.sum + bindparam("sum_delta"))
+        .execution_options(synchronize_session=False)
+    )
+    _SHIFT_LONG_TERM_SUM_STMT = (
+        update(Statistics)
+        .where(
+            Statistics.metadata_id == bindparam("target_metadata_id"),
+            Statistics.start_ts >= bindparam("target_start_ts"),
+            Statistics.sum.isnot(None),
+        )
+        .values(sum=Statistics.sum + bindparam("sum_delta"))
+        .execution_options(synchronize_session=False)
+    )
+    # Batched short-term write-back, run as executemany over the
+    # recomputed rows.  Core statements on the table, so no ORM rows are
+    # loaded or synchronised.
+    _short_term_table = StatisticsShortTerm.__table__
+    _short_term_values_set: dict[str, Any] = {
+        "mean": bindparam("new_mean"),
+        "min": bindparam("new_min"),
+        "max": bindparam("new_max"),
+        "state": bindparam("new_state"),
+    }
+    if _SHORT_TERM_HAS_STATE_ID:
+        # Held values carry no state_id; keep the row's existing one.
+        _short_term_values_set["state_id"] = func.coalesce(
+            bindparam("new_state_id"), _short_term_table.c.state_id
+        )
+    _UPDATE_SHORT_TERM_VALUES_STMT = (
+        update(_short_term_table)
+        .where(_short_term_table.c.id == bindparam("target_id"))
+        .values(**_short_term_values_set)
+    )
+    _DELETE_SHORT_TERM_ROW_STMT = delete(_short_term_table).where(
+        _short_term_table.c.id == bindparam("target_id")
+    )
+    _STAT_META_ID_STMT = (
+        select(StatisticsMeta.id)
+        .join(StatesMeta, StatesMeta.entity_id == StatisticsMeta.statistic_id)
+        .where(StatesMeta.metadata_id == bindparam("target_metadata_id"))
+    )
+    # Source-data guard probes: ``[target_start_ts, target_end_ts)`` ranges.
+    _STATISTIC_ID_STMT = select(StatisticsMeta.statistic_id).where(
+        StatisticsMeta.id == bindparam("target_metadata_id")
+    )
+    _STATES_IN_PERIOD_STMT = select(
+        exists().where(
+            States.metadata_id
+            == select(StatesMeta.metadata_id)
+            .where(StatesMeta.entity_id == bindparam("target_entity_id"))
+            .scalar_subquery(),
+            States.last_updated_ts >= bindparam("target_start_ts"),
+            States.last_updated_ts < bindparam("target_end_ts"),
+        )
+    )
+    _SHORT_TERM_IN_PERIOD_STMT = select(
+        exists().where(
+            StatisticsShortTerm.metadata_id == bindparam("target_metadata_id"),
+            StatisticsShortTerm.start_ts >= bindparam("target_start_ts"),
+            StatisticsShortTerm.start_ts < bindparam("target_end_ts"),
+        )
+    )
 except ImportError:
     HAS_STATISTICS = False
     HAS_STATISTICS_SHORT_TERM = False
@@ -58,6 +177,44 @@ RECALC_CHUNK_SHORT_TERM = 288
 RECALC_CHUNK_LONG_TERM = 24
 
 
+def period_start(ts: float, period: int) -> int:
+    """Return the start of the ``period``-second bucket containing ``ts``.
+
+    Buckets are kept as ints (cheaper to hash and compare than floats) and
+    compare and hash equal to the float ``start_ts`` values read back from
+    the statistics tables, so either can key the same dict.
+    """
+    return int(ts) // period * period
+
+
+def _ts_iso(ts: float) -> str:
+    """Return an epoch timestamp as a UTC ISO string.
+
+    Called per row when serialising statistics, so it goes straight to
+    ``datetime.fromtimestamp`` rather than through ``dt_util``.
+    """
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+# Contiguous period ranges per batched recalculation query.  Each range
+# binds two parameters; old SQLite builds cap a statement at 999.
+PERIOD_RUNS_PER_QUERY = 200
+# Statistics row ids per ``IN (...)`` clause in the bulk update/delete paths.
+STAT_IDS_PER_QUERY = 500
+# Rows fetched from the DB cursor per batch when streaming statistics.
+STATISTICS_YIELD_PER = 500
+
+# states_meta.metadata_id -> statistics_meta.id, for the post-edit
+# recompute.  Both ids are stable until the recorder purges the entity or
+# its statistics are cleared, so a short TTL bounds how long a stale id can
+# linger.  Only hits are cached: an entity that gains statistics later is
+# picked up on its next edit.
+STAT_META_ID_CACHE_TTL = 60.0
+_STAT_META_ID_CACHE: TTLCache[int] = TTLCache(
+    ttl=STAT_META_ID_CACHE_TTL, max_entries=1024
+)
+
+
 def delete_short_term_stats_by_state_id(session, state_id: int) -> int:
     """Delete short-term statistics rows that reference the given state_id.
 
@@ -66,15 +223,27 @@ def delete_short_term_stats_by_state_id(session, state_id: int) -> int:
     releases (roughly 2023.x) and was removed in later versions; callers
     should treat a 0 return as "nothing to cascade" rather than an error.
     """
-    if not HAS_STATISTICS_SHORT_TERM:
-        return 0
-    if not hasattr(StatisticsShortTerm, 'state_id'):
+    if not HAS_STATISTICS_SHORT_TERM or not _SHORT_TERM_HAS_STATE_ID:
         return 0
     return session.query(StatisticsShortTerm).filter(
         StatisticsShortTerm.state_id == state_id
     ).delete(synchronize_session=False)
 
 
+def delete_short_term_stats_by_state_ids(session, state_ids: list[int]) -> int:
+    """Batch form of ``delete_short_term_stats_by_state_id``.
+
+    ``state_ids`` must already be chunked to fit one ``IN`` clause.
+    """
+    if not HAS_STATISTICS_SHORT_TERM or not _SHORT_TERM_HAS_STATE_ID:
+        return 0
+    return session.execute(
+        delete(StatisticsShortTerm)
+        .where(StatisticsShortTerm.state_id.in_(state_ids))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+
 def _cascade_sum_adjustment(
     session,
     stat_meta_id: int,
@@ -97,126 +266,299 @@ def _cascade_sum_adjustment(
     if delta == 0:
         return
 
-    session.query(StatisticsShortTerm).filter(
-        StatisticsShortTerm.metadata_id == stat_meta_id,
-        StatisticsShortTerm.start_ts >= start_ts,
-        StatisticsShortTerm.sum.isnot(None),
-    ).update(
-        {StatisticsShortTerm.sum: StatisticsShortTerm.sum + delta},
-        synchronize_session=False,
+    session.execute(
+        _SHIFT_SHORT_TERM_SUM_STMT,
+        {"target_metadata_id": stat_meta_id, "target_start_ts": start_ts, "sum_delta": delta},
     )
 
     # Long-term (hourly) statistics: adjust from the containing hour onwards.
-    start_ts_hour = float(int(start_ts // 3600) * 3600)
-    session.query(Statistics).filter(
-        Statistics.metadata_id == stat_meta_id,
-        Statistics.start_ts >= start_ts_hour,
-        Statistics.sum.isnot(None),
-    ).update(
-        {Statistics.sum: Statistics.sum + delta},
-        synchronize_session=False,
+    start_ts_hour = period_start(start_ts, LONG_TERM_PERIOD_SECONDS)
+    session.execute(
+        _SHIFT_LONG_TERM_SUM_STMT,
+        {"target_metadata_id": stat_meta_id, "target_start_ts": start_ts_hour, "sum_delta": delta},
     )
 
 
-def recalculate_short_term_stat(
-    session, stat_meta_id: int, entity_id: str, start_ts_5min: float,
-) -> bool:
-    """Recalculate and update a short-term statistics record for a 5-minute period.
+def _stat_meta_id_for_states_metadata(session, metadata_id: int) -> int | None:
+    """Return the statistics_meta id of the entity behind ``metadata_id``."""
+    stat_meta_id = _STAT_META_ID_CACHE.get(metadata_id)
+    if stat_meta_id is None:
+        stat_meta_id = session.execute(
+            _STAT_META_ID_STMT, {"target_metadata_id": metadata_id}
+        ).scalar()
+        if stat_meta_id is not None:
+            _STAT_META_ID_CACHE.set(metadata_id, stat_meta_id)
+    return stat_meta_id
+
+
+def _period_runs(starts: list[float], period: float) -> list[tuple[float, float]]:
+    """Merge sorted, aligned period starts into contiguous ``[start, end)`` runs."""
+    runs: list[list[float]] = []
+    for ts in starts:
+        if runs and runs[-1][1] == ts:
+            runs[-1][1] = ts + period
+        else:
+            runs.append([ts, ts + period])
+    return [(start, end) for start, end in runs]
 
-    Queries all numeric states in the period, recomputes mean/min/max/state, and
-    updates the existing StatisticsShortTerm row. Returns True if a row was updated.
 
-    When no numeric states exist in the period (e.g. all records were deleted), the
-    last numeric state value recorded *before* the period is carried forward so the
-    statistics show a continuous "hold last value" line rather than a gap or stale data.
-    If no prior value exists at all, the stale row is removed.
+def _in_runs(column, runs: list[tuple[float, float]]):
+    """``column`` falls inside any of the half-open ``runs``."""
+    return or_(*(and_(column >= start, column < end) for start, end in runs))
 
-    For sensors that track a running total (state_class=total or
-    state_class=total_increasing), the ``sum`` column is cascaded forward so
-    that subsequent statistics periods remain consistent with the new value.
+
+def _chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class _PeriodAggregate:
+    """Running mean/min/max/last over the numeric states of one period.
+
+    States are folded in one at a time, in chronological order, so no
+    per-period list of values is kept.  ``States.state`` is text and only
+    Python's ``float()`` decides what counts as numeric; a SQL ``CAST``
+    would coerce ``"unavailable"`` to 0 on SQLite and fail on PostgreSQL.
     """
-    end_ts = start_ts_5min + 300.0
-
-    states_in_period = (
-        session.query(States)
-        .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
-        .filter(StatesMeta.entity_id == entity_id)
-        .filter(States.last_updated_ts >= start_ts_5min)
-        .filter(States.last_updated_ts < end_ts)
-        .order_by(States.last_updated_ts.asc())
-        .all()
-    )
 
-    numeric_values: list[float] = []
-    last_state_id: int | None = None
-    last_state_float: float | None = None
+    __slots__ = ("count", "total", "min", "max", "last", "last_state_id")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.last_state_id: int | None = None
 
-    for s in states_in_period:
+    def add(self, state: Any, state_id: int | None) -> None:
+        """Fold one state in; non-numeric states are ignored."""
         try:
-            v = float(s.state)
-            numeric_values.append(v)
-            last_state_id = s.state_id
-            last_state_float = v
+            value = float(state)
         except (ValueError, TypeError):
-            pass
+            return
+        if self.count:
+            if value < self.min:
+                self.min = value
+            elif value > self.max:
+                self.max = value
+        else:
+            self.min = self.max = value
+        self.count += 1
+        self.total += value
+        self.last = value
+        self.last_state_id = state_id
+
 
-    short_term = session.query(StatisticsShortTerm).filter(
-        StatisticsShortTerm.metadata_id == stat_meta_id,
-        StatisticsShortTerm.start_ts == start_ts_5min,
+def _short_term_values(
+    session,
+    start_ts_5min: float,
+    aggregate: _PeriodAggregate | None,
+    states_criterion,
+) -> tuple[float, float, float, float, int | None] | None:
+    """Return the recomputed ``(mean, min, max, state, state_id)`` of a period.
+
+    ``aggregate`` covers the period's states (``None`` when there were
+    none).  When no state in the period is numeric, the last numeric value
+    from before the period is held, with no ``state_id``.  Returns ``None``
+    when there is no such value either and the row should be removed.
+    """
+    if aggregate is not None and aggregate.count:
+        return (
+            aggregate.total / aggregate.count,
+            aggregate.min,
+            aggregate.max,
+            aggregate.last,
+            aggregate.last_state_id,
+        )
+
+    # No numeric states in this period (e.g. all records were deleted).
+    # Carry forward the last known numeric value from before this period so the
+    # statistics chart shows a continuous line rather than stale or missing data.
+    prev_state = session.execute(
+        select(States.state)
+        .where(states_criterion, States.last_updated_ts < start_ts_5min)
+        .order_by(States.last_updated_ts.desc())
+        .limit(1)
     ).first()
+    if prev_state is None:
+        return None
+    try:
+        prev_value = float(prev_state.state)
+    except (ValueError, TypeError):
+        return None
+    return prev_value, prev_value, prev_value, prev_value, None
 
-    if short_term is None:
-        return False
 
-    # Capture old state value and whether this stat has a running sum before
-    # making any modifications.  Used for cascading sum adjustments below.
-    old_state: float | None = short_term.state
-    has_sum: bool = short_term.sum is not None
-    new_state: float | None = None
-
-    if numeric_values:
-        short_term.mean = sum(numeric_values) / len(numeric_values)
-        short_term.min = min(numeric_values)
-        short_term.max = max(numeric_values)
-        short_term.state = last_state_float
-        new_state = last_state_float
-        if hasattr(short_term, 'state_id') and last_state_id is not None:
-            short_term.state_id = last_state_id
+def recalculate_short_term_stats(
+    session,
+    stat_meta_id: int,
+    states_metadata_id: int | None,
+    period_starts,
+) -> int:
+    """Recalculate the short-term rows of one entity for many 5-minute periods.
+
+    Each existing row gets the mean/min/max/state of the numeric states in
+    its period.  A period with no numeric state holds the last numeric value
+    from before it; with none at all the row is removed.  For entities with
+    a running ``sum`` (state_class total / total_increasing) every change
+    in ``state`` is cascaded into the sums of later periods.
+
+    ``period_starts`` must be aligned to 5-minute boundaries.  Adjacent
+    periods are merged into contiguous ranges, and the states and the
+    short-term rows of all periods are each read with one query per
+    ``PERIOD_RUNS_PER_QUERY`` ranges instead of one query per period.
+    Periods are then recomputed in chronological order so sum cascades
+    compound, and the new values are written with one executemany UPDATE
+    (and DELETE) for the batch.  The short-term rows are never loaded as
+    ORM objects, so callers that hold any must expire them before reading.
+    A ``None`` ``states_metadata_id`` (entity without state history) treats
+    every period as empty.  Returns the number of short-term rows updated.
+    """
+    starts = sorted(set(period_starts))
+    if not starts:
+        return 0
+    if states_metadata_id is None:
+        states_criterion = false()
     else:
-        # No numeric states in this period (e.g. all records were deleted).
-        # Carry forward the last known numeric value from before this period so the
-        # statistics chart shows a continuous line rather than stale or missing data.
-        prev_state = (
-            session.query(States.state, States.last_updated_ts)
-            .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
-            .filter(StatesMeta.entity_id == entity_id)
-            .filter(States.last_updated_ts < start_ts_5min)
-            .order_by(States.last_updated_ts.desc())
-            .first()
+        states_criterion = States.metadata_id == states_metadata_id
+
+    aggregates: dict[float, _PeriodAggregate] = {}
+    rows_by_start: dict[float, Any] = {}
+    all_runs = _period_runs(starts, SHORT_TERM_PERIOD_SECONDS)
+    for runs in _chunks(all_runs, PERIOD_RUNS_PER_QUERY):
+        for state_id, state, ts in session.execute(
+            select(States.state_id, States.state, States.last_updated_ts)
+            .where(states_criterion, _in_runs(States.last_updated_ts, runs))
+            .order_by(States.last_updated_ts.asc())
+        ):
+            bucket = period_start(ts, SHORT_TERM_PERIOD_SECONDS)
+            aggregate = aggregates.get(bucket)
+            if aggregate is None:
+                aggregate = aggregates[bucket] = _PeriodAggregate()
+            aggregate.add(state, state_id)
+
+        for row in session.execute(
+            select(
+                StatisticsShortTerm.id,
+                StatisticsShortTerm.start_ts,
+                StatisticsShortTerm.state,
+                StatisticsShortTerm.sum,
+            ).where(
+                StatisticsShortTerm.metadata_id == stat_meta_id,
+                _in_runs(StatisticsShortTerm.start_ts, runs),
+            )
+        ):
+            rows_by_start[row.start_ts] = row
+
+    updates: list[dict[str, Any]] = []
+    deletes: list[dict[str, Any]] = []
+    for start_ts in starts:
+        row = rows_by_start.get(start_ts)
+        if row is None:
+            continue
+        values = _short_term_values(
+            session, start_ts, aggregates.get(start_ts), states_criterion
         )
-        prev_value: float | None = None
-        if prev_state is not None:
-            try:
-                prev_value = float(prev_state.state)
-            except (ValueError, TypeError):
-                prev_value = None
-
-        if prev_value is not None:
-            short_term.mean = prev_value
-            short_term.min = prev_value
-            short_term.max = prev_value
-            short_term.state = prev_value
-            new_state = prev_value
+        if values is None:
+            deletes.append({"target_id": row.id})
+            continue
+        mean, min_, max_, state, state_id = values
+        updates.append({
+            "target_id": row.id,
+            "new_mean": mean,
+            "new_min": min_,
+            "new_max": max_,
+            "new_state": state,
+            "new_state_id": state_id,
+        })
+        if row.sum is not None and row.state is not None:
+            _cascade_sum_adjustment(session, stat_meta_id, start_ts, state - row.state)
+
+    if updates:
+        session.execute(_UPDATE_SHORT_TERM_VALUES_STMT, updates)
+    if deletes:
+        session.execute(_DELETE_SHORT_TERM_ROW_STMT, deletes)
+    return len(updates) + len(deletes)
+
+
+def _apply_long_term_period(
+    session, long_term, stat_meta_id: int, start_ts_hour: float, short_terms: list,
+) -> bool:
+    """Write re-aggregated values for one hour onto ``long_term``.
+
+    ``short_terms`` are the hour's short-term rows (anything with ``mean``,
+    ``min``, ``max``, ``state`` and ``sum`` attributes) in chronological
+    order.  ``long_term`` may be ``None``.  Returns True if a row was
+    updated or removed.
+    """
+    if not short_terms:
+        # No short-term stats remain in this period (e.g. all underlying records were
+        # deleted). Carry forward the last known short-term value from before this period
+        # so the long-term chart shows a continuous line rather than stale or missing data.
+        if long_term is None:
+            return False
+        prev_short_term = session.execute(
+            _PREV_SHORT_TERM_STMT,
+            {"target_metadata_id": stat_meta_id, "target_start_ts": start_ts_hour},
+        ).first()
+        if prev_short_term is not None and prev_short_term.state is not None:
+            prev_value = prev_short_term.state
+            long_term.mean = prev_short_term.mean if prev_short_term.mean is not None else prev_value
+            long_term.min = prev_short_term.min if prev_short_term.min is not None else prev_value
+            long_term.max = prev_short_term.max if prev_short_term.max is not None else prev_value
+            long_term.state = prev_value
+            # Note: ``sum`` is intentionally not touched here.  When short-term
+            # rows are gone because the recorder purged them, the existing
+            # long-term sum is authoritative and must be preserved.  When
+            # short-term rows are gone because the user deleted them via this
+            # component, any sum delta was already applied via
+            # _cascade_sum_adjustment at deletion time.
         else:
-            # No prior value available either — remove the now-meaningless row.
-            session.delete(short_term)
+            # No prior value available — remove the now-meaningless row.
+            session.delete(long_term)
+        return True
+
+    if long_term is None:
+        return False
 
-    # For sensors with a running sum (total / total_increasing), cascade the
-    # state-change delta to this period and every subsequent one so that the
-    # energy dashboard and statistics panels remain accurate.
-    # _cascade_sum_adjustment returns early when delta == 0, so no extra guard needed.
-    if has_sum and old_state is not None and new_state is not None:
-        _cascade_sum_adjustment(session, stat_meta_id, start_ts_5min, new_state - old_state)
+    # One pass over the (at most twelve) short-term rows; each column
+    # skips its own NULLs.
+    mean_total = 0.0
+    mean_count = 0
+    min_: float | None = None
+    max_: float | None = None
+    last_state: float | None = None
+    last_sum: float | None = None
+    for row in short_terms:
+        if row.mean is not None:
+            mean_total += row.mean
+            mean_count += 1
+        if row.min is not None and (min_ is None or row.min < min_):
+            min_ = row.min
+        if row.max is not None and (max_ is None or row.max > max_):
+            max_ = row.max
+        if row.state is not None:
+            last_state = row.state
+        if row.sum is not None:
+            last_sum = row.sum
+
+    if mean_count:
+        # Average the short-term means, consistent with how HA aggregates hourly statistics
+        long_term.mean = mean_total / mean_count
+    if min_ is not None:
+        long_term.min = min_
+    if max_ is not None:
+        long_term.max = max_
+    if last_state is not None:
+        long_term.state = last_state  # last value in the hourly period
+
+    # For total/total_increasing sensors the long-term sum equals the sum of
+    # the last short-term row in the hour.  The short-term sums were already
+    # cascaded forward by recalculate_short_term_stats; we only need to mirror
+    # the last one here so the hourly row stays in sync.
+    if last_sum is not None:
+        long_term.sum = last_sum
 
     return True
 
@@ -232,94 +574,75 @@ def recalculate_long_term_stat(session, stat_meta_id: int, start_ts_hour: float)
     its value forward so the long-term statistics show a continuous line.  If no prior
     short-term row exists, the stale long-term row is removed.
     """
-    end_ts = start_ts_hour + 3600.0
+    end_ts = start_ts_hour + LONG_TERM_PERIOD_SECONDS
 
-    short_terms = (
-        session.query(StatisticsShortTerm)
-        .filter(
+    short_terms = session.execute(
+        select(*_SHORT_TERM_AGGREGATE_COLUMNS)
+        .where(
             StatisticsShortTerm.metadata_id == stat_meta_id,
             StatisticsShortTerm.start_ts >= start_ts_hour,
             StatisticsShortTerm.start_ts < end_ts,
         )
         .order_by(StatisticsShortTerm.start_ts.asc())
-        .all()
-    )
+    ).all()
 
-    long_term = session.query(Statistics).filter(
-        Statistics.metadata_id == stat_meta_id,
-        Statistics.start_ts == start_ts_hour,
-    ).first()
+    long_term = session.execute(
+        _LONG_TERM_ROW_STMT,
+        {"target_metadata_id": stat_meta_id, "target_start_ts": start_ts_hour},
+    ).scalars().first()
 
-    if not short_terms:
-        # No short-term stats remain in this period (e.g. all underlying records were
-        # deleted). Carry forward the last known short-term value from before this period
-        # so the long-term chart shows a continuous line rather than stale or missing data.
-        prev_short_term = (
-            session.query(
-                StatisticsShortTerm.mean,
-                StatisticsShortTerm.min,
-                StatisticsShortTerm.max,
-                StatisticsShortTerm.state,
-            )
-            .filter(
-                StatisticsShortTerm.metadata_id == stat_meta_id,
-                StatisticsShortTerm.start_ts < start_ts_hour,
-            )
-            .order_by(StatisticsShortTerm.start_ts.desc())
-            .first()
-        )
-        if long_term is not None:
-            if prev_short_term is not None and prev_short_term.state is not None:
-                prev_value = prev_short_term.state
-                long_term.mean = prev_short_term.mean if prev_short_term.mean is not None else prev_value
-                long_term.min = prev_short_term.min if prev_short_term.min is not None else prev_value
-                long_term.max = prev_short_term.max if prev_short_term.max is not None else prev_value
-                long_term.state = prev_value
-                # Note: ``sum`` is intentionally not touched here.  When short-term
-                # rows are gone because the recorder purged them, the existing
-                # long-term sum is authoritative and must be preserved.  When
-                # short-term rows are gone because the user deleted them via this
-                # component, any sum delta was already applied via
-                # _cascade_sum_adjustment at deletion time.
-            else:
-                # No prior value available — remove the now-meaningless row.
-                session.delete(long_term)
-            return True
-        return False
+    return _apply_long_term_period(session, long_term, stat_meta_id, start_ts_hour, short_terms)
 
-    if long_term is None:
-        return False
 
-    means = [s.mean for s in short_terms if s.mean is not None]
-    mins = [s.min for s in short_terms if s.min is not None]
-    maxs = [s.max for s in short_terms if s.max is not None]
-    states = [s.state for s in short_terms if s.state is not None]
+def recalculate_long_term_stats(session, stat_meta_id: int, hour_starts) -> int:
+    """Batch form of ``recalculate_long_term_stat`` for one statistic.
 
-    if means:
-        # Average the short-term means, consistent with how HA aggregates hourly statistics
-        long_term.mean = sum(means) / len(means)
-    if mins:
-        long_term.min = min(mins)
-    if maxs:
-        long_term.max = max(maxs)
-    if states:
-        long_term.state = states[-1]  # last value in the hourly period
+    ``hour_starts`` must be aligned to hour boundaries.  Reads the
+    short-term rows and the long-term rows of all hours with one query
+    each per ``PERIOD_RUNS_PER_QUERY`` contiguous ranges.  Returns the
+    number of long-term rows updated or removed.
+    """
+    starts = sorted(set(hour_starts))
+    if not starts:
+        return 0
 
-    # For total/total_increasing sensors the long-term sum equals the sum of
-    # the last short-term row in the hour.  The short-term sums were already
-    # cascaded forward by recalculate_short_term_stat; we only need to mirror
-    # the last one here so the hourly row stays in sync.
-    sums = [s.sum for s in short_terms if s.sum is not None]
-    if sums:
-        long_term.sum = sums[-1]
+    short_terms_by_hour: dict[float, list] = {}
+    rows_by_start: dict[float, Any] = {}
+    all_runs = _period_runs(starts, LONG_TERM_PERIOD_SECONDS)
+    for runs in _chunks(all_runs, PERIOD_RUNS_PER_QUERY):
+        for row in session.execute(
+            select(*_SHORT_TERM_AGGREGATE_COLUMNS)
+            .where(
+                StatisticsShortTerm.metadata_id == stat_meta_id,
+                _in_runs(StatisticsShortTerm.start_ts, runs),
+            )
+            .order_by(StatisticsShortTerm.start_ts.asc())
+        ):
+            hour = period_start(row.start_ts, LONG_TERM_PERIOD_SECONDS)
+            short_terms_by_hour.setdefault(hour, []).append(row)
+
+        for long_term in session.execute(
+            select(Statistics).where(
+                Statistics.metadata_id == stat_meta_id,
+                _in_runs(Statistics.start_ts, runs),
+            )
+        ).scalars():
+            rows_by_start[long_term.start_ts] = long_term
 
-    return True
+    updated = 0
+    for start_ts in starts:
+        if _apply_long_term_period(
+            session, rows_by_start.get(start_ts), stat_meta_id, start_ts,
+            short_terms_by_hour.get(start_ts, []),
+        ):
+            updated += 1
+    return updated
 
 
 def update_statistics_for_periods(
     session,
-    metadata_to_5min: dict[int, set[float]],
-    metadata_to_hour: dict[int, set[float]],
+    metadata_to_5min: dict[int, set[int]],
+    metadata_to_hour: dict[int, set[int]],
 ) -> tuple[int, int]:
     """Recalculate short-term and long-term stats for a batch of affected
     periods.  Used by the bulk state-mutation paths to dedupe per-period
@@ -340,117 +663,25 @@ def update_statistics_for_periods(
     long_updated = 0
 
     for metadata_id, periods_5min in metadata_to_5min.items():
-        meta = session.query(StatesMeta).filter(
-            StatesMeta.metadata_id == metadata_id
-        ).first()
-        if meta is None:
+        stat_meta_id = _stat_meta_id_for_states_metadata(session, metadata_id)
+        if stat_meta_id is None:
             continue
-        stat_meta = session.query(StatisticsMeta).filter(
-            StatisticsMeta.statistic_id == meta.entity_id
-        ).first()
-        if stat_meta is None:
-            continue
-        stat_meta_id = stat_meta.id
 
-        for ts in sorted(periods_5min):
-            if recalculate_short_term_stat(session, stat_meta_id, meta.entity_id, ts):
-                short_updated += 1
+        short_updated += recalculate_short_term_stats(
+            session, stat_meta_id, metadata_id, periods_5min
+        )
 
         # Phase boundary: flush + expire before long-term reads cached short-term sums.
         session.flush()
         session.expire_all()
 
-        for ts in metadata_to_hour.get(metadata_id, set()):
-            if recalculate_long_term_stat(session, stat_meta_id, ts):
-                long_updated += 1
+        long_updated += recalculate_long_term_stats(
+            session, stat_meta_id, metadata_to_hour.get(metadata_id, ())
+        )
 
     return short_updated, long_updated
 
 
-def update_statistics_after_state_change(
-    session,
-    state_record,
-    old_ts: float | None,
-    new_last_updated: datetime | None,
-) -> None:
-    """Update short-term and long-term statistics affected by a state record change.
-
-    Determines which 5-minute and hourly periods are affected (the period of the
-    old timestamp and/or the new timestamp), recalculates statistics for those
-    periods from the underlying state data, and persists the results.
-    """
-    # Collect affected period timestamps
-    affected_5min: set[float] = set()
-    affected_hour: set[float] = set()
-
-    def _add_periods(ts: float) -> None:
-        p5 = float(int(ts // 300) * 300)
-        ph = float(int(ts // 3600) * 3600)
-        affected_5min.add(p5)
-        affected_hour.add(ph)
-
-    if old_ts is not None:
-        _add_periods(old_ts)
-
-    # New timestamp after update
-    new_ts: float | None = None
-    if new_last_updated is not None:
-        new_ts = new_last_updated.timestamp()
-    elif hasattr(state_record, 'last_updated_ts') and state_record.last_updated_ts is not None:
-        new_ts = state_record.last_updated_ts
-
-    if new_ts is not None:
-        _add_periods(new_ts)
-
-    if not affected_5min:
-        return
-
-    # Resolve entity_id and StatisticsMeta
-    meta = session.query(StatesMeta).filter(
-        StatesMeta.metadata_id == state_record.metadata_id
-    ).first()
-    if meta is None:
-        return
-    entity_id = meta.entity_id
-
-    stat_meta = session.query(StatisticsMeta).filter(
-        StatisticsMeta.statistic_id == entity_id
-    ).first()
-    if stat_meta is None:
-        return
-
-    # Capture the primary key before we flush/expire the session so it
-    # remains accessible afterwards without an extra DB round-trip.
-    stat_meta_id = stat_meta.id
-
-    # Recalculate short-term stats for all affected 5-minute periods.
-    # Process in chronological order so earlier sum-cascade adjustments are
-    # applied before later periods are recalculated.
-    updated_5min = 0
-    for start_ts in sorted(affected_5min):
-        if recalculate_short_term_stat(session, stat_meta_id, entity_id, start_ts):
-            updated_5min += 1
-
-    # Flush pending ORM changes and expire all cached objects so that the
-    # long-term recalculation reads the freshly-updated short-term rows
-    # (including any sum-cascade bulk UPDATEs that used synchronize_session=False).
-    if updated_5min:
-        session.flush()
-        session.expire_all()
-
-    # Recalculate long-term stats for all affected hourly periods
-    updated_hour = 0
-    for start_ts in affected_hour:
-        if recalculate_long_term_stat(session, stat_meta_id, start_ts):
-            updated_hour += 1
-
-    if updated_5min or updated_hour:
-        _LOGGER.info(
-            "Updated statistics for entity %s: %d short-term and %d long-term period(s)",
-            entity_id, updated_5min, updated_hour,
-        )
-
-
 def get_statistics_sync(
     hass: HomeAssistant,
     entity_id: str,
@@ -471,63 +702,83 @@ def get_statistics_sync(
         return {"success": False, "error": "Recorder not available"}
 
     try:
-        table = StatisticsShortTerm if statistic_type == "short_term" else Statistics
-
-        with recorder.get_session() as session:
-            query = (
-                session.query(table)
-                .join(StatisticsMeta, table.metadata_id == StatisticsMeta.id)
-                .filter(StatisticsMeta.statistic_id == entity_id)
+        table = _STAT_TABLES[statistic_type]
+
+        columns = [
+            table.id,
+            table.metadata_id,
+            table.start_ts,
+            table.mean,
+            table.min,
+            table.max,
+            table.sum,
+            table.state,
+        ]
+        has_last_reset = _HAS_LAST_RESET_TS[table]
+        if has_last_reset:
+            columns.append(table.last_reset_ts)
+        if statistic_type != "short_term":
+            # long_term: locked when short-term stats exist in the 1-hour
+            # period.  Correlated EXISTS, so the whole page costs one query.
+            columns.append(
+                exists()
+                .where(
+                    StatisticsShortTerm.metadata_id == table.metadata_id,
+                    StatisticsShortTerm.start_ts >= table.start_ts,
+                    StatisticsShortTerm.start_ts < table.start_ts + LONG_TERM_PERIOD_SECONDS,
+                )
+                .label("has_short_term")
             )
 
-            if start_time:
-                query = query.filter(table.start_ts >= start_time.timestamp())
-            if end_time:
-                query = query.filter(table.start_ts <= end_time.timestamp())
+        stmt = (
+            select(*columns)
+            .join(StatisticsMeta, table.metadata_id == StatisticsMeta.id)
+            .where(StatisticsMeta.statistic_id == entity_id)
+        )
+        if start_time:
+            stmt = stmt.where(table.start_ts >= start_time.timestamp())
+        if end_time:
+            stmt = stmt.where(table.start_ts <= end_time.timestamp())
+        # Fetch one extra record to determine whether more records exist
+        stmt = stmt.order_by(table.start_ts.desc()).limit(limit + 1)
+
+        # Short-term rows are locked when they fall within the recorder keep
+        # period, since state history exists for that entire period and HA
+        # can recalculate any short-term stat within it.
+        cutoff_ts = None
+        if statistic_type == "short_term":
+            try:
+                keep_days = getattr(recorder, "keep_days", 10)
+                cutoff_ts = (dt_util.utcnow() - timedelta(days=keep_days)).timestamp()
+            except Exception as check_err:
+                _LOGGER.debug("Could not determine the recorder keep period: %s", check_err)
 
-            # Fetch one extra record to determine whether more records exist
-            fetch_limit = limit + 1
-            query = query.order_by(table.start_ts.desc()).limit(fetch_limit)
-            stats = query.all()
-            has_more = len(stats) > limit
-            if has_more:
-                stats = stats[:limit]
+        with recorder.get_session() as session:
+            # Column-only select, streamed in batches: the rows are only
+            # read, so skip ORM hydration and identity-map bookkeeping.
+            result = session.execute(
+                stmt, execution_options={"stream_results": True}
+            ).yield_per(STATISTICS_YIELD_PER)
+            stats = list(islice(result, limit))
+            has_more = result.fetchone() is not None
+            result.close()
 
             records = []
             for stat in stats:
                 start_iso = None
                 if stat.start_ts is not None:
-                    start_iso = dt_util.utc_from_timestamp(stat.start_ts).isoformat()
+                    start_iso = _ts_iso(stat.start_ts)
                 last_reset_iso = None
-                if hasattr(stat, 'last_reset_ts') and stat.last_reset_ts is not None:
-                    last_reset_iso = dt_util.utc_from_timestamp(stat.last_reset_ts).isoformat()
+                if has_last_reset and stat.last_reset_ts is not None:
+                    last_reset_iso = _ts_iso(stat.last_reset_ts)
 
                 # Determine whether this record is locked by underlying source data
                 has_source_data = False
                 if stat.start_ts is not None:
                     if statistic_type == "short_term":
-                        # Locked when the record falls within the recorder keep period,
-                        # since state history exists for that entire period and HA can
-                        # recalculate any short-term stat within it.
-                        try:
-                            keep_days = getattr(recorder, "keep_days", 10)
-                            cutoff_ts = (dt_util.utcnow() - timedelta(days=keep_days)).timestamp()
-                            has_source_data = stat.start_ts >= cutoff_ts
-                        except Exception as check_err:
-                            _LOGGER.debug("has_source_data check failed for short-term stat %s: %s", stat.id, check_err)
+                        has_source_data = cutoff_ts is not None and stat.start_ts >= cutoff_ts
                     else:
-                        # long_term: locked when short-term stats exist in the 1-hour period
-                        try:
-                            short_term_count = (
-                                session.query(StatisticsShortTerm)
-                                .filter(StatisticsShortTerm.metadata_id == stat.metadata_id)
-                                .filter(StatisticsShortTerm.start_ts >= stat.start_ts)
-                                .filter(StatisticsShortTerm.start_ts < stat.start_ts + 3600.0)
-                                .count()
-                            )
-                            has_source_data = short_term_count > 0
-                        except Exception as check_err:
-                            _LOGGER.debug("has_source_data check failed for long-term stat %s: %s", stat.id, check_err)
+                        has_source_data = bool(stat.has_short_term)
 
                 records.append({
                     "id": stat.id,
@@ -550,6 +801,167 @@ def get_statistics_sync(
         return {"success": False, "error": str(err)}
 
 
+def _has_states_in_period(session, entity_id: str, start_ts: float) -> bool:
+    """Return True if ``entity_id`` has state history in the 5-minute period.
+
+    EXISTS rather than COUNT(*): the guard only needs the first matching
+    index entry, not all of them.
+    """
+    return bool(session.execute(
+        _STATES_IN_PERIOD_STMT,
+        {
+            "target_entity_id": entity_id,
+            "target_start_ts": start_ts,
+            "target_end_ts": start_ts + SHORT_TERM_PERIOD_SECONDS,
+        },
+    ).scalar())
+
+
+def _has_short_term_in_hour(session, metadata_id: int, start_ts: float) -> bool:
+    """Return True if short-term statistics exist in the hour at ``start_ts``."""
+    return bool(session.execute(
+        _SHORT_TERM_IN_PERIOD_STMT,
+        {
+            "target_metadata_id": metadata_id,
+            "target_start_ts": start_ts,
+            "target_end_ts": start_ts + LONG_TERM_PERIOD_SECONDS,
+        },
+    ).scalar())
+
+
+def _short_term_has_source_data(session, metadata_id: int, start_ts: float) -> bool:
+    """Return True if state history exists in a short-term row's period."""
+    statistic_id = session.execute(
+        _STATISTIC_ID_STMT, {"target_metadata_id": metadata_id}
+    ).scalar()
+    if statistic_id is None:
+        return False
+    return _has_states_in_period(session, statistic_id, start_ts)
+
+
+if HAS_STATISTICS:
+    # Per statistic_type: the table rows live in, and the check for the
+    # finer-grained data a row is derived from (states for short-term rows,
+    # short-term rows for long-term ones).  Looked up once per request
+    # instead of branching on the type string at every step.
+    _STAT_TABLES = {"short_term": StatisticsShortTerm, "long_term": Statistics}
+    _SOURCE_DATA_CHECKS = {
+        "short_term": _short_term_has_source_data,
+        "long_term": _has_short_term_in_hour,
+    }
+    # Column-only reads of statistics rows by id, for the update/delete
+    # paths: the rows are rewritten with Core statements, so no ORM
+    # instances are loaded.
+    _STAT_ROW_STMTS = {
+        table: select(
+            table.id, table.metadata_id, table.start_ts,
+            table.mean, table.min, table.max, table.state, table.sum,
+        ).where(table.id == bindparam("target_id"))
+        for table in _STAT_TABLES.values()
+    }
+    _STAT_ROWS_STMTS = {
+        table: select(
+            table.id, table.metadata_id, table.start_ts,
+        ).where(table.id.in_(bindparam("target_ids", expanding=True)))
+        for table in _STAT_TABLES.values()
+    }
+    # Neutralize/delete: the prior row's values, the overwrite with them,
+    # and the delete fallback.
+    _PREV_STAT_VALUES_STMTS = {
+        table: select(table.mean, table.min, table.max, table.state, table.sum)
+        .where(
+            table.metadata_id == bindparam("target_metadata_id"),
+            table.start_ts < bindparam("target_start_ts"),
+        )
+        .order_by(table.start_ts.desc())
+        .limit(1)
+        for table in _STAT_TABLES.values()
+    }
+    _OVERWRITE_STAT_VALUES_STMTS = {
+        table: update(table)
+        .where(table.id == bindparam("target_id"))
+        .values(
+            mean=bindparam("new_mean"),
+            min=bindparam("new_min"),
+            max=bindparam("new_max"),
+            state=bindparam("new_state"),
+            sum=bindparam("new_sum"),
+        )
+        .execution_options(synchronize_session=False)
+        for table in _STAT_TABLES.values()
+    }
+    _DELETE_STAT_ROW_STMTS = {
+        table: delete(table)
+        .where(table.id == bindparam("target_id"))
+        .execution_options(synchronize_session=False)
+        for table in _STAT_TABLES.values()
+    }
+
+# Error text when a direct edit/delete is blocked by source data.
+_EDIT_BLOCKED_ERRORS = {
+    "short_term": (
+        "Cannot edit short-term statistics directly: state history "
+        "records exist for this 5-minute period. Edit the state "
+        "history instead, or wait for the recorder to purge those "
+        "states (default: 10 days), after which this row becomes "
+        "editable."
+    ),
+    "long_term": (
+        "Cannot edit long-term statistics directly: short-term statistics "
+        "records exist for this hour. Edit the short-term statistics "
+        "instead, or wait for the recorder to purge them (default: 10 "
+        "days), after which this long-term row becomes editable."
+    ),
+}
+_DELETE_BLOCKED_ERRORS = {
+    "short_term": (
+        "Cannot delete short-term statistics directly: state history "
+        "records exist for this 5-minute period. Delete the state "
+        "history instead, or wait for the recorder to purge those "
+        "states (default: 10 days), after which this row becomes "
+        "deletable."
+    ),
+    "long_term": (
+        "Cannot delete long-term statistics directly: short-term statistics "
+        "records exist for this hour. Delete the short-term statistics "
+        "instead, or wait for the recorder to purge them (default: 10 "
+        "days), after which this long-term row becomes deletable."
+    ),
+}
+_BULK_BLOCKED_ERRORS = {
+    "short_term": (
+        "state history records exist for this 5-minute period; edit "
+        "the state history instead, or wait for the recorder to purge "
+        "(default: 10 days)"
+    ),
+    "long_term": (
+        "short-term statistics records exist for this hour; edit the "
+        "short-term statistics instead, or wait for the recorder to purge "
+        "(default: 10 days)"
+    ),
+}
+
+
+def _stat_has_source_data(
+    session, statistic_type: str, stat_id: int, metadata_id: int, start_ts: float | None,
+) -> bool:
+    """Return True if source data blocks direct edits of a statistics row.
+
+    A failing check is logged and treated as "no source data", so a
+    dialect quirk never locks rows that would otherwise be editable.
+    """
+    if start_ts is None:
+        return False
+    try:
+        return _SOURCE_DATA_CHECKS[statistic_type](session, metadata_id, start_ts)
+    except Exception as check_err:
+        _LOGGER.warning(
+            "Source-data check failed for %s stat %s: %s",
+            statistic_type.replace("_", "-"), stat_id, check_err,
+        )
+        return False
+
+
 def update_statistic_sync(
     hass: HomeAssistant,
     stat_id: int,
@@ -573,87 +985,40 @@ def update_statistic_sync(
         return {"success": False, "error": "Recorder not available"}
 
     try:
-        table = StatisticsShortTerm if statistic_type == "short_term" else Statistics
+        table = _STAT_TABLES[statistic_type]
 
         with recorder.get_session() as session:
-            stat = session.query(table).filter(table.id == stat_id).first()
+            stat = session.execute(_STAT_ROW_STMTS[table], {"target_id": stat_id}).first()
 
             if stat is None:
                 return {"success": False, "error": f"Statistic ID {stat_id} not found"}
 
             # Guard: reject direct edits when underlying source data exists
-            if stat.start_ts is not None:
-                if statistic_type == "short_term":
-                    stat_meta_row = session.query(StatisticsMeta).filter(
-                        StatisticsMeta.id == stat.metadata_id
-                    ).first()
-                    if stat_meta_row is not None:
-                        try:
-                            state_count = (
-                                session.query(States)
-                                .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
-                                .filter(StatesMeta.entity_id == stat_meta_row.statistic_id)
-                                .filter(States.last_updated_ts >= stat.start_ts)
-                                .filter(States.last_updated_ts < stat.start_ts + 300.0)
-                                .count()
-                            )
-                            if state_count > 0:
-                                return {
-                                    "success": False,
-                                    "error": (
-                                        "Cannot edit short-term statistics directly: state history "
-                                        "records exist for this 5-minute period. Edit the state "
-                                        "history instead, or wait for the recorder to purge those "
-                                        "states (default: 10 days), after which this row becomes "
-                                        "editable."
-                                    ),
-                                }
-                        except Exception as check_err:
-                            _LOGGER.warning("Source-data check failed for short-term stat %s: %s", stat_id, check_err)
-                else:
-                    try:
-                        short_term_count = (
-                            session.query(StatisticsShortTerm)
-                            .filter(StatisticsShortTerm.metadata_id == stat.metadata_id)
-                            .filter(StatisticsShortTerm.start_ts >= stat.start_ts)
-                            .filter(StatisticsShortTerm.start_ts < stat.start_ts + 3600.0)
-                            .count()
-                        )
-                        if short_term_count > 0:
-                            return {
-                                "success": False,
-                                "error": (
-                                    "Cannot edit long-term statistics directly: short-term statistics "
-                                    "records exist for this hour. Edit the short-term statistics "
-                                    "instead, or wait for the recorder to purge them (default: 10 "
-                                    "days), after which this long-term row becomes editable."
-                                ),
-                            }
-                    except Exception as check_err:
-                        _LOGGER.warning("Source-data check failed for long-term stat %s: %s", stat_id, check_err)
-
-            if mean is not None:
-                stat.mean = float(mean)
-            if min_val is not None:
-                stat.min = float(min_val)
-            if max_val is not None:
-                stat.max = float(max_val)
-            if sum_val is not None:
-                stat.sum = float(sum_val)
-            if state is not None:
-                stat.state = float(state)
-            if start is not None:
-                stat.start_ts = start.timestamp()
+            if _stat_has_source_data(
+                session, statistic_type, stat_id, stat.metadata_id, stat.start_ts
+            ):
+                return {"success": False, "error": _EDIT_BLOCKED_ERRORS[statistic_type]}
 
-            # Flush to make changes visible before cascading to long-term stats
-            session.flush()
+            values = _stat_override_values(mean, min_val, max_val, sum_val, state)
+            if start is not None:
+                values["start_ts"] = start.timestamp()
+            # The hourly row is derived from these columns; an edit that
+            # leaves them all unchanged skips the cascade below.
+            changed = any(getattr(stat, column) != value for column, value in values.items())
+            if values:
+                session.execute(
+                    update(table)
+                    .where(table.id == stat_id)
+                    .values(values)
+                    .execution_options(synchronize_session=False)
+                )
 
             # Cascade: after updating a short-term stat, recalculate the corresponding long-term stat
-            if statistic_type == "short_term":
+            if statistic_type == "short_term" and changed:
                 try:
-                    effective_ts = start.timestamp() if start is not None else stat.start_ts
+                    effective_ts = values.get("start_ts", stat.start_ts)
                     if effective_ts is not None:
-                        start_ts_hour = float(int(effective_ts // 3600) * 3600)
+                        start_ts_hour = period_start(effective_ts, LONG_TERM_PERIOD_SECONDS)
                         recalculate_long_term_stat(session, stat.metadata_id, start_ts_hour)
                 except Exception as cascade_err:
                     _LOGGER.warning(
@@ -686,10 +1051,10 @@ def delete_statistic_sync(
         return {"success": False, "error": "Recorder not available"}
 
     try:
-        table = StatisticsShortTerm if statistic_type == "short_term" else Statistics
+        table = _STAT_TABLES[statistic_type]
 
         with recorder.get_session() as session:
-            stat = session.query(table).filter(table.id == stat_id).first()
+            stat = session.execute(_STAT_ROW_STMTS[table], {"target_id": stat_id}).first()
             if stat is None:
                 return {"success": False, "error": f"Statistic ID {stat_id} not found"}
 
@@ -698,55 +1063,10 @@ def delete_statistic_sync(
             stat_metadata_id = stat.metadata_id
 
             # Guard: reject direct deletes when underlying source data exists
-            if stat_start_ts is not None:
-                if statistic_type == "short_term":
-                    stat_meta_row = session.query(StatisticsMeta).filter(
-                        StatisticsMeta.id == stat_metadata_id
-                    ).first()
-                    if stat_meta_row is not None:
-                        try:
-                            state_count = (
-                                session.query(States)
-                                .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
-                                .filter(StatesMeta.entity_id == stat_meta_row.statistic_id)
-                                .filter(States.last_updated_ts >= stat_start_ts)
-                                .filter(States.last_updated_ts < stat_start_ts + 300.0)
-                                .count()
-                            )
-                            if state_count > 0:
-                                return {
-                                    "success": False,
-                                    "error": (
-                                        "Cannot delete short-term statistics directly: state history "
-                                        "records exist for this 5-minute period. Delete the state "
-                                        "history instead, or wait for the recorder to purge those "
-                                        "states (default: 10 days), after which this row becomes "
-                                        "deletable."
-                                    ),
-                                }
-                        except Exception as check_err:
-                            _LOGGER.warning("Source-data check failed for short-term stat %s: %s", stat_id, check_err)
-                else:
-                    try:
-                        short_term_count = (
-                            session.query(StatisticsShortTerm)
-                            .filter(StatisticsShortTerm.metadata_id == stat_metadata_id)
-                            .filter(StatisticsShortTerm.start_ts >= stat_start_ts)
-                            .filter(StatisticsShortTerm.start_ts < stat_start_ts + 3600.0)
-                            .count()
-                        )
-                        if short_term_count > 0:
-                            return {
-                                "success": False,
-                                "error": (
-                                    "Cannot delete long-term statistics directly: short-term statistics "
-                                    "records exist for this hour. Delete the short-term statistics "
-                                    "instead, or wait for the recorder to purge them (default: 10 "
-                                    "days), after which this long-term row becomes deletable."
-                                ),
-                            }
-                    except Exception as check_err:
-                        _LOGGER.warning("Source-data check failed for long-term stat %s: %s", stat_id, check_err)
+            if _stat_has_source_data(
+                session, statistic_type, stat_id, stat_metadata_id, stat_start_ts
+            ):
+                return {"success": False, "error": _DELETE_BLOCKED_ERRORS[statistic_type]}
 
             # Overwrite with the previous period's values so the row
             # becomes "transparent" rather than creating a gap in the
@@ -755,16 +1075,13 @@ def delete_statistic_sync(
             if not neutralized:
                 # First row ever for this entity — no prior to carry forward;
                 # actually remove it since there's no gap to fill.
-                session.query(table).filter(table.id == stat_id).delete(
-                    synchronize_session=False,
-                )
+                _delete_stat_row(session, table, stat_id)
 
             # Cascade: re-aggregate the containing long-term row from
             # the (now-neutralized or removed) short-term row.
             if statistic_type == "short_term" and stat_start_ts is not None:
                 try:
-                    session.flush()
-                    start_ts_hour = float(int(stat_start_ts // 3600) * 3600)
+                    start_ts_hour = period_start(stat_start_ts, LONG_TERM_PERIOD_SECONDS)
                     recalculate_long_term_stat(session, stat_metadata_id, start_ts_hour)
                 except Exception as cascade_err:
                     _LOGGER.warning(
@@ -781,6 +1098,29 @@ def delete_statistic_sync(
         return {"success": False, "error": str(err)}
 
 
+def _stat_override_values(
+    mean: float | None,
+    min_val: float | None,
+    max_val: float | None,
+    sum_val: float | None,
+    state: float | None,
+) -> dict[str, float]:
+    """Return the statistics column values to write for the given overrides."""
+    return {
+        column: float(value)
+        for column, value in (
+            ("mean", mean), ("min", min_val), ("max", max_val),
+            ("sum", sum_val), ("state", state),
+        )
+        if value is not None
+    }
+
+
+def _delete_stat_row(session, table, stat_id: int) -> None:
+    """Delete a statistics row by id with a Core ``DELETE``."""
+    session.execute(_DELETE_STAT_ROW_STMTS[table], {"target_id": stat_id})
+
+
 def _neutralize_stat_row(session, table, stat):
     """Overwrite a statistics row with the previous period's values.
 
@@ -789,31 +1129,47 @@ def _neutralize_stat_row(session, table, stat):
     gap, we make it "transparent" by copying mean/min/max/state/sum from
     the preceding row of the same entity.
 
+    ``stat`` only needs ``id``, ``metadata_id`` and ``start_ts``; both the
+    read and the overwrite are prebuilt Core statements.
+
     Returns ``True`` if a prior row was found and the overwrite succeeded,
     or ``False`` if this is the very first row for the entity (no prior to
     carry forward) — in which case the caller should fall back to an actual
     delete.
     """
-    prev = (
-        session.query(table)
-        .filter(
-            table.metadata_id == stat.metadata_id,
-            table.start_ts < stat.start_ts,
-        )
-        .order_by(table.start_ts.desc())
-        .first()
-    )
+    prev = session.execute(
+        _PREV_STAT_VALUES_STMTS[table],
+        {"target_metadata_id": stat.metadata_id, "target_start_ts": stat.start_ts},
+    ).first()
     if prev is None:
         return False
 
-    stat.mean = prev.mean
-    stat.min = prev.min
-    stat.max = prev.max
-    stat.state = prev.state
-    stat.sum = prev.sum
+    session.execute(
+        _OVERWRITE_STAT_VALUES_STMTS[table],
+        {
+            "target_id": stat.id,
+            "new_mean": prev.mean,
+            "new_min": prev.min,
+            "new_max": prev.max,
+            "new_state": prev.state,
+            "new_sum": prev.sum,
+        },
+    )
     return True
 
 
+def _read_stat_rows(session, table, ids: list[int]) -> dict[int, Any]:
+    """Return ``{id: (id, metadata_id, start_ts) row}`` for the ids that exist.
+
+    Column-only, in ``STAT_IDS_PER_QUERY`` chunks.
+    """
+    found: dict[int, Any] = {}
+    for chunk in _chunks(ids, STAT_IDS_PER_QUERY):
+        for row in session.execute(_STAT_ROWS_STMTS[table], {"target_ids": chunk}):
+            found[row.id] = row
+    return found
+
+
 def _check_source_data_blocks_edit(
     session, stat, statistic_type: str,
 ) -> str | None:
@@ -826,53 +1182,10 @@ def _check_source_data_blocks_edit(
     exist in the containing hour.  This mirrors the guards in the singular
     update/delete helpers and is reused by the bulk variants.
     """
-    if stat.start_ts is None:
-        return None
-
-    if statistic_type == "short_term":
-        stat_meta_row = session.query(StatisticsMeta).filter(
-            StatisticsMeta.id == stat.metadata_id
-        ).first()
-        if stat_meta_row is None:
-            return None
-        try:
-            state_count = (
-                session.query(States)
-                .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
-                .filter(StatesMeta.entity_id == stat_meta_row.statistic_id)
-                .filter(States.last_updated_ts >= stat.start_ts)
-                .filter(States.last_updated_ts < stat.start_ts + 300.0)
-                .count()
-            )
-        except Exception as check_err:
-            _LOGGER.warning("Source-data check failed for short-term stat %s: %s", stat.id, check_err)
-            return None
-        if state_count > 0:
-            return (
-                "state history records exist for this 5-minute period; edit "
-                "the state history instead, or wait for the recorder to purge "
-                "(default: 10 days)"
-            )
-        return None
-
-    # long_term
-    try:
-        short_term_count = (
-            session.query(StatisticsShortTerm)
-            .filter(StatisticsShortTerm.metadata_id == stat.metadata_id)
-            .filter(StatisticsShortTerm.start_ts >= stat.start_ts)
-            .filter(StatisticsShortTerm.start_ts < stat.start_ts + 3600.0)
-            .count()
-        )
-    except Exception as check_err:
-        _LOGGER.warning("Source-data check failed for long-term stat %s: %s", stat.id, check_err)
-        return None
-    if short_term_count > 0:
-        return (
-            "short-term statistics records exist for this hour; edit the "
-            "short-term statistics instead, or wait for the recorder to purge "
-            "(default: 10 days)"
-        )
+    if _stat_has_source_data(
+        session, statistic_type, stat.id, stat.metadata_id, stat.start_ts
+    ):
+        return _BULK_BLOCKED_ERRORS[statistic_type]
     return None
 
 
@@ -913,19 +1226,20 @@ def bulk_update_statistic_sync(
     if recorder is None:
         return {"success": False, "error": "Recorder not available"}
 
-    table = StatisticsShortTerm if statistic_type == "short_term" else Statistics
+    table = _STAT_TABLES[statistic_type]
 
     try:
         with recorder.get_session() as session:
-            updated_count = 0
             blocked: list[dict[str, Any]] = []
             not_found: list[int] = []
             # Per-metadata_id, the set of hour starts that need long-term
             # recalculation after this batch.  Only used for short-term updates.
-            affected_hours: dict[int, set[float]] = {}
+            affected_hours: dict[int, set[int]] = {}
+            to_update: list[int] = []
 
+            rows = _read_stat_rows(session, table, ids)
             for stat_id in ids:
-                stat = session.query(table).filter(table.id == stat_id).first()
+                stat = rows.get(stat_id)
                 if stat is None:
                     not_found.append(stat_id)
                     continue
@@ -937,23 +1251,21 @@ def bulk_update_statistic_sync(
                     blocked.append({"id": stat_id, "reason": guard_reason})
                     continue
 
-                if mean is not None:
-                    stat.mean = float(mean)
-                if min_val is not None:
-                    stat.min = float(min_val)
-                if max_val is not None:
-                    stat.max = float(max_val)
-                if sum_val is not None:
-                    stat.sum = float(sum_val)
-                if state is not None:
-                    stat.state = float(state)
-                updated_count += 1
-
+                to_update.append(stat_id)
                 if statistic_type == "short_term" and stat.start_ts is not None:
-                    hour_start = float(int(stat.start_ts // 3600) * 3600)
+                    hour_start = period_start(stat.start_ts, LONG_TERM_PERIOD_SECONDS)
                     affected_hours.setdefault(stat.metadata_id, set()).add(hour_start)
 
-            session.flush()
+            # Every row gets the same values: one UPDATE per id chunk
+            values = _stat_override_values(mean, min_val, max_val, sum_val, state)
+            for chunk in _chunks(list(dict.fromkeys(to_update)), STAT_IDS_PER_QUERY):
+                session.execute(
+                    update(table)
+                    .where(table.id.in_(chunk))
+                    .values(values)
+                    .execution_options(synchronize_session=False)
+                )
+            updated_count = len(to_update)
 
             # Cascade: re-aggregate long-term rows for every affected hour.
             # Done once per hour (not per short-term row) to avoid redundant work.
@@ -1008,14 +1320,14 @@ def bulk_delete_statistic_sync(
     if recorder is None:
         return {"success": False, "error": "Recorder not available"}
 
-    table = StatisticsShortTerm if statistic_type == "short_term" else Statistics
+    table = _STAT_TABLES[statistic_type]
 
     try:
         with recorder.get_session() as session:
             deleted_count = 0
             blocked: list[dict[str, Any]] = []
             not_found: list[int] = []
-            affected_hours: dict[int, set[float]] = {}
+            affected_hours: dict[int, set[int]] = {}
 
             # Load all target rows first, then sort by start_ts ascending.
             # Processing in chronological order is essential: when
@@ -1024,8 +1336,9 @@ def bulk_delete_statistic_sync(
             # now-neutralized A (= P), then C copies from B (= P).
             # Reverse order would leave C with B's original bad value.
             rows_to_process = []
+            rows = _read_stat_rows(session, table, ids)
             for stat_id in ids:
-                stat = session.query(table).filter(table.id == stat_id).first()
+                stat = rows.get(stat_id)
                 if stat is None:
                     not_found.append(stat_id)
                     continue
@@ -1043,16 +1356,14 @@ def bulk_delete_statistic_sync(
 
             for stat in rows_to_process:
                 if statistic_type == "short_term" and stat.start_ts is not None:
-                    hour_start = float(int(stat.start_ts // 3600) * 3600)
+                    hour_start = period_start(stat.start_ts, LONG_TERM_PERIOD_SECONDS)
                     affected_hours.setdefault(stat.metadata_id, set()).add(hour_start)
 
                 neutralized = _neutralize_stat_row(session, table, stat)
                 if not neutralized:
-                    session.delete(stat)
+                    _delete_stat_row(session, table, stat.id)
                 deleted_count += 1
 
-            session.flush()
-
             if statistic_type == "short_term" and affected_hours:
                 for metadata_id, hours in affected_hours.items():
                     for hour in hours:
@@ -1115,16 +1426,15 @@ def recalculate_statistics_sync(
 
     try:
         with recorder.get_session() as session:
-            # Resolve the StatisticsMeta row for this entity
-            stat_meta = session.query(StatisticsMeta).filter(
-                StatisticsMeta.statistic_id == entity_id
-            ).first()
-            if stat_meta is None:
+            # Resolve the StatisticsMeta id for this entity
+            stat_meta_id = session.execute(
+                select(StatisticsMeta.id).where(StatisticsMeta.statistic_id == entity_id)
+            ).scalar()
+            if stat_meta_id is None:
                 return {
                     "success": False,
                     "error": f"No statistics metadata found for entity '{entity_id}'",
                 }
-            stat_meta_id = stat_meta.id
 
             updated_short_term = 0
             updated_long_term = 0
@@ -1135,17 +1445,22 @@ def recalculate_statistics_sync(
             # ORM via synchronize_session=False) so later iterations read fresh
             # values instead of stale identity-map entries.
             if statistic_type in ("short_term", "both"):
-                ts = float(int(start_ts // SHORT_TERM_PERIOD_SECONDS) * SHORT_TERM_PERIOD_SECONDS)
-                periods_in_chunk = 0
+                states_meta = session.query(StatesMeta.metadata_id).filter(
+                    StatesMeta.entity_id == entity_id
+                ).first()
+                states_metadata_id = states_meta[0] if states_meta else None
+                ts = period_start(start_ts, SHORT_TERM_PERIOD_SECONDS)
                 while ts < end_ts:
-                    if recalculate_short_term_stat(session, stat_meta_id, entity_id, ts):
-                        updated_short_term += 1
-                    periods_in_chunk += 1
-                    ts += SHORT_TERM_PERIOD_SECONDS
-                    if periods_in_chunk >= RECALC_CHUNK_SHORT_TERM:
+                    chunk = []
+                    while ts < end_ts and len(chunk) < RECALC_CHUNK_SHORT_TERM:
+                        chunk.append(ts)
+                        ts += SHORT_TERM_PERIOD_SECONDS
+                    updated_short_term += recalculate_short_term_stats(
+                        session, stat_meta_id, states_metadata_id, chunk
+                    )
+                    if ts < end_ts:
                         session.commit()
                         session.expire_all()
-                        periods_in_chunk = 0
 
             # Phase boundary: commit + expire so the long-term pass reads the
             # freshly-updated short-term rows.  Without this, long-term
@@ -1156,17 +1471,18 @@ def recalculate_statistics_sync(
 
             # Recalculate long-term (hourly) statistics from short-term statistics
             if statistic_type in ("long_term", "both"):
-                ts = float(int(start_ts // LONG_TERM_PERIOD_SECONDS) * LONG_TERM_PERIOD_SECONDS)
-                periods_in_chunk = 0
+                ts = period_start(start_ts, LONG_TERM_PERIOD_SECONDS)
                 while ts < end_ts:
-                    if recalculate_long_term_stat(session, stat_meta_id, ts):
-                        updated_long_term += 1
-                    periods_in_chunk += 1
-                    ts += LONG_TERM_PERIOD_SECONDS
-                    if periods_in_chunk >= RECALC_CHUNK_LONG_TERM:
+                    chunk = []
+                    while ts < end_ts and len(chunk) < RECALC_CHUNK_LONG_TERM:
+                        chunk.append(ts)
+                        ts += LONG_TERM_PERIOD_SECONDS
+                    updated_long_term += recalculate_long_term_stats(
+                        session, stat_meta_id, chunk
+                    )
+                    if ts < end_ts:
                         session.commit()
                         session.expire_all()
-                        periods_in_chunk = 0
 
             session.commit()
 
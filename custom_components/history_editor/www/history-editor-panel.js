@@ -1479,7 +1479,7 @@ class HistoryEditorPanel extends HTMLElement {
     this.querySelector('#stats-form-fields').style.display = 'none';
 
     this.querySelector('#edit-state-id').value = record.state_id;
-    this.querySelector('#edit-entity-id').value = record.entity_id;
+    this.querySelector('#edit-entity-id').value = this.selectedEntity;
     this.querySelector('#edit-entity-id').readOnly = true;
     this.querySelector('#edit-state').value = record.state;
     this.querySelector('#edit-attributes').value = JSON.stringify(record.attributes || {}, null, 2);
@@ -140,3 +140,16 @@ def mock_hass(db_session, monkeypatch):
     monkeypatch.setattr(schema_compat, "_validation_errors", [])
 
     return MagicMock()  # placeholder hass; get_instance is patched out
+
+
+@pytest.fixture(autouse=True)
+def _clear_metadata_id_cache():
+    """Every test gets a fresh DB, so ids cached by an earlier test are stale."""
+    from custom_components import history_editor as pkg_module
+    from custom_components.history_editor import statistics as stats_module
+
+    pkg_module._METADATA_ID_CACHE.clear()
+    stats_module._STAT_META_ID_CACHE.clear()
+    yield
+    pkg_module._METADATA_ID_CACHE.clear()
+    stats_module._STAT_META_ID_CACHE.clear()
@@ -8,11 +8,13 @@ fake requests and never touch a real recorder.
 from __future__ import annotations
 
 import asyncio
+import json
 from types import SimpleNamespace
 
 import pytest
 
 from custom_components.history_editor import (  # noqa: E402
+    BatchView,
     BulkDeleteRecordView,
     BulkDeleteStatisticView,
     BulkUpdateRecordView,
@@ -20,18 +22,21 @@ from custom_components.history_editor import (  # noqa: E402
     CreateRecordView,
     DeleteRecordView,
     DeleteStatisticView,
+    GetMultiRecordsView,
     GetRecordsView,
     GetStatisticsView,
+    KEY_HASS,
     UpdateRecordView,
     UpdateStatisticView,
     _is_admin_request,
 )
 
 # Views whose handler is a GET (read endpoints); the rest use POST.
-GET_VIEWS = {GetRecordsView, GetStatisticsView}
+GET_VIEWS = {GetRecordsView, GetMultiRecordsView, GetStatisticsView}
 
 ALL_VIEWS = [
     GetRecordsView,
+    GetMultiRecordsView,
     UpdateRecordView,
     DeleteRecordView,
     CreateRecordView,
@@ -42,6 +47,7 @@ ALL_VIEWS = [
     BulkDeleteRecordView,
     BulkUpdateStatisticView,
     BulkDeleteStatisticView,
+    BatchView,
 ]
 
 
@@ -52,20 +58,31 @@ class FakeRequest(dict):
     which is exactly what ``_is_admin_request`` inspects.
     """
 
-    def __init__(self, user=None, json_data=None, query=None):
+    def __init__(self, user=None, json_data=None, query=None, body=None):
         super().__init__()
         if user is not None:
             self["hass_user"] = user
         self._json = {} if json_data is None else json_data
+        self._body = body
         self.query = {} if query is None else query
+        self.app = {KEY_HASS: None}
 
     async def json(self):
         return self._json
 
+    async def read(self):
+        if self._body is not None:
+            return self._body
+        return json.dumps(self._json).encode()
+
 
 def _call(view, request):
-    """Instantiate ``view`` and invoke its request handler synchronously."""
-    instance = view(hass=None)
+    """Instantiate ``view`` and invoke its request handler synchronously.
+
+    Views are stateless and read hass from ``request.app``; the fake app holds
+    ``None`` there, so nothing past validation can reach a recorder.
+    """
+    instance = view()
     handler = instance.get if view in GET_VIEWS else instance.post
     return asyncio.run(handler(request))
 
@@ -114,6 +131,7 @@ MUTATING_VIEWS = [
     BulkDeleteRecordView,
     BulkUpdateStatisticView,
     BulkDeleteStatisticView,
+    BatchView,
 ]
 
 
@@ -136,8 +154,31 @@ def test_regression_non_admin_cannot_mutate_recorder(view):
         "ids": [1, 2],
         "entity_id": "sensor.test",
         "state": "42",
+        "operations": [{"op": "delete", "state_id": 1}],
     }
     non_admin = SimpleNamespace(is_admin=False)
     resp = _call(view, FakeRequest(user=non_admin, json_data=payload))
     assert resp.status == 403
     assert b"Admin privileges required" in resp.body
+
+
+@pytest.mark.parametrize(
+    "view", MUTATING_VIEWS, ids=[v.__name__ for v in MUTATING_VIEWS]
+)
+@pytest.mark.parametrize("body", [b"{not json", b"[1, 2]"], ids=["malformed", "array"])
+def test_invalid_json_body_is_a_bad_request(view, body):
+    admin = SimpleNamespace(is_admin=True)
+    resp = _call(view, FakeRequest(user=admin, body=body))
+    assert resp.status == 400
+    assert b"Invalid JSON body" in resp.body
+
+
+@pytest.mark.parametrize(
+    "view", MUTATING_VIEWS, ids=[v.__name__ for v in MUTATING_VIEWS]
+)
+def test_missing_required_field_is_a_bad_request(view):
+    """Every mutating endpoint rejects an empty object before any write."""
+    admin = SimpleNamespace(is_admin=True)
+    resp = _call(view, FakeRequest(user=admin, json_data={}))
+    assert resp.status == 400
+    assert b"required" in resp.body
@@ -0,0 +1,299 @@
+"""Tests for the mixed-operation batch endpoint.
+
+Covers ``_parse_batch_operations`` (request validation),
+``SERVICE_BATCH_SCHEMA`` (service validation) and ``_batch_sync``
+(single-transaction create / update / delete with one deduped statistics
+cascade) from ``custom_components.history_editor``.
+"""
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+
+from unittest.mock import MagicMock
+
+import pytest
+import voluptuous as vol
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+pytest.importorskip("homeassistant.components.recorder.db_schema")
+
+from homeassistant.components.recorder.db_schema import (  # noqa: E402
+    Base,
+    StateAttributes,
+    States,
+    StatesMeta,
+)
+
+from custom_components.history_editor import (  # noqa: E402
+    SERVICE_BATCH_SCHEMA,
+    _batch_sync,
+    _parse_batch_operations,
+)
+
+
+def _add_state(session, metadata_id, ts, state, attributes=None):
+    s = States(
+        metadata_id=metadata_id,
+        state=state,
+        attributes=json.dumps(attributes or {}),
+        last_updated_ts=ts,
+        last_changed_ts=ts,
+    )
+    session.add(s)
+    session.flush()
+    return s
+
+
+@pytest.fixture
+def file_db(tmp_path, monkeypatch):
+    """A file-backed SQLite engine whose recorder stub hands out fresh sessions.
+
+    Unlike ``mock_hass``, nothing has a transaction open when ``_batch_sync``
+    starts, which is how the recorder's own sessions behave.  Returns
+    ``(hass, engine, Session)``.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'recorder.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+
+    recorder_stub = MagicMock()
+    recorder_stub.get_session.side_effect = Session
+
+    from custom_components import history_editor as pkg_module
+    from custom_components.history_editor import schema_compat
+
+    monkeypatch.setattr(pkg_module, "get_instance", lambda hass: recorder_stub)
+    # Keep the statistics cascade and its own commit out of the picture.
+    monkeypatch.setattr(pkg_module, "HAS_STATISTICS", False)
+    monkeypatch.setattr(schema_compat, "_validated_ha_version", _ha_version())
+    monkeypatch.setattr(schema_compat, "_validation_errors", [])
+
+    yield MagicMock(), engine, Session
+    engine.dispose()
+
+
+def _ha_version() -> str:
+    try:
+        from homeassistant.const import __version__
+    except ImportError:
+        return "test"
+    return __version__
+
+
+class TestParseBatchOperations:
+    def test_rejects_missing_or_empty_list(self):
+        assert _parse_batch_operations(None)[1] == "operations is required"
+        assert "non-empty" in _parse_batch_operations([])[1]
+
+    def test_rejects_unknown_op(self):
+        ops, err = _parse_batch_operations([{"op": "merge", "state_id": 1}])
+        assert ops is None
+        assert "operations[0].op" in err
+
+    def test_rejects_create_without_entity_or_state(self):
+        _, err = _parse_batch_operations([{"op": "create", "state": "1"}])
+        assert "entity_id is required" in err
+        _, err = _parse_batch_operations([{"op": "create", "entity_id": "sensor.x"}])
+        assert "state is required" in err
+
+    def test_rejects_invalid_datetime(self):
+        _, err = _parse_batch_operations(
+            [{"op": "update", "state_id": 1, "last_updated": "not-a-date"}]
+        )
+        assert err == "operations[0]: Invalid last_updated format"
+
+    def test_reports_the_single_record_validation_messages(self):
+        _, err = _parse_batch_operations([
+            {"op": "delete", "state_id": 1},
+            {"op": "update", "state_id": "x"},
+        ])
+        assert err == "operations[1]: state_id must be an integer"
+
+    def test_normalises_operations(self):
+        ops, err = _parse_batch_operations([
+            {"op": "update", "state_id": "5", "state": 3},
+            {"op": "delete", "state_id": 6},
+            {"op": "create", "entity_id": "sensor.x", "state": "on"},
+        ])
+        assert err is None
+        assert ops[0]["state_id"] == 5
+        assert ops[0]["state"] == "3"
+        assert ops[0]["attributes"] is None
+        assert ops[1] == {
+            "op": "delete", "state_id": 6,
+            "last_changed": None, "last_updated": None,
+        }
+        assert ops[2]["attributes"] == {}
+        assert ops[2]["last_changed"] == ops[2]["last_updated"]
+        assert ops[2]["last_updated"] is not None
+
+
+class TestBatchServiceSchema:
+    def test_accepts_mixed_operations(self):
+        data = SERVICE_BATCH_SCHEMA({"operations": [
+            {"op": "create", "entity_id": "sensor.x", "state": "on"},
+            {"op": "update", "state_id": 5, "state": "off"},
+            {"op": "delete", "state_id": 6},
+        ]})
+        assert [item["op"] for item in data["operations"]] == [
+            "create", "update", "delete",
+        ]
+
+    def test_rejects_invalid_operations(self):
+        with pytest.raises(vol.Invalid):
+            SERVICE_BATCH_SCHEMA({"operations": []})
+        with pytest.raises(vol.Invalid):
+            SERVICE_BATCH_SCHEMA({"operations": [{"op": "merge", "state_id": 1}]})
+        with pytest.raises(vol.Invalid):
+            SERVICE_BATCH_SCHEMA({"operations": [{"op": "create", "state": "on"}]})
+
+
+class TestBatchSync:
+    def test_applies_mixed_operations_in_one_call(
+        self, db_session, mock_hass, sample_entity,
+    ):
+        states_meta_id, _, _ = sample_entity
+        s1 = _add_state(db_session, states_meta_id, 1_700_000_000, "1")
+        s2 = _add_state(db_session, states_meta_id, 1_700_000_100, "2")
+        # A later row keeps SQLite from handing s2's id to the created row.
+        _add_state(db_session, states_meta_id, 1_700_000_200, "3")
+        s1_id, s2_id = s1.state_id, s2.state_id
+        ops, _ = _parse_batch_operations([
+            {"op": "update", "state_id": s1_id, "state": "10"},
+            {"op": "delete", "state_id": s2_id},
+            {
+                "op": "create", "entity_id": "sensor.batch_new", "state": "7",
+                "last_updated": "2023-11-14T22:15:00+00:00",
+            },
+        ])
+
+        result = _batch_sync(mock_hass, ops)
+
+        assert result["success"] is True
+        assert [r["success"] for r in result["results"]] == [True, True, True]
+        db_session.expire_all()
+        assert db_session.get(States, s1_id).state == "10"
+        assert db_session.get(States, s2_id) is None
+        created = db_session.get(States, result["results"][2]["state_id"])
+        assert created.state == "7"
+        assert created.last_updated_ts == datetime(
+            2023, 11, 14, 22, 15, tzinfo=timezone.utc
+        ).timestamp()
+        meta = db_session.query(StatesMeta).filter(
+            StatesMeta.entity_id == "sensor.batch_new"
+        ).one()
+        assert created.metadata_id == meta.metadata_id
+
+    def test_reports_missing_rows_without_aborting(
+        self, db_session, mock_hass, sample_entity,
+    ):
+        states_meta_id, _, _ = sample_entity
+        s1 = _add_state(db_session, states_meta_id, 1_700_000_000, "1")
+        s1_id = s1.state_id
+        ops, _ = _parse_batch_operations([
+            {"op": "delete", "state_id": 999_999},
+            {"op": "update", "state_id": s1_id, "state": "5"},
+        ])
+
+        result = _batch_sync(mock_hass, ops)
+
+        assert result["success"] is True
+        missing, updated = result["results"]
+        assert missing["success"] is False
+        assert "999999 not found" in missing["error"]
+        assert updated["success"] is True
+        db_session.expire_all()
+        assert db_session.get(States, s1_id).state == "5"
+
+    def test_missing_row_update_leaves_state_attributes_unchanged(
+        self, db_session, mock_hass, sample_entity,
+    ):
+        states_meta_id, _, _ = sample_entity
+        s1 = _add_state(db_session, states_meta_id, 1_700_000_000, "1")
+        s1_id = s1.state_id
+        attributes_before = db_session.query(StateAttributes).count()
+        ops, _ = _parse_batch_operations([
+            {"op": "update", "state_id": 12345, "attributes": {"orphan": True}},
+            {"op": "update", "state_id": s1_id, "state": "5"},
+        ])
+
+        result = _batch_sync(mock_hass, ops)
+
+        assert result["success"] is True
+        assert [r["success"] for r in result["results"]] == [False, True]
+        db_session.expire_all()
+        assert db_session.query(StateAttributes).count() == attributes_before
+        assert db_session.get(States, s1_id).state == "5"
+
+    def test_commits_once_without_savepoints(self, file_db):
+        hass, engine, Session = file_db
+        with Session() as session:
+            meta = StatesMeta(entity_id="sensor.test")
+            session.add(meta)
+            session.flush()
+            s1 = _add_state(session, meta.metadata_id, 1_700_000_000, "1")
+            s2 = _add_state(session, meta.metadata_id, 1_700_000_100, "2")
+            s1_id, s2_id = s1.state_id, s2.state_id
+            session.commit()
+        ops, _ = _parse_batch_operations([
+            {"op": "update", "state_id": s1_id, "state": "10"},
+            {"op": "delete", "state_id": s2_id},
+            {"op": "create", "entity_id": "sensor.test", "state": "7"},
+        ])
+
+        commits: list[object] = []
+        statements: list[str] = []
+
+        def _count_commit(conn):
+            commits.append(conn)
+
+        def _capture(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "commit", _count_commit)
+        event.listen(engine, "before_cursor_execute", _capture)
+        try:
+            result = _batch_sync(hass, ops)
+        finally:
+            event.remove(engine, "commit", _count_commit)
+            event.remove(engine, "before_cursor_execute", _capture)
+
+        assert result["success"] is True
+        # pysqlite emits no BEGIN before a SAVEPOINT, so every RELEASE would
+        # commit its operation on its own.
+        assert not any("SAVEPOINT" in sql for sql in statements)
+        assert len(commits) == 1
+
+    def test_error_rolls_back_the_whole_batch(self, file_db):
+        hass, _, Session = file_db
+        with Session() as session:
+            meta = StatesMeta(entity_id="sensor.test")
+            session.add(meta)
+            session.flush()
+            s1_id = _add_state(session, meta.metadata_id, 1_700_000_000, "1").state_id
+            session.commit()
+        ops, _ = _parse_batch_operations([
+            {"op": "update", "state_id": s1_id, "state": "5"},
+            # The new StatesMeta row is inserted before the attributes fail
+            # to serialise.
+            {
+                "op": "create", "entity_id": "sensor.rolled_back", "state": "1",
+                "attributes": {"bad": object()},
+            },
+        ])
+
+        result = _batch_sync(hass, ops)
+
+        assert result["success"] is False
+        with Session() as session:
+            assert session.get(States, s1_id).state == "1"
+            assert session.query(StatesMeta).filter(
+                StatesMeta.entity_id == "sensor.rolled_back"
+            ).first() is None
+
+    def test_rejects_empty_operations(self, db_session, mock_hass):
+        result = _batch_sync(mock_hass, [])
+        assert result["success"] is False
+        assert "non-empty" in result["error"]
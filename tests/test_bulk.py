@@ -1,8 +1,9 @@
 """Tests for bulk operations on state history and statistics records.
 
 Covers:
-- ``_bulk_update_record_sync`` and ``_bulk_delete_record_sync`` from
-  ``custom_components.history_editor`` — multi-row state edits / deletes.
+- ``_bulk_create_record_sync``, ``_bulk_update_record_sync`` and
+  ``_bulk_delete_record_sync`` from ``custom_components.history_editor`` —
+  multi-row state creates / edits / deletes.
 - ``bulk_update_statistic_sync`` and ``bulk_delete_statistic_sync`` from
   ``custom_components.history_editor.statistics`` — multi-row stats edits
   / deletes for both short-term and long-term tables.
@@ -16,18 +17,23 @@ import json
 from datetime import datetime, timezone
 
 import pytest
+from sqlalchemy import event
 
 pytest.importorskip("homeassistant.components.recorder.db_schema")
 
 from homeassistant.components.recorder.db_schema import (  # noqa: E402
+    StateAttributes,
     States,
+    StatesMeta,
     Statistics,
     StatisticsShortTerm,
 )
 
 from custom_components.history_editor import (  # noqa: E402
+    _bulk_create_record_sync,
     _bulk_delete_record_sync,
     _bulk_update_record_sync,
+    _delete_records_in_range_sync,
 )
 from custom_components.history_editor.statistics import (  # noqa: E402
     bulk_delete_statistic_sync,
@@ -62,6 +68,78 @@ def _add_long_term(session, metadata_id, start_ts, **cols):
     return row
 
 
+# --------------------------------------------------------------------------
+# _bulk_create_record_sync
+# --------------------------------------------------------------------------
+
+
+def _record(entity_id, ts, state, attributes=None):
+    when = datetime.fromtimestamp(ts, tz=timezone.utc)
+    return {
+        "entity_id": entity_id,
+        "state": state,
+        "attributes": attributes or {},
+        "last_changed": when,
+        "last_updated": when,
+    }
+
+
+class TestBulkCreateRecord:
+    def test_creates_all_records_in_input_order(
+        self, db_session, mock_hass, sample_entity,
+    ):
+        _, _, entity_id = sample_entity
+        records = [
+            _record(entity_id, 1_700_000_000, "1", {"unit": "W"}),
+            _record("sensor.brand_new", 1_700_000_100, "2", {"unit": "W"}),
+            _record(entity_id, 1_700_000_200, "3"),
+        ]
+
+        result = _bulk_create_record_sync(mock_hass, records)
+
+        assert result["success"] is True
+        assert result["created_count"] == 3
+        db_session.expire_all()
+        created = [db_session.get(States, sid) for sid in result["state_ids"]]
+        assert [row.state for row in created] == ["1", "2", "3"]
+        assert created[0].metadata_id == created[2].metadata_id
+        new_meta = db_session.query(StatesMeta).filter_by(entity_id="sensor.brand_new").one()
+        assert created[1].metadata_id == new_meta.metadata_id
+        # Identical attribute sets share one state_attributes row
+        assert created[0].attributes_id == created[1].attributes_id
+        assert created[1].last_updated_ts == 1_700_000_100
+
+    def test_rejects_empty_list(self, db_session, mock_hass):
+        result = _bulk_create_record_sync(mock_hass, [])
+        assert result["success"] is False
+        assert "non-empty" in result["error"]
+
+    def test_recalculates_statistics_once_per_affected_period(
+        self, db_session, mock_hass, sample_entity,
+    ):
+        """Two creates in one 5-min bucket refresh its short-term row."""
+        states_meta_id, stat_meta_id, entity_id = sample_entity
+        period = 1_700_000_000.0 - (1_700_000_000.0 % 300)
+        short = _add_short_term(
+            db_session, stat_meta_id, start_ts=period,
+            mean=5.0, min=5.0, max=5.0, state=5.0,
+        )
+        short_id = short.id
+
+        result = _bulk_create_record_sync(mock_hass, [
+            _record(entity_id, period + 30, "10.0"),
+            _record(entity_id, period + 60, "20.0"),
+        ])
+
+        assert result["success"] is True
+        assert result["statistics_stale"] is False
+        db_session.expire_all()
+        refreshed = db_session.get(StatisticsShortTerm, short_id)
+        assert refreshed.min == 10.0
+        assert refreshed.max == 20.0
+        assert refreshed.state == 20.0
+
+
 # --------------------------------------------------------------------------
 # _bulk_update_record_sync
 # --------------------------------------------------------------------------
@@ -88,6 +166,37 @@ class TestBulkUpdateRecord:
         for sid in ids:
             assert db_session.get(States, sid).state == "FIXED"
 
+    def test_issues_one_update_per_in_chunk(
+        self, db_session, mock_hass, sample_entity, monkeypatch,
+    ):
+        monkeypatch.setattr(
+            "custom_components.history_editor.IN_CLAUSE_CHUNK_SIZE", 2,
+        )
+        states_meta_id, _, _ = sample_entity
+        ids = [
+            _add_state(db_session, states_meta_id, 1_700_000_000 + i, str(i)).state_id
+            for i in range(5)
+        ]
+        statements: list[str] = []
+        engine = db_session.get_bind()
+
+        def _capture(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _capture)
+        try:
+            result = _bulk_update_record_sync(
+                mock_hass, ids, "FIXED", None, None, None,
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", _capture)
+
+        assert result["updated_count"] == 5
+        assert sum(sql.startswith("UPDATE states") for sql in statements) == 3
+        db_session.expire_all()
+        for sid in ids:
+            assert db_session.get(States, sid).state == "FIXED"
+
     def test_replaces_attributes_uniformly(
         self, db_session, mock_hass, sample_entity,
     ):
@@ -107,9 +216,11 @@ class TestBulkUpdateRecord:
         assert result["success"] is True
         assert result["updated_count"] == 2
         db_session.expire_all()
-        for sid in ids:
-            stored = db_session.get(States, sid).attributes
-            assert json.loads(stored) == {"new": "attrs"}
+        attributes_ids = {db_session.get(States, sid).attributes_id for sid in ids}
+        # Both rows point at one shared row holding the new attributes
+        assert len(attributes_ids) == 1
+        stored = db_session.get(StateAttributes, attributes_ids.pop()).shared_attrs
+        assert json.loads(stored) == {"new": "attrs"}
 
     def test_reports_not_found_ids_without_aborting(
         self, db_session, mock_hass, sample_entity,
@@ -320,6 +431,98 @@ class TestBulkDeleteRecord:
         db_session.expire_all()
         assert db_session.get(States, s2_id).old_state_id is None
 
+    def test_chained_states_deleted_across_in_chunks(
+        self, db_session, mock_hass, sample_entity, monkeypatch,
+    ):
+        """A chain of states linked by old_state_id is deleted chunk by
+        chunk; references into a later chunk are cleared first."""
+        monkeypatch.setattr(
+            "custom_components.history_editor.IN_CLAUSE_CHUNK_SIZE", 2,
+        )
+        states_meta_id, _, _ = sample_entity
+        ids: list[int] = []
+        previous = None
+        for i in range(5):
+            row = States(
+                metadata_id=states_meta_id, state=str(i), attributes="{}",
+                last_updated_ts=1_700_000_000 + i, last_changed_ts=1_700_000_000 + i,
+                old_state_id=previous,
+            )
+            db_session.add(row)
+            db_session.flush()
+            previous = row.state_id
+            ids.append(row.state_id)
+
+        # Newest first, so each chunk holds states referenced by the next one
+        result = _bulk_delete_record_sync(mock_hass, list(reversed(ids)) + [999_999])
+
+        assert result["success"] is True
+        assert result["deleted_count"] == 5
+        assert result["not_found"] == [999_999]
+        db_session.expire_all()
+        for sid in ids:
+            assert db_session.get(States, sid) is None
+
+
+# --------------------------------------------------------------------------
+# _delete_records_in_range_sync
+# --------------------------------------------------------------------------
+
+
+def _utc(ts):
+    return datetime.fromtimestamp(ts, tz=timezone.utc)
+
+
+class TestDeleteRecordsInRange:
+    def test_deletes_only_records_inside_inclusive_range(
+        self, db_session, mock_hass, sample_entity,
+    ):
+        states_meta_id, _, entity_id = sample_entity
+        other_meta = StatesMeta(entity_id="sensor.other")
+        db_session.add(other_meta)
+        db_session.flush()
+        before = _add_state(db_session, states_meta_id, 1_700_000_000, "0")
+        first = _add_state(db_session, states_meta_id, 1_700_000_100, "1")
+        last = _add_state(db_session, states_meta_id, 1_700_000_200, "2")
+        after = _add_state(db_session, states_meta_id, 1_700_000_300, "3")
+        other = _add_state(db_session, other_meta.metadata_id, 1_700_000_150, "x")
+        kept = [before.state_id, after.state_id, other.state_id]
+        removed = [first.state_id, last.state_id]
+
+        result = _delete_records_in_range_sync(
+            mock_hass, entity_id, _utc(1_700_000_100), _utc(1_700_000_200),
+        )
+
+        assert result["success"] is True
+        assert result["deleted_count"] == 2
+        db_session.expire_all()
+        for sid in removed:
+            assert db_session.get(States, sid) is None
+        for sid in kept:
+            assert db_session.get(States, sid) is not None
+
+    def test_unknown_entity_or_empty_range_deletes_nothing(
+        self, db_session, mock_hass, sample_entity,
+    ):
+        states_meta_id, _, entity_id = sample_entity
+        _add_state(db_session, states_meta_id, 1_700_000_000, "1")
+
+        for target in ("sensor.missing", entity_id):
+            result = _delete_records_in_range_sync(
+                mock_hass, target, _utc(1_800_000_000), _utc(1_800_000_100),
+            )
+            assert result == {
+                "success": True, "deleted_count": 0, "statistics_stale": False,
+            }
+
+    def test_rejects_inverted_range(self, db_session, mock_hass, sample_entity):
+        _, _, entity_id = sample_entity
+        result = _delete_records_in_range_sync(
+            mock_hass, entity_id, _utc(1_700_000_100), _utc(1_700_000_000),
+        )
+        assert result["success"] is False
+        assert "start_time" in result["error"]
+
 
 # --------------------------------------------------------------------------
 # bulk_update_statistic_sync
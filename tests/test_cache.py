@@ -0,0 +1,58 @@
+"""Tests for the read-endpoint ``ResponseCache``."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.history_editor import cache as cache_module
+from custom_components.history_editor.cache import ResponseCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable stand-in for ``time.monotonic`` inside the cache module."""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_returns_stored_body_until_ttl_expires(clock):
+    cache = ResponseCache(ttl=2.0)
+    cache.set(("records", "sensor.a"), b"{}")
+
+    clock[0] += 1.9
+    assert cache.get(("records", "sensor.a")) == b"{}"
+
+    clock[0] += 0.2
+    assert cache.get(("records", "sensor.a")) is None
+    assert len(cache) == 0
+
+
+def test_evicts_least_recently_used_entry(clock):
+    cache = ResponseCache(ttl=60.0, max_entries=2)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    cache.get("a")  # "b" is now the least recently used
+    cache.set("c", b"3")
+
+    assert cache.get("a") == b"1"
+    assert cache.get("b") is None
+    assert cache.get("c") == b"3"
+
+
+def test_clear_drops_everything(clock):
+    cache = ResponseCache()
+    cache.set("a", b"1")
+    cache.clear()
+    assert cache.get("a") is None
+
+
+def test_set_is_dropped_when_cleared_since_generation(clock):
+    cache = ResponseCache()
+    generation = cache.generation
+    # A write clears the cache while the read is still running.
+    cache.clear()
+    cache.set("a", b"stale", generation)
+    assert cache.get("a") is None
+
+    cache.set("a", b"fresh", cache.generation)
+    assert cache.get("a") == b"fresh"
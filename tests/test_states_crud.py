@@ -10,21 +10,38 @@ import json
 from datetime import datetime, timedelta, timezone
 
 import pytest
+from sqlalchemy import event, text
 
 pytest.importorskip("homeassistant.components.recorder.db_schema")
 
 from homeassistant.components.recorder.db_schema import (  # noqa: E402
+    StateAttributes,
     States,
     StatesMeta,
     Statistics,
     StatisticsShortTerm,
 )
 
+import voluptuous as vol  # noqa: E402
+
 from custom_components.history_editor import (  # noqa: E402
+    GET_MULTI_RECORDS_QUERY_SCHEMA,
+    GET_RECORDS_QUERY_SCHEMA,
+    GET_STATISTICS_QUERY_SCHEMA,
+    MAX_QUERY_ENTITIES,
+    MAX_QUERY_LIMIT,
+    SERVICE_CREATE_RECORD_SCHEMA,
+    _METADATA_ID_CACHE,
     _create_record_sync,
     _delete_record_sync,
+    _fast_parse_dt,
+    _get_multi_records_sync,
+    _get_or_create_metadata_id,
     _get_records_sync,
+    _insert_states_meta_stmt,
+    _query_error_message,
     _update_record_sync,
+    _validate_fields,
 )
 
 
@@ -42,6 +59,13 @@ def _add_state(session, metadata_id: int, ts: float, state: str,
     return s
 
 
+def _stored_attributes(session, state_id: int) -> dict:
+    """Decode the attributes a state row points at in ``state_attributes``."""
+    row = session.get(States, state_id)
+    assert row.attributes is None
+    return json.loads(session.get(StateAttributes, row.attributes_id).shared_attrs)
+
+
 # --------------------------------------------------------------------------
 # _get_records_sync
 # --------------------------------------------------------------------------
@@ -65,6 +89,17 @@ class TestGetRecordsSync:
         assert states == ["3.0", "2.0", "1.0"]
         assert result["has_more"] is False
 
+    def test_reports_entity_id_once_per_response(
+        self, db_session, mock_hass, sample_entity,
+    ):
+        states_meta_id, _, entity_id = sample_entity
+        _add_state(db_session, states_meta_id, 1_700_000_000, "1.0")
+
+        result = _get_records_sync(mock_hass, entity_id, None, None, limit=100)
+
+        assert result["entity_id"] == entity_id
+        assert "entity_id" not in result["records"][0]
+
     def test_respects_limit_and_reports_has_more(
         self, db_session, mock_hass, sample_entity,
     ):
@@ -103,6 +138,30 @@ class TestGetRecordsSync:
         assert result["records"] == []
         assert result["has_more"] is False
 
+    def test_caches_resolved_metadata_id_but_not_misses(
+        self, db_session, mock_hass, sample_entity,
+    ):
+        states_meta_id, _, entity_id = sample_entity
+        _add_state(db_session, states_meta_id, 1_700_000_000, "1.0")
+        _get_records_sync(mock_hass, entity_id, None, None, limit=100)
+        _get_records_sync(mock_hass, "sensor.late", None, None, limit=100)
+
+        assert _METADATA_ID_CACHE.get(entity_id) == states_meta_id
+        assert _METADATA_ID_CACHE.get("sensor.late") is None
+
+        # An entity recorded after a miss is picked up on the next request.
+        late_meta = StatesMeta(entity_id="sensor.late")
+        db_session.add(late_meta)
+        db_session.flush()
+        _add_state(db_session, late_meta.metadata_id, 1_700_000_000, "on")
+        result = _get_records_sync(mock_hass, "sensor.late", None, None, limit=100)
+        assert [r["state"] for r in result["records"]] == ["on"]
+        assert _METADATA_ID_CACHE.get("sensor.late") == late_meta.metadata_id
+
+        # Cached ids take the direct path and return the same rows.
+        result = _get_records_sync(mock_hass, entity_id, None, None, limit=100)
+        assert [r["state"] for r in result["records"]] == ["1.0"]
+
     def test_deserialises_json_attributes(
         self, db_session, mock_hass, sample_entity,
     ):
@@ -118,6 +177,22 @@ class TestGetRecordsSync:
         assert attrs["unit_of_measurement"] == "°C"
         assert attrs["friendly_name"] == "Temp"
 
+    def test_identical_attribute_blobs_decoded_once(
+        self, db_session, mock_hass, sample_entity,
+    ):
+        states_meta_id, _, entity_id = sample_entity
+        for i in range(3):
+            _add_state(
+                db_session, states_meta_id, 1_700_000_000 + i, str(i),
+                attributes={"unit_of_measurement": "°C"},
+            )
+
+        result = _get_records_sync(mock_hass, entity_id, None, None, limit=100)
+
+        first, second, third = (r["attributes"] for r in result["records"])
+        assert first == {"unit_of_measurement": "°C"}
+        assert first is second is third
+
     def test_handles_malformed_attributes_gracefully(
         self, db_session, mock_hass, sample_entity,
     ):
@@ -136,6 +211,182 @@ class TestGetRecordsSync:
         assert result["records"][0]["attributes"] == {}
 
 
+class TestGetMultiRecordsSync:
+    def test_pages_each_entity_separately(
+        self, db_session, mock_hass, sample_entity,
+    ):
+        states_meta_id, _, entity_id = sample_entity
+        other_meta = StatesMeta(entity_id="sensor.other")
+        db_session.add(other_meta)
+        db_session.flush()
+        for i in range(3):
+            _add_state(db_session, states_meta_id, 1_700_000_000 + i, str(i))
+        _add_state(db_session, other_meta.metadata_id, 1_700_000_000, "x")
+
+        result = _get_multi_records_sync(
+            mock_hass, ["sensor.other", entity_id, "sensor.missing"], None, None, limit=2,
+        )
+
+        assert result["success"] is True
+        entities = result["entities"]
+        assert list(entities) == ["sensor.other", entity_id, "sensor.missing"]
+        assert [r["state"] for r in entities[entity_id]["records"]] == ["2", "1"]
+        assert entities[entity_id]["has_more"] is True
+        assert [r["state"] for r in entities["sensor.other"]["records"]] == ["x"]
+        assert entities["sensor.other"]["has_more"] is False
+        assert entities["sensor.missing"] == {"records": [], "has_more": False}
+
+
+class TestFastParseDt:
+    def test_parses_javascript_iso_strings(self):
+        assert _fast_parse_dt("2023-11-14T22:13:20.000Z") == datetime(
+            2023, 11, 14, 22, 13, 20, tzinfo=timezone.utc
+        )
+        assert _fast_parse_dt("2023-11-14T23:13:20+01:00") == datetime(
+            2023, 11, 14, 22, 13, 20, tzinfo=timezone.utc
+        )
+
+    def test_returns_none_for_garbage(self):
+        assert _fast_parse_dt("not a date") is None
+        assert _fast_parse_dt("") is None
+        assert _fast_parse_dt("2023-13-45T00:00:00") is None
+
+    def test_schemas_take_the_fast_path(self, monkeypatch):
+        def _slow_path(value):
+            raise AssertionError("dt_util.parse_datetime called")
+
+        monkeypatch.setattr("homeassistant.util.dt.parse_datetime", _slow_path)
+        expected = datetime(2023, 11, 14, 22, 13, 20, tzinfo=timezone.utc)
+
+        query = GET_RECORDS_QUERY_SCHEMA(
+            {"entity_id": "sensor.test", "start_time": "2023-11-14T22:13:20.000Z"}
+        )
+        service = SERVICE_CREATE_RECORD_SCHEMA({
+            "entity_id": "sensor.test", "state": "1",
+            "last_updated": "2023-11-14T22:13:20.000Z", "last_changed": expected,
+        })
+
+        assert query["start_time"] == expected
+        assert service["last_updated"] == expected
+        assert service["last_changed"] is expected
+
+
+class TestValidateFields:
+    SPEC = (
+        ("state_id", "int", True),
+        ("state", "str", False),
+        ("last_changed", "dt", False),
+        ("statistic_type", "stat_type", False),
+    )
+
+    def test_coerces_and_omits_absent_fields(self):
+        fields, err = _validate_fields(
+            {"state_id": "7", "state": 3, "last_changed": ""}, self.SPEC
+        )
+        assert err is None
+        assert fields == {"state_id": 7, "state": "3"}
+
+    def test_parses_timestamps(self):
+        fields, _ = _validate_fields(
+            {"state_id": 1, "last_changed": "2024-01-02T03:04:05.000Z"}, self.SPEC
+        )
+        assert fields["last_changed"] == datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+    @pytest.mark.parametrize(
+        ("data", "message"),
+        [
+            ({}, "state_id is required"),
+            ({"state_id": "x"}, "state_id must be an integer"),
+            ({"state_id": 1, "last_changed": "yesterday"}, "Invalid last_changed format"),
+            ({"state_id": 1, "statistic_type": "hourly"},
+             "statistic_type must be 'long_term' or 'short_term'"),
+        ],
+    )
+    def test_reports_first_invalid_field(self, data, message):
+        assert _validate_fields(data, self.SPEC) == (None, message)
+
+
+class TestRecordsQuerySchema:
+    def _error(self, query):
+        with pytest.raises(vol.Invalid) as exc:
+            GET_RECORDS_QUERY_SCHEMA(query)
+        return _query_error_message(exc.value)
+
+    def test_parses_query_string_values(self):
+        parsed = GET_RECORDS_QUERY_SCHEMA({
+            "entity_id": "sensor.test",
+            "limit": "25",
+            "start_time": "2023-11-14T22:00:00+00:00",
+            "unknown": "dropped",
+        })
+        assert parsed["limit"] == 25
+        assert parsed["start_time"] == datetime(2023, 11, 14, 22, tzinfo=timezone.utc)
+        assert "end_time" not in parsed
+        assert "unknown" not in parsed
+
+    def test_defaults_limit(self):
+        assert GET_RECORDS_QUERY_SCHEMA({"entity_id": "sensor.test"})["limit"] == 100
+
+    def test_clamps_limit(self):
+        parsed = GET_RECORDS_QUERY_SCHEMA({"entity_id": "sensor.test", "limit": "10000000"})
+        assert parsed["limit"] == MAX_QUERY_LIMIT
+
+    def test_error_messages(self):
+        assert self._error({}) == "entity_id is required"
+        assert self._error({"entity_id": "sensor.test", "limit": "0"}) == (
+            "Invalid limit parameter"
+        )
+        assert self._error({"entity_id": "sensor.test", "limit": "abc"}) == (
+            "Invalid limit parameter"
+        )
+        # Unparseable datetimes used to be silently ignored.
+        assert self._error({"entity_id": "sensor.test", "end_time": "soon"}) == (
+            "Invalid end_time parameter"
+        )
+
+    def test_multi_parses_comma_separated_entity_ids(self):
+        parsed = GET_MULTI_RECORDS_QUERY_SCHEMA({
+            "entity_ids": "sensor.a, sensor.b",
+            "limit": "5",
+        })
+        assert parsed["entity_ids"] == ["sensor.a", "sensor.b"]
+        assert parsed["limit"] == 5
+
+    def test_multi_rejects_missing_invalid_or_too_many_entities(self):
+        def error(query):
+            with pytest.raises(vol.Invalid) as exc:
+                GET_MULTI_RECORDS_QUERY_SCHEMA(query)
+            return _query_error_message(exc.value)
+
+        assert error({}) == "entity_ids is required"
+        assert error({"entity_ids": "sensor.a,not an entity"}) == (
+            "Invalid entity_ids parameter"
+        )
+        too_many = ",".join(f"sensor.s{i}" for i in range(MAX_QUERY_ENTITIES + 1))
+        assert error({"entity_ids": too_many}) == "Invalid entity_ids parameter"
+
+    def test_statistics_query_shares_the_records_rules(self):
+        def error(query):
+            with pytest.raises(vol.Invalid) as exc:
+                GET_STATISTICS_QUERY_SCHEMA(query)
+            return _query_error_message(exc.value)
+
+        parsed = GET_STATISTICS_QUERY_SCHEMA({
+            "entity_id": "external:energy", "limit": "10000000",
+            "start_time": "2023-11-14T22:00:00Z",
+        })
+        assert parsed["limit"] == MAX_QUERY_LIMIT
+        assert parsed["statistic_type"] == "long_term"
+        assert parsed["start_time"] == datetime(2023, 11, 14, 22, tzinfo=timezone.utc)
+        assert error({}) == "entity_id is required"
+        assert error({"entity_id": "sensor.test", "limit": "0"}) == (
+            "Invalid limit parameter"
+        )
+        assert error({"entity_id": "sensor.test", "statistic_type": "hourly"}) == (
+            "Invalid statistic_type parameter"
+        )
+
+
 # --------------------------------------------------------------------------
 # _update_record_sync
 # --------------------------------------------------------------------------
@@ -154,7 +405,7 @@ class TestUpdateRecordSync:
         db_session.expire_all()
         assert db_session.get(States, s.state_id).state == "new"
 
-    def test_updates_attributes_as_json_string(
+    def test_updates_attributes_in_shared_table(
         self, db_session, mock_hass, sample_entity,
     ):
         states_meta_id, _, _ = sample_entity
@@ -166,9 +417,41 @@ class TestUpdateRecordSync:
 
         assert result["success"] is True
         db_session.expire_all()
-        stored = db_session.get(States, s.state_id).attributes
-        assert isinstance(stored, str)
-        assert json.loads(stored) == {"new": "value"}
+        assert _stored_attributes(db_session, s.state_id) == {"new": "value"}
+
+    def test_attribute_edit_never_rewrites_a_shared_row(
+        self, db_session, mock_hass, sample_entity,
+    ):
+        """States sharing a state_attributes row keep it when one is edited;
+        a second edit to the same attributes reuses the first one's row."""
+        states_meta_id, _, entity_id = sample_entity
+        shared = StateAttributes(hash=1, shared_attrs='{"unit":"W"}')
+        db_session.add(shared)
+        db_session.flush()
+        shared_id = shared.attributes_id
+        ids = []
+        for ts in (1_700_000_000, 1_700_000_100):
+            row = States(
+                metadata_id=states_meta_id, state="1", attributes=None,
+                attributes_id=shared_id, last_updated_ts=ts, last_changed_ts=ts,
+            )
+            db_session.add(row)
+            db_session.flush()
+            ids.append(row.state_id)
+
+        _update_record_sync(mock_hass, ids[0], None, {"unit": "kW"}, None, None)
+        db_session.expire_all()
+        assert db_session.get(StateAttributes, shared_id).shared_attrs == '{"unit":"W"}'
+        assert db_session.get(States, ids[1]).attributes_id == shared_id
+        new_id = db_session.get(States, ids[0]).attributes_id
+        assert new_id != shared_id
+
+        _update_record_sync(mock_hass, ids[1], None, {"unit": "kW"}, None, None)
+        db_session.expire_all()
+        assert db_session.get(States, ids[1]).attributes_id == new_id
+
+        records = _get_records_sync(mock_hass, entity_id, None, None, 10)["records"]
+        assert [r["attributes"] for r in records] == [{"unit": "kW"}, {"unit": "kW"}]
 
     def test_updates_both_timestamp_columns(
         self, db_session, mock_hass, sample_entity,
@@ -292,7 +575,7 @@ class TestCreateRecordSync:
         db_session.expire_all()
         created = db_session.get(States, result["state_id"])
         assert created.state == "42"
-        assert json.loads(created.attributes) == {"unit": "°C"}
+        assert _stored_attributes(db_session, created.state_id) == {"unit": "°C"}
         assert created.last_updated_ts == 1_700_000_000
 
     def test_creates_states_meta_for_new_entity(self, db_session, mock_hass):
@@ -307,6 +590,82 @@ class TestCreateRecordSync:
         db_session.expire_all()
         assert db_session.query(StatesMeta).filter_by(entity_id=entity_id).first() is not None
 
+    def test_get_or_create_metadata_id_is_idempotent(self, db_session, sample_entity):
+        states_meta_id, _, entity_id = sample_entity
+
+        assert _get_or_create_metadata_id(db_session, entity_id) == states_meta_id
+        created = _get_or_create_metadata_id(db_session, "sensor.brand_new")
+        assert _get_or_create_metadata_id(db_session, "sensor.brand_new") == created
+        # Lookups inside a write transaction never fill the cache
+        assert _METADATA_ID_CACHE.get("sensor.brand_new") is None
+        assert db_session.query(StatesMeta).filter_by(entity_id="sensor.brand_new").count() == 1
+
+    def test_create_caches_metadata_id_after_commit(self, db_session, mock_hass):
+        ts = datetime.fromtimestamp(1_700_000_100, tz=timezone.utc)
+        first = _create_record_sync(mock_hass, "sensor.brand_new", "1", {}, ts, ts)
+        assert first["success"] is True
+        metadata_id = db_session.get(States, first["state_id"]).metadata_id
+        assert _METADATA_ID_CACHE.get("sensor.brand_new") == metadata_id
+
+        statements: list[str] = []
+        engine = db_session.get_bind()
+
+        def _capture(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _capture)
+        try:
+            second = _create_record_sync(mock_hass, "sensor.brand_new", "2", {}, ts, ts)
+        finally:
+            event.remove(engine, "before_cursor_execute", _capture)
+
+        assert second["success"] is True
+        assert not any(sql.startswith("SELECT states_meta") for sql in statements)
+
+    def test_failed_create_does_not_cache_metadata_id(self, db_session, mock_hass):
+        ts = datetime.fromtimestamp(1_700_000_100, tz=timezone.utc)
+        # The StatesMeta row is inserted before the attributes fail to serialise.
+        result = _create_record_sync(
+            mock_hass, "sensor.brand_new", "1", {"bad": object()}, ts, ts,
+        )
+
+        assert result["success"] is False
+        assert _METADATA_ID_CACHE.get("sensor.brand_new") is None
+
+    def test_stale_cached_metadata_id_is_dropped_on_foreign_key_failure(
+        self, db_session, mock_hass, sample_entity,
+    ):
+        """A purged id fails the foreign key (HA enables it on SQLite) once."""
+        states_meta_id, _, entity_id = sample_entity
+        db_session.commit()
+        db_session.execute(text("PRAGMA foreign_keys=ON"))
+        _METADATA_ID_CACHE.set(entity_id, states_meta_id + 1000)
+        ts = datetime.fromtimestamp(1_700_000_100, tz=timezone.utc)
+
+        failed = _create_record_sync(mock_hass, entity_id, "1", {}, ts, ts)
+        db_session.rollback()
+
+        assert failed["success"] is False
+        assert "FOREIGN KEY" in failed["error"]
+        assert _METADATA_ID_CACHE.get(entity_id) is None
+        retried = _create_record_sync(mock_hass, entity_id, "1", {}, ts, ts)
+        assert retried["success"] is True
+        assert db_session.get(States, retried["state_id"]).metadata_id == states_meta_id
+
+    def test_states_meta_insert_ignores_conflicts_per_dialect(self):
+        from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+        sqlite_sql = str(_insert_states_meta_stmt("sqlite", "sensor.x").compile(
+            dialect=sqlite.dialect()))
+        postgresql_sql = str(_insert_states_meta_stmt("postgresql", "sensor.x").compile(
+            dialect=postgresql.dialect()))
+        mysql_sql = str(_insert_states_meta_stmt("mysql", "sensor.x").compile(
+            dialect=mysql.dialect()))
+
+        assert "ON CONFLICT (entity_id) DO NOTHING" in sqlite_sql
+        assert "ON CONFLICT (entity_id) DO NOTHING" in postgresql_sql
+        assert mysql_sql.startswith("INSERT IGNORE")
+
     def test_sets_both_legacy_and_ts_timestamps(
         self, db_session, mock_hass, sample_entity,
     ):
@@ -333,9 +692,9 @@ class TestCreateRecordSync:
 
         assert result["success"] is True
         db_session.expire_all()
-        created = db_session.get(States, result["state_id"])
-        assert isinstance(created.attributes, str)
-        assert json.loads(created.attributes) == {"nested": {"a": 1, "b": [2, 3]}}
+        assert _stored_attributes(db_session, result["state_id"]) == {
+            "nested": {"a": 1, "b": [2, 3]}
+        }
 
     def test_returns_statistics_stale_flag(
         self, db_session, mock_hass, sample_entity,
@@ -368,7 +727,7 @@ def _hour_aligned(ts: float) -> float:
 
 class TestDeleteStateAffectsStatistics:
     """End-to-end checks that ``_delete_record_sync`` invokes
-    ``update_statistics_after_state_change`` so short-term and long-term
+    ``update_statistics_for_periods`` so short-term and long-term
     rows reflect the missing state, not just the freed FK link."""
 
     def test_only_state_in_period_short_term_row_removed_when_no_prior(
@@ -637,3 +996,49 @@ class TestDeleteStateAffectsStatistics:
         assert reloaded_long.min == 50.0
         assert reloaded_long.max == 50.0
         assert reloaded_long.state == 50.0
+
+    def test_resaving_identical_value_leaves_statistics_alone(
+        self, db_session, mock_hass, sample_entity,
+    ):
+        """A zero-delta edit (same state, same timestamp) has nothing to
+        propagate, so the statistics rows are not recomputed."""
+        states_meta_id, stat_meta_id, _ = sample_entity
+        period = 3600.0 * 472_222
+        s = _add_state(db_session, states_meta_id, period + 60, "10.0")
+        # Deliberately inconsistent with the state so a recompute would show.
+        short_row = StatisticsShortTerm(
+            metadata_id=stat_meta_id, start_ts=period,
+            mean=99.0, min=99.0, max=99.0, state=99.0,
+        )
+        db_session.add(short_row)
+        db_session.flush()
+        short_id = short_row.id
+
+        same_ts = datetime.fromtimestamp(period + 60, tz=timezone.utc)
+        result = _update_record_sync(mock_hass, s.state_id, "10.0", None, None, same_ts)
+
+        assert result["success"] is True
+        db_session.expire_all()
+        assert db_session.get(StatisticsShortTerm, short_id).mean == 99.0
+
+    def test_non_numeric_to_non_numeric_edit_leaves_statistics_alone(
+        self, db_session, mock_hass, sample_entity,
+    ):
+        """Neither value counts towards mean/min/max, so nothing can change."""
+        states_meta_id, stat_meta_id, _ = sample_entity
+        period = 3600.0 * 472_222
+        s = _add_state(db_session, states_meta_id, period + 60, "unavailable")
+        short_row = StatisticsShortTerm(
+            metadata_id=stat_meta_id, start_ts=period,
+            mean=99.0, min=99.0, max=99.0, state=99.0,
+        )
+        db_session.add(short_row)
+        db_session.flush()
+        short_id = short_row.id
+
+        result = _update_record_sync(mock_hass, s.state_id, "unknown", None, None, None)
+
+        assert result["success"] is True
+        db_session.expire_all()
+        assert db_session.get(States, s.state_id).state == "unknown"
+        assert db_session.get(StatisticsShortTerm, short_id).mean == 99.0
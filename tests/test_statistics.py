@@ -1,9 +1,9 @@
 """Tests for custom_components.history_editor.statistics.
 
 Focuses on:
-- The recalc helpers (``recalculate_short_term_stat``, ``recalculate_long_term_stat``).
+- The recalc helpers (``recalculate_short_term_stats``, ``recalculate_long_term_stat``).
 - The sum cascade for ``total_increasing`` sensors.
-- The cross-phase ordering invariant in ``update_statistics_after_state_change``
+- The cross-phase ordering invariant in ``update_statistics_for_periods``
   and ``recalculate_statistics_sync`` (the bug that motivated the session
   flush/expire between short-term and long-term passes).
 """
@@ -17,16 +17,20 @@ pytest.importorskip("homeassistant.components.recorder.db_schema")
 
 from homeassistant.components.recorder.db_schema import (  # noqa: E402
     States,
+    StatesMeta,
     Statistics,
     StatisticsShortTerm,
 )
 
 from custom_components.history_editor.statistics import (  # noqa: E402
+    _STAT_META_ID_CACHE,
     _cascade_sum_adjustment,
+    _stat_meta_id_for_states_metadata,
     recalculate_long_term_stat,
-    recalculate_short_term_stat,
+    recalculate_long_term_stats,
+    recalculate_short_term_stats,
     recalculate_statistics_sync,
-    update_statistics_after_state_change,
+    update_statistics_for_periods,
 )
 
 
@@ -61,53 +65,64 @@ def _add_long_term(session, metadata_id: int, start_ts: float, **cols) -> Statis
 
 
 # --------------------------------------------------------------------------
-# recalculate_short_term_stat
+# recalculate_short_term_stats / recalculate_long_term_stats
 # --------------------------------------------------------------------------
 
+_PERIOD = 1_700_000_000.0 - (1_700_000_000.0 % 300)
+
+
+class TestRecalculateShortTermStats:
+    """Single-period cases of the batched short-term recalculation."""
+
+    def _recalc(self, db_session, sample_entity):
+        states_meta_id, stat_meta_id, _ = sample_entity
+        updated = recalculate_short_term_stats(
+            db_session, stat_meta_id, states_meta_id, [_PERIOD],
+        )
+        # The batch writes with Core statements; reload the ORM rows.
+        db_session.expire_all()
+        return updated
 
-class TestRecalculateShortTermStat:
     def test_computes_mean_min_max_from_numeric_states(self, db_session, sample_entity):
-        states_meta_id, stat_meta_id, entity_id = sample_entity
-        start = 1_700_000_000.0  # aligned-ish; exact alignment not required for this helper
-        _add_state(db_session, states_meta_id, start + 10, "1.0")
-        _add_state(db_session, states_meta_id, start + 60, "3.0")
-        _add_state(db_session, states_meta_id, start + 200, "5.0")
+        states_meta_id, stat_meta_id, _ = sample_entity
+        _add_state(db_session, states_meta_id, _PERIOD + 10, "1.0")
+        _add_state(db_session, states_meta_id, _PERIOD + 60, "3.0")
+        _add_state(db_session, states_meta_id, _PERIOD + 200, "5.0")
         row = _add_short_term(
-            db_session, stat_meta_id, start, mean=99.0, min=99.0, max=99.0, state=99.0,
+            db_session, stat_meta_id, _PERIOD, mean=99.0, min=99.0, max=99.0, state=99.0,
         )
 
-        updated = recalculate_short_term_stat(db_session, stat_meta_id, entity_id, start)
-
-        assert updated is True
+        assert self._recalc(db_session, sample_entity) == 1
         assert row.mean == pytest.approx((1.0 + 3.0 + 5.0) / 3)
         assert row.min == 1.0
         assert row.max == 5.0
         assert row.state == 5.0  # last value in the window
 
     def test_ignores_non_numeric_states(self, db_session, sample_entity):
-        states_meta_id, stat_meta_id, entity_id = sample_entity
-        start = 1_700_000_000.0
-        _add_state(db_session, states_meta_id, start + 10, "unavailable")
-        _add_state(db_session, states_meta_id, start + 60, "2.0")
-        _add_state(db_session, states_meta_id, start + 200, "unknown")
-        row = _add_short_term(db_session, stat_meta_id, start, mean=99.0, min=99.0, max=99.0, state=99.0)
-
-        recalculate_short_term_stat(db_session, stat_meta_id, entity_id, start)
+        states_meta_id, stat_meta_id, _ = sample_entity
+        _add_state(db_session, states_meta_id, _PERIOD + 10, "unavailable")
+        _add_state(db_session, states_meta_id, _PERIOD + 60, "2.0")
+        _add_state(db_session, states_meta_id, _PERIOD + 200, "unknown")
+        row = _add_short_term(
+            db_session, stat_meta_id, _PERIOD, mean=99.0, min=99.0, max=99.0, state=99.0,
+        )
 
+        self._recalc(db_session, sample_entity)
 
         assert row.mean == 2.0
+        assert row.min == 2.0
+        assert row.max == 2.0
         assert row.state == 2.0
 
     def test_empty_window_carries_forward_prior_value(self, db_session, sample_entity):
         """No states in this window → hold-last-value from before the window."""
-        states_meta_id, stat_meta_id, entity_id = sample_entity
-        start = 1_700_000_000.0
-        # Only a prior state, none inside [start, start+300)
-        _add_state(db_session, states_meta_id, start - 60, "7.5")
-        row = _add_short_term(db_session, stat_meta_id, start, mean=99.0, min=99.0, max=99.0, state=99.0)
-
-        recalculate_short_term_stat(db_session, stat_meta_id, entity_id, start)
+        states_meta_id, stat_meta_id, _ = sample_entity
+        _add_state(db_session, states_meta_id, _PERIOD - 60, "7.5")
+        row = _add_short_term(
+            db_session, stat_meta_id, _PERIOD, mean=99.0, min=99.0, max=99.0, state=99.0,
+        )
 
+        self._recalc(db_session, sample_entity)
 
         assert row.mean == 7.5
         assert row.min == 7.5
@@ -115,25 +130,110 @@ class TestRecalculateShortTermStat:
         assert row.state == 7.5
 
     def test_empty_window_no_prior_value_deletes_row(self, db_session, sample_entity):
-        """No states in the window AND no prior numeric → row removed."""
-        states_meta_id, stat_meta_id, entity_id = sample_entity
-        start = 1_700_000_000.0
-        row = _add_short_term(db_session, stat_meta_id, start, mean=99.0, state=99.0)
-        row_id = row.id
+        """No numeric states in the window AND no prior numeric → row removed."""
+        states_meta_id, stat_meta_id, _ = sample_entity
+        _add_state(db_session, states_meta_id, _PERIOD + 10, "unknown")
+        row_id = _add_short_term(db_session, stat_meta_id, _PERIOD, mean=99.0, state=99.0).id
+
+        self._recalc(db_session, sample_entity)
+
+        assert db_session.get(StatisticsShortTerm, row_id) is None
+
+    def test_never_creates_missing_rows(self, db_session, sample_entity):
+        states_meta_id, stat_meta_id, _ = sample_entity
+        _add_state(db_session, states_meta_id, _PERIOD + 10, "5.0")
+
+        assert self._recalc(db_session, sample_entity) == 0
+        assert db_session.query(StatisticsShortTerm).filter_by(
+            metadata_id=stat_meta_id
+        ).count() == 0
+
+
+class TestBatchedRecalculation:
+    def test_short_term_batch_matches_per_period_results(self, db_session, sample_entity):
+        """Adjacent and non-adjacent periods are recomputed in one call."""
+        states_meta_id, stat_meta_id, _ = sample_entity
+        base = 1_700_000_000.0 - (1_700_000_000.0 % 300)
+        _add_state(db_session, states_meta_id, base + 10, "1.0")
+        _add_state(db_session, states_meta_id, base + 300 + 10, "4.0")
+        _add_state(db_session, states_meta_id, base + 300 + 20, "6.0")
+        _add_state(db_session, states_meta_id, base + 1500 + 5, "9.0")
+        rows = [
+            _add_short_term(db_session, stat_meta_id, base + offset,
+                            mean=0.0, min=0.0, max=0.0, state=0.0)
+            for offset in (0.0, 300.0, 600.0, 1500.0)
+        ]
+
+        updated = recalculate_short_term_stats(
+            db_session, stat_meta_id, states_meta_id,
+            {base, base + 300, base + 600, base + 1500},
+        )
+        # The batch writes with Core statements; reload the ORM rows.
+        db_session.expire_all()
 
-        recalculate_short_term_stat(db_session, stat_meta_id, entity_id, start)
-        db_session.flush()
+        assert updated == 4
+        assert rows[0].mean == 1.0
+        assert rows[1].mean == 5.0
+        assert rows[1].min == 4.0
+        assert rows[1].state == 6.0
+        # Empty period holds the last value from before it.
+        assert rows[2].mean == 6.0
+        assert rows[3].state == 9.0
+
+    def test_short_term_batch_cascades_sums_and_drops_empty_rows(
+        self, db_session, sample_totaliser,
+    ):
+        states_meta_id, stat_meta_id, _ = sample_totaliser
+        base = 1_700_000_000.0 - (1_700_000_000.0 % 300)
+        empty = _add_short_term(db_session, stat_meta_id, base, state=1.0, sum=1.0)
+        _add_state(db_session, states_meta_id, base + 310, "5.0")
+        edited = _add_short_term(db_session, stat_meta_id, base + 300, state=2.0, sum=2.0)
+        later = _add_short_term(db_session, stat_meta_id, base + 600, state=3.0, sum=3.0)
+        empty_id, edited_id, later_id = empty.id, edited.id, later.id
+
+        updated = recalculate_short_term_stats(
+            db_session, stat_meta_id, states_meta_id, [base, base + 300],
+        )
+        db_session.expire_all()
 
-        assert db_session.query(StatisticsShortTerm).filter_by(id=row_id).first() is None
+        assert updated == 2
+        assert db_session.get(StatisticsShortTerm, empty_id) is None
+        assert db_session.get(StatisticsShortTerm, edited_id).state == 5.0
+        # 2.0 -> 5.0 shifts this and every later running sum by +3.
+        assert db_session.get(StatisticsShortTerm, edited_id).sum == 5.0
+        assert db_session.get(StatisticsShortTerm, later_id).sum == 6.0
 
-    def test_returns_false_when_stat_row_missing(self, db_session, sample_entity):
-        """Helper never creates new rows; returns False when target is absent."""
-        states_meta_id, stat_meta_id, entity_id = sample_entity
-        _add_state(db_session, states_meta_id, 1_700_000_010.0, "5.0")
+    def test_long_term_batch_aggregates_each_hour(self, db_session, sample_entity):
+        _, stat_meta_id, _ = sample_entity
+        hour = 3600.0 * 200
+        for i in range(3):
+            _add_short_term(db_session, stat_meta_id, hour + i * 300,
+                            mean=float(i), min=float(i), max=float(i), state=float(i))
+            _add_short_term(db_session, stat_meta_id, hour + 3600 + i * 300,
+                            mean=10.0 + i, min=10.0 + i, max=10.0 + i, state=10.0 + i)
+        first = _add_long_term(db_session, stat_meta_id, hour, mean=0.0, state=0.0)
+        second = _add_long_term(db_session, stat_meta_id, hour + 3600, mean=0.0, state=0.0)
+
+        updated = recalculate_long_term_stats(db_session, stat_meta_id, [hour + 3600, hour])
+
+        assert updated == 2
+        assert first.mean == pytest.approx(1.0)
+        assert first.state == 2.0
+        assert second.mean == pytest.approx(11.0)
+        assert second.max == 12.0
+
+
+    def test_caches_stat_meta_id_but_not_misses(self, db_session, sample_entity):
+        states_meta_id, stat_meta_id, _ = sample_entity
+        orphan = StatesMeta(entity_id="sensor.no_statistics")
+        db_session.add(orphan)
+        db_session.flush()
 
-        result = recalculate_short_term_stat(db_session, stat_meta_id, entity_id, 1_700_000_000.0)
+        assert _stat_meta_id_for_states_metadata(db_session, states_meta_id) == stat_meta_id
+        assert _stat_meta_id_for_states_metadata(db_session, orphan.metadata_id) is None
 
-        assert result is False
+        assert _STAT_META_ID_CACHE.get(states_meta_id) == stat_meta_id
+        assert _STAT_META_ID_CACHE.get(orphan.metadata_id) is None
 
 
 # --------------------------------------------------------------------------
@@ -269,7 +369,7 @@ class TestRecalculateLongTermStat:
 class TestPhaseBoundaryConsistency:
     """These are the regression tests for the fix applied to
     ``recalculate_statistics_sync`` (flush/expire between phases) and the
-    ``update_statistics_after_state_change`` helper.  The scenario:
+    ``update_statistics_for_periods`` helper.  The scenario:
 
     1. A totaliser sensor has short-term rows with cascaded sums.
     2. Recalc mutates short-term ``sum`` via the cascade (bulk UPDATE with
@@ -330,7 +430,7 @@ class TestPhaseBoundaryConsistency:
         )
         assert long_row.sum == last_short_term_sum
 
-    def test_update_statistics_after_state_change_handles_period_move(
+    def test_update_statistics_for_periods_handles_period_move(
         self, db_session, sample_entity,
     ):
         """When a state record moves between periods, both the old and new
@@ -340,7 +440,7 @@ class TestPhaseBoundaryConsistency:
         new_period = old_period + 300.0
 
         # Seed states: one in the new period
-        state = _add_state(db_session, states_meta_id, new_period + 60, "42.0")
+        _add_state(db_session, states_meta_id, new_period + 60, "42.0")
 
         # Both periods have existing stat rows
         old_row = _add_short_term(
@@ -351,18 +451,21 @@ class TestPhaseBoundaryConsistency:
             db_session, stat_meta_id, start_ts=new_period,
             mean=0.0, min=0.0, max=0.0, state=0.0,
         )
+        old_row_id, new_row_id = old_row.id, new_row.id
 
-        # Call helper: state moved from old_period → new_period
-        update_statistics_after_state_change(
-            db_session, state, old_ts=old_period + 60, new_last_updated=None,
+        # State moved from old_period → new_period: both buckets are affected
+        update_statistics_for_periods(
+            db_session,
+            {states_meta_id: {int(old_period), int(new_period)}},
+            {},
         )
         db_session.flush()
         db_session.expire_all()
 
         # Old period now empty, no prior value → row deleted
-        assert db_session.query(StatisticsShortTerm).filter_by(id=old_row.id).first() is None
+        assert db_session.query(StatisticsShortTerm).filter_by(id=old_row_id).first() is None
         # New period recalculated from the state
-        new_row_fresh = db_session.query(StatisticsShortTerm).filter_by(id=new_row.id).first()
+        new_row_fresh = db_session.query(StatisticsShortTerm).filter_by(id=new_row_id).first()
         assert new_row_fresh.mean == 42.0
         assert new_row_fresh.state == 42.0
 
@@ -248,6 +248,32 @@ class TestUpdateStatisticSync:
         assert reloaded_long.mean == 7.0
         assert reloaded_long.state == 7.5
 
+    def test_unchanged_short_term_update_skips_cascade(
+        self, db_session, mock_hass, sample_entity,
+    ):
+        """Re-saving identical values must not re-aggregate the hour."""
+        _, stat_meta_id, _ = sample_entity
+        hour_start = 3600.0 * 100
+        short = _add_short_term(
+            db_session, stat_meta_id, start_ts=hour_start,
+            state=1.0, mean=1.0, min=1.0, max=1.0,
+        )
+        # Deliberately inconsistent with the short-term row so a cascade would show.
+        long_row = _add_long_term(
+            db_session, stat_meta_id, start_ts=hour_start,
+            state=0.0, mean=0.0, min=0.0, max=0.0,
+        )
+
+        result = update_statistic_sync(
+            mock_hass, short.id,
+            mean=1.0, min_val=1.0, max_val=1.0, sum_val=None, state=1.0, start=None,
+            statistic_type="short_term",
+        )
+
+        assert result["success"] is True
+        db_session.expire_all()
+        assert db_session.get(Statistics, long_row.id).mean == 0.0
+
     def test_leaves_none_fields_alone(self, db_session, mock_hass, sample_entity):
         _, stat_meta_id, _ = sample_entity
         row = _add_long_term(